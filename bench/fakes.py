@@ -0,0 +1,144 @@
+"""
+Minimal stand-ins for the pycord objects the cogs touch, so command handlers can
+be driven without a Discord connection. Only the attributes and coroutines the
+cogs actually use are implemented.
+"""
+import asyncio
+import itertools
+import types
+
+_ids = itertools.count(900_000_000_000_000_000)
+
+
+def next_id():
+    return next(_ids)
+
+
+class FakeRole:
+    def __init__(self, role_id=None, name="role"):
+        self.id = role_id or next_id()
+        self.name = name
+        self.mention = f"<@&{self.id}>"
+
+
+class FakeMember:
+    def __init__(self, guild, roles=(), name="member"):
+        self.id = next_id()
+        self.guild = guild
+        self.roles = list(roles)
+        self.name = name
+        self.display_name = name
+        self.mention = f"<@{self.id}>"
+
+
+class FakeChannel:
+    """A text/voice channel whose send() takes `send_latency` seconds, like a REST call."""
+
+    def __init__(self, channel_id=None, name="channel", send_latency=0.0):
+        self.id = channel_id or next_id()
+        self.name = name
+        self.mention = f"<#{self.id}>"
+        self.send_latency = send_latency
+        self.sent = []
+
+    async def send(self, content=None, embed=None, embeds=None, **kwargs):
+        if self.send_latency:
+            await asyncio.sleep(self.send_latency)
+        self.sent.append((content, embed, embeds))
+
+
+class FakeScheduledEvent:
+    def __init__(self, guild, name, **kwargs):
+        self.id = next_id()
+        self.guild = guild
+        self.name = name
+        self.start_time = kwargs.get("start_time")
+
+    async def delete(self):
+        self.guild.scheduled_events.pop(self.id, None)
+
+
+class FakeGuild:
+    def __init__(self, guild_id=None, api_latency=0.0):
+        self.id = guild_id or next_id()
+        self.api_latency = api_latency
+        self.scheduled_events = {}
+
+    async def _api(self):
+        if self.api_latency:
+            await asyncio.sleep(self.api_latency)
+
+    async def create_scheduled_event(self, name, **kwargs):
+        await self._api()
+        event = FakeScheduledEvent(self, name, **kwargs)
+        self.scheduled_events[event.id] = event
+        return event
+
+    async def fetch_scheduled_events(self):
+        await self._api()
+        return list(self.scheduled_events.values())
+
+    async def fetch_scheduled_event(self, event_id):
+        await self._api()
+        return self.scheduled_events.get(event_id)
+
+    def get_scheduled_event(self, event_id):
+        return self.scheduled_events.get(event_id)
+
+
+class FakeFollowup:
+    def __init__(self, ctx):
+        self.ctx = ctx
+
+    async def send(self, content=None, **kwargs):
+        self.ctx.responses.append(content or kwargs.get("embed"))
+
+
+class FakeContext:
+    """Stands in for discord.ApplicationContext."""
+
+    def __init__(self, bot, guild, channel, author):
+        self.bot = bot
+        self.guild = guild
+        self.channel = channel
+        self.author = author
+        self.responses = []
+        self.followup = FakeFollowup(self)
+
+    async def respond(self, content=None, **kwargs):
+        self.responses.append(content or kwargs.get("embed"))
+
+    async def defer(self, **kwargs):
+        pass
+
+
+class FakeBot:
+    """Stands in for the bot: config, channel lookup and readiness."""
+
+    def __init__(self, config, channels=()):
+        self.config = config
+        self.channels = {channel.id: channel for channel in channels}
+        self.user = types.SimpleNamespace(id=next_id(), name="ov_bot")
+        self.latency = 0.05
+        self.guilds = []
+
+    def get_channel(self, channel_id):
+        return self.channels.get(channel_id)
+
+    def get_guild(self, guild_id):
+        return next((guild for guild in self.guilds if guild.id == guild_id), None)
+
+    async def wait_until_ready(self):
+        pass
+
+    def is_ready(self):
+        return True
+
+    def add_view(self, view, message_id=None):
+        pass
+
+    def add_listener(self, func, name=None):
+        pass
+
+    def dispatch(self, event_name, *args, **kwargs):
+        pass
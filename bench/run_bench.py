@@ -0,0 +1,336 @@
+"""
+Offline benchmark for the cogs' command handlers.
+
+Drives RS3Finances.add/remove/check, admin.event/cancelevent and
+admin.reminder_task against the fakes in bench/fakes.py, with no Discord
+connection, and prints the results as JSON so runs can be compared across commits.
+
+Run from the repository root:
+
+    python -m bench.run_bench --mutations 5000 --concurrency 500 --reminders 10000
+    python -m bench.run_bench --output bench_output.txt --trace-allocations
+"""
+import argparse
+import asyncio
+import datetime
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+import types
+
+from bench.fakes import FakeBot, FakeChannel, FakeContext, FakeGuild, FakeMember, FakeRole
+from cogs.admin import admin
+from cogs.rs3_finances import RS3Finances
+from utils.dispatcher import MessageDispatcher
+from utils.guilds import GuildConfigs
+from utils.metrics import Metrics
+from utils.permissions import PermissionEngine
+from utils.state_store import flush_all
+
+# File I/O is counted with an audit hook rather than by patching open().
+_io_counts = {"open_read": 0, "open_write": 0, "rename": 0, "sqlite_connect": 0}
+
+
+def _audit(event, args):
+    if event == "open":
+        mode = args[1] if len(args) > 1 and isinstance(args[1], str) else "r"
+        flags = args[2] if len(args) > 2 and isinstance(args[2], int) else 0
+        writing = any(c in mode for c in "wax+") or flags & (os.O_WRONLY | os.O_RDWR)
+        _io_counts["open_write" if writing else "open_read"] += 1
+    elif event == "os.rename":
+        _io_counts["rename"] += 1
+    elif event == "sqlite3.connect":
+        _io_counts["sqlite_connect"] += 1
+
+
+sys.addaudithook(_audit)
+
+
+def percentiles(samples):
+    if not samples:
+        return {"count": 0}
+    ordered = sorted(samples)
+
+    def pick(p):
+        return ordered[min(len(ordered) - 1, int(round(p / 100 * (len(ordered) - 1))))] * 1000
+
+    return {
+        "count": len(ordered),
+        "p50_ms": round(pick(50), 3),
+        "p95_ms": round(pick(95), 3),
+        "p99_ms": round(pick(99), 3),
+        "max_ms": round(ordered[-1] * 1000, 3),
+        "mean_ms": round(statistics.fmean(ordered) * 1000, 3),
+    }
+
+
+class LoopLagMonitor:
+    """Measures how late a short sleep wakes up, i.e. how long the loop was blocked."""
+
+    def __init__(self, interval=0.01):
+        self.interval = interval
+        self.samples = []
+        self._task = None
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            started = loop.time()
+            await asyncio.sleep(self.interval)
+            self.samples.append(max(0.0, loop.time() - started - self.interval))
+
+    def __enter__(self):
+        self._task = asyncio.get_running_loop().create_task(self._run())
+        return self
+
+    def __exit__(self, *exc):
+        self._task.cancel()
+
+
+class Scenario:
+    """Collects latencies, loop lag, allocations and I/O counts for one scenario."""
+
+    def __init__(self, name, trace_allocations):
+        self.name = name
+        self.trace_allocations = trace_allocations
+        self.latencies = {}
+        self.extra = {}
+
+    async def timed(self, handler_name, coro):
+        started = time.perf_counter()
+        await coro
+        self.latencies.setdefault(handler_name, []).append(time.perf_counter() - started)
+
+    def __enter__(self):
+        self._io_before = dict(_io_counts)
+        if self.trace_allocations:
+            tracemalloc.start()
+        self._started = time.perf_counter()
+        self.lag = LoopLagMonitor()
+        self.lag.__enter__()
+        return self
+
+    def __exit__(self, *exc):
+        self.lag.__exit__()
+        self.wall_seconds = time.perf_counter() - self._started
+        self.allocations = None
+        if self.trace_allocations:
+            current, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            self.allocations = {"current_kib": round(current / 1024, 1), "peak_kib": round(peak / 1024, 1)}
+        self.io = {key: _io_counts[key] - self._io_before[key] for key in _io_counts}
+
+    def result(self):
+        return {
+            "wall_seconds": round(self.wall_seconds, 4),
+            "handlers": {name: percentiles(samples) for name, samples in self.latencies.items()},
+            "event_loop_lag": percentiles(self.lag.samples),
+            "allocations": self.allocations,
+            "file_io": self.io,
+            **self.extra,
+        }
+
+
+async def invoke(command, cog, ctx, *args):
+    """Runs a slash command's checks and callback the way pycord would."""
+    for check in command.checks:
+        result = check(ctx)
+        if asyncio.iscoroutine(result):
+            result = await result
+        if not result:
+            return
+    await command.callback(cog, ctx, *args)
+
+
+def make_environment(workdir, args):
+    staff_role = FakeRole(name="Runescape Staff")
+    guild = FakeGuild(api_latency=args.api_latency)
+    admin_channel = FakeChannel(name="admin-bot-commands", send_latency=args.send_latency)
+    log_channel = FakeChannel(name="clan-bank-log", send_latency=args.send_latency)
+    reminder_channel = FakeChannel(name="events", send_latency=args.send_latency)
+    config = types.SimpleNamespace(
+        TOKEN="bench",
+        GUILD_ID=guild.id,
+        THE_DOOR_CHANNEL_ID=0,
+        RS3_GENERAL_CHAT_CHANNEL_ID=0,
+        CLAN_BANK_LOG_CHANNEL_ID=log_channel.id,
+        ADMIN_BOT_COMMANDS_CHANNEL_ID=admin_channel.id,
+        REMINDER_CHANNEL_ID=reminder_channel.id,
+        RUNESCAPE_STAFF_ROLE_ID=staff_role.id,
+        BANK_MANAGER_ROLE_IDS=[staff_role.id],
+        BANK_FILE_PATH=os.path.join(workdir, "clan_bank.json"),
+        LEDGER_FILE_PATH=os.path.join(workdir, "clan_bank_ledger.sqlite3"),
+        REMINDER_CATCHUP_BURST=args.reminder_burst,
+        REMINDER_CATCHUP_INTERVAL_SECONDS=0,
+    )
+    bot = FakeBot(config, [admin_channel, log_channel, reminder_channel])
+    bot.guild_configs = GuildConfigs(config)
+    bot.dispatcher = MessageDispatcher(bot, rate=args.channel_rate, per=1.0, max_queue=args.reminders + args.mutations * 2)
+    bot.metrics = Metrics(bot)
+    bot.permissions = PermissionEngine.from_config(config)
+    author = FakeMember(guild, roles=[staff_role], name="Treasurer")
+    bot.guilds.append(guild)
+    return bot, guild, admin_channel, reminder_channel, author
+
+
+def write_reminders(path, count, first_due, channel_id):
+    reminders = [
+        {
+            "event_id": 1_000_000 + i,
+            "reminder_time": first_due + i,
+            "channel_id": channel_id,
+            "message_content": f"'Bench event {i}' starts in 10 min!",
+            "original_title": f"Bench event {i}",
+            "role_id": None,
+        }
+        for i in range(count)
+    ]
+    with open(path, "w") as f:
+        json.dump(reminders, f)
+
+
+async def bench_bank(args):
+    workdir = tempfile.mkdtemp(prefix="ovbot-bench-bank-")
+    os.chdir(workdir)
+    bot, guild, admin_channel, _, author = make_environment(workdir, args)
+    cog = RS3Finances(bot)
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async def run(name, command, *command_args):
+        async with semaphore:
+            ctx = FakeContext(bot, guild, admin_channel, author)
+            await scenario.timed(name, invoke(command, cog, ctx, *command_args))
+
+    with Scenario("clanbank", args.trace_allocations) as scenario:
+        await asyncio.gather(*(run("clanbank.add", cog.add, "10k", "bench deposit") for _ in range(args.mutations)))
+        await asyncio.gather(*(run("clanbank.remove", cog.remove, "5k", "bench payout") for _ in range(args.mutations)))
+        await asyncio.gather(*(run("clanbank.check", cog.check) for _ in range(args.mutations)))
+        started = time.perf_counter()
+        await flush_all()
+        scenario.extra["final_flush_ms"] = round((time.perf_counter() - started) * 1000, 3)
+        bank_total = cog.banks.get(guild.id).total
+        cog.evict_idle_banks.cancel()
+        await cog.banks.close_all()
+    scenario.extra["bank_total"] = bank_total
+    scenario.extra["dispatcher"] = bot.dispatcher.stats()
+    return scenario.result()
+
+
+async def bench_events(args):
+    workdir = tempfile.mkdtemp(prefix="ovbot-bench-events-")
+    os.chdir(workdir)
+    bot, guild, admin_channel, reminder_channel, author = make_environment(workdir, args)
+    # Pending reminders far in the future, so the scheduler is loaded but idle.
+    far_future = int(time.time()) + 30 * 86400
+    write_reminders("reminders.json", args.reminders, far_future, reminder_channel.id)
+    cog = admin(bot)
+    cog.reminder_task.cancel()
+    semaphore = asyncio.Semaphore(args.concurrency)
+    start = datetime.datetime.now(datetime.timezone.utc) + datetime.timedelta(days=1)
+    host = FakeMember(guild, name="Host")
+    voice_channel = FakeChannel(name="Events VC")
+
+    async def run(name, command, *command_args):
+        async with semaphore:
+            ctx = FakeContext(bot, guild, admin_channel, author)
+            await scenario.timed(name, invoke(command, cog, ctx, *command_args))
+
+    with Scenario("events", args.trace_allocations) as scenario:
+        await asyncio.gather(*(
+            run("event", cog.event, f"Bench {i}", start.strftime("%Y-%m-%d"), start.strftime("%H:%M:%S"),
+                "UTC", host, "Bench event", voice_channel, 30, 10, None, None)
+            for i in range(args.events)
+        ))
+        event_ids = list(guild.scheduled_events)
+        await asyncio.gather(*(run("cancelevent", cog.cancelevent, str(event_id)) for event_id in event_ids))
+        await flush_all()
+    scenario.extra["pending_reminders"] = len(cog.events.get(guild.id).scheduler)
+    return scenario.result()
+
+
+async def bench_reminders(args):
+    workdir = tempfile.mkdtemp(prefix="ovbot-bench-reminders-")
+    os.chdir(workdir)
+    bot, guild, _, reminder_channel, _ = make_environment(workdir, args)
+    # Everything is already due, as after a long outage.
+    write_reminders("reminders.json", args.reminders, int(time.time()) - args.reminders, reminder_channel.id)
+    cog = admin(bot)
+    cog.reminder_task.cancel()
+
+    with Scenario("reminder_task", args.trace_allocations) as scenario:
+        while len(cog.events.get(guild.id).scheduler):
+            await scenario.timed("reminder_task", cog.reminder_task.coro(cog))
+        await flush_all()
+        scenario.extra["dispatcher_before_drain"] = bot.dispatcher.stats()
+        if args.drain:
+            await bot.dispatcher.drain(timeout=None)
+    scenario.extra["dispatcher"] = bot.dispatcher.stats()
+    return scenario.result()
+
+
+SCENARIOS = {
+    "clanbank": bench_bank,
+    "events": bench_events,
+    "reminder_task": bench_reminders,
+}
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def main(args):
+    results = {
+        "meta": {
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            "args": vars(args),
+        },
+        "scenarios": {},
+    }
+    for name in args.scenarios:
+        results["scenarios"][name] = await SCENARIOS[name](args)
+    return results
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Offline benchmark for ov_bot command handlers.")
+    parser.add_argument("--scenarios", nargs="+", choices=list(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument("--mutations", type=int, default=2000, help="Bank add/remove/check calls of each kind.")
+    parser.add_argument("--events", type=int, default=500, help="/event calls (each schedules two reminders).")
+    parser.add_argument("--reminders", type=int, default=10000, help="Reminders preloaded into the scheduler.")
+    parser.add_argument("--concurrency", type=int, default=200, help="Handlers in flight at once.")
+    parser.add_argument("--reminder-burst", type=int, default=100, help="REMINDER_CATCHUP_BURST for the run.")
+    parser.add_argument("--send-latency", type=float, default=0.0, help="Simulated channel.send() latency, seconds.")
+    parser.add_argument("--api-latency", type=float, default=0.0, help="Simulated guild REST latency, seconds.")
+    parser.add_argument("--channel-rate", type=int, default=1000, help="Dispatcher messages per channel per second.")
+    parser.add_argument("--drain", action="store_true", help="Wait for queued reminder messages to be sent.")
+    parser.add_argument("--trace-allocations", action="store_true", help="Track allocations with tracemalloc (slower).")
+    parser.add_argument("--output", help="Write the JSON results here instead of stdout.")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    cwd = os.getcwd()
+    results = asyncio.run(main(args))
+    os.chdir(cwd)
+    text = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
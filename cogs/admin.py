@@ -3,96 +3,434 @@ from discord.ext import commands, tasks
 from discord import Option
 import datetime
 import pytz
-import json
-import os
 import asyncio
+import logging
+import time
+from utils.guilds import PartitionManager
+from utils.hot_reload import UnreachableCommandsError, take_handoff
+from utils.log import context_fields
+from utils.permissions import handle_command_error, requires
+from utils.recurrence import FREQUENCIES, occurrences
+from utils.rsvp import STATUSES, RSVPTracker, event_id_from_message
+from utils.scheduler import ReminderScheduler
+from utils.state_store import StateStore
+from utils.timezones import TimezoneIndex
 
 REMINDERS_FILE = 'reminders.json'
+SERIES_FILE = 'event_series.json'
+RSVP_FILE = 'event_rsvps.json'
+WAKEUPS_FILE = 'event_wakeups.json'
+RSVP_LABELS = {'going': "Going", 'maybe': "Maybe", 'no': "Can't make it"}
+RSVP_EMOJI = {'going': "✅", 'maybe': "❔", 'no': "❌"}
+MAX_RSVP_NAMES = 30  # Per embed field; the count is always shown
+DATE_FORMATS = ("%Y-%m-%d %H:%M:%S", "%Y-%m-%d %H:%M")
+
+log = logging.getLogger(__name__)
+
+async def timezone_autocomplete(ctx: discord.AutocompleteContext):
+    # Answered from the in-memory index, well inside the 3-second interaction window.
+    return ctx.cog.timezones.complete(ctx.value)
+
+async def extension_autocomplete(ctx: discord.AutocompleteContext):
+    return [name for name in ctx.bot.extensions if ctx.value.lower() in name.lower()][:25]
+
+def _guild_file(guild_config, attribute, filename):
+    # The primary guild keeps its files in the working directory, where they have always been.
+    if guild_config.is_primary and attribute not in guild_config.overrides:
+        return getattr(guild_config, attribute, filename)
+    return guild_config.data_path(attribute, filename)
+
+class GuildEvents:
+    """One guild's pending reminders and recurring event series, each in its own state file."""
+
+    def __init__(self, guild_config, handoff=None):
+        self.guild_id = guild_config.guild_id
+        if handoff:
+            # Taken over from the cog instance being reloaded, pending writes and all.
+            self.store, reminders = handoff['store'], handoff['reminders']
+            self.series_store, self.series = handoff['series_store'], handoff['series']
+        else:
+            flush_delay = getattr(guild_config, 'STATE_FLUSH_DELAY_SECONDS', 1.0)
+            self.store = StateStore(_guild_file(guild_config, 'REMINDERS_FILE', REMINDERS_FILE), [], flush_delay=flush_delay)
+            reminders = self.store.load()
+            # Recurring events are stored as one rule per series; occurrences are created as they come into range.
+            self.series_store = StateStore(_guild_file(guild_config, 'SERIES_FILE', SERIES_FILE), [], flush_delay=flush_delay)
+            self.series = {rule['series_id']: rule for rule in self.series_store.load()}
+        # Only used as a heap here; the cog's wakeups decide when to pop it and pace catch-up bursts.
+        self.scheduler = ReminderScheduler(reminders)
+        self.store.bind(self.scheduler.pending)
+        self.series_store.bind(lambda: list(self.series.values()))
+
+    def export_state(self):
+        # Live objects are handed over as-is; the stores keep any write they still have pending.
+        return {
+            'store': self.store,
+            'reminders': self.scheduler.pending(),
+            'series_store': self.series_store,
+            'series': self.series
+        }
+
+    async def close(self):
+        """Writes out anything pending."""
+        await self.store.flush()
+        await self.series_store.flush()
+
+class RSVPView(discord.ui.View):
+    """
+    Going/Maybe/Can't make it buttons under event announcements.
+
+    One persistent view serves every announcement: the event is read from the
+    embed footer of the clicked message, so the buttons keep working after a
+    restart or /reload.
+    """
+
+    def __init__(self, bot):
+        super().__init__(timeout=None)
+        self.bot = bot
+        for status in STATUSES:
+            button = discord.ui.Button(
+                label=RSVP_LABELS[status], emoji=RSVP_EMOJI[status], custom_id=f"rsvp:{status}",
+                style=discord.ButtonStyle.success if status == 'going' else discord.ButtonStyle.secondary
+            )
+            button.callback = self._callback(status)
+            self.add_item(button)
+
+    def _callback(self, status):
+        async def callback(interaction):
+            cog = self.bot.get_cog('admin')
+            event_id = event_id_from_message(interaction.message)
+            if cog is None or event_id is None or event_id not in cog.rsvps:
+                await interaction.response.send_message("This event is no longer taking RSVPs.", ephemeral=True)
+                return
+            if cog.rsvps.respond(event_id, interaction.user.id, status):
+                cog._queue_rsvp_edit(event_id, interaction.message)
+            await interaction.response.send_message(f"{RSVP_EMOJI[status]} You're down as **{RSVP_LABELS[status].lower()}**.", ephemeral=True)
+        return callback
 
 class admin(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
         self.config = bot.config
-        self.reminders = self._load_reminders()
+        self.timezones = TimezoneIndex()
+        self.series_horizon = datetime.timedelta(hours=getattr(self.config, 'RECURRING_EVENT_HORIZON_HOURS', 168))
+        # Reminders missed while the bot was offline all come due at once on startup. At most
+        # reminder_burst_size of a guild's reminders are sent per wakeup, with
+        # reminder_burst_interval seconds between full bursts, so a catch-up never floods the channels.
+        self.reminder_burst_size = getattr(self.config, 'REMINDER_CATCHUP_BURST', 10)
+        self.reminder_burst_interval = getattr(self.config, 'REMINDER_CATCHUP_INTERVAL_SECONDS', 1.0)
+        # Each guild's reminders and series are loaded when first needed and unloaded again once the guild has been idle a while.
+        self.events = PartitionManager(
+            self._open_events,
+            self._close_events,
+            idle_seconds=getattr(self.config, 'GUILD_STATE_IDLE_SECONDS', 3600)
+        )
+        # reminder_task sleeps on one heap holding a wakeup per guild, loaded or not. The next
+        # wakeup of every guild is persisted, so after a restart a guild is only loaded once
+        # one of its reminders or series occurrences comes due.
+        self.wakeups = ReminderScheduler(burst_interval=0)
+        self._wakeups = {}  # guild_id -> its entry in self.wakeups
+        # On /reload the previous instance hands over its stores and pending reminders (see utils/hot_reload.py).
+        self._handed_off = False
+        handoff = take_handoff(bot, self.qualified_name)
+        if handoff:
+            self.wakeup_store, self._next_wakeups = handoff['wakeup_store'], handoff['next_wakeups']
+        else:
+            self.wakeup_store = StateStore(WAKEUPS_FILE, {}, flush_delay=getattr(self.config, 'STATE_FLUSH_DELAY_SECONDS', 1.0))
+            self._next_wakeups = {int(guild_id): due for guild_id, due in self.wakeup_store.load().items()}
+        self.wakeup_store.bind(lambda: {str(guild_id): due for guild_id, due in self._next_wakeups.items()})
+        for guild_id, due in self._next_wakeups.items():
+            self._set_wakeup(guild_id, due)
+        for guild_id, state in (handoff['events'] if handoff else {}).items():
+            events = GuildEvents(self.bot.guild_configs.get(guild_id), state)
+            self.events.adopt(guild_id, events)
+            self._refresh_wakeup(events)
+        # Guilds without a recorded wakeup (first start, or files from an older version) are loaded once to find it.
+        for guild_id in self.bot.guild_configs.guild_ids:
+            if guild_id not in self._next_wakeups:
+                self.events.get(guild_id)
+        self.bot.metrics.register_gauge(
+            'ovbot_reminders_pending', 'Reminders waiting to be sent in the loaded guilds.',
+            lambda: sum(len(events.scheduler) for events in self.events.loaded().values())
+        )
+        self.bot.metrics.register_gauge(
+            'ovbot_event_partitions_loaded', 'Guild reminders and event series currently loaded in memory.', lambda: len(self.events)
+        )
+        self.rsvps = handoff['rsvps'] if handoff else RSVPTracker(RSVP_FILE, flush_delay=getattr(self.config, 'RSVP_FLUSH_SECONDS', 5.0))
+        self.rsvp_edit_delay = getattr(self.config, 'RSVP_EDIT_DEBOUNCE_SECONDS', 3.0)
+        self._rsvp_edits = {}  # event ID -> (announcement message, timer handle)
+        self._rsvp_edit_tasks = set()
+        self.bot.metrics.register_gauge('ovbot_rsvp_events', 'Events taking RSVPs.', lambda: len(self.rsvps))
+        if bot.is_ready():
+            # Reloaded while running; on_ready won't fire again.
+            self.bot.add_view(RSVPView(bot))
         self.reminder_task.start()
+        self.series_task.start()
+        self.evict_idle_events.start()
 
-    def _load_reminders(self):
-        if os.path.exists(REMINDERS_FILE):
-            try:
-                with open(REMINDERS_FILE, 'r') as f:
-                    return json.load(f)
-            except json.JSONDecodeError:
-                print(f"[{datetime.datetime.now()}] Warning: {REMINDERS_FILE} is corrupted. Starting with empty list.")
-        return []
-
-    def _save_reminders(self):
-        with open(REMINDERS_FILE, 'w') as f:
-            json.dump(self.reminders, f, indent=4)
-
-    def _user_is_admin(self, ctx):
-        # Ensure RUNESCAPE_STAFF_ROLE_ID is correctly defined in your bot's config
-        # and that ctx.author.roles is populated.
-        return any(role.id == self.config.RUNESCAPE_STAFF_ROLE_ID for role in ctx.author.roles)
-
-    @tasks.loop(minutes=1)
+    def export_state(self):
+        # Live objects are handed over as-is; the stores keep any write they still have pending.
+        self._handed_off = True
+        return {
+            'events': {guild_id: events.export_state() for guild_id, events in self.events.loaded().items()},
+            'wakeup_store': self.wakeup_store,
+            'next_wakeups': self._next_wakeups,
+            'rsvps': self.rsvps
+        }
+
+    def cog_unload(self):
+        self.reminder_task.cancel()
+        self.series_task.cancel()
+        self.evict_idle_events.cancel()
+        if not self._handed_off:
+            # Unloaded for good: write out every loaded guild's reminders and series.
+            asyncio.create_task(self.events.close_all())
+        # Apply pending embed edits now rather than losing them.
+        for event_id in list(self._rsvp_edits):
+            self._apply_rsvp_edit(event_id)
+
+    @commands.Cog.listener()
+    async def on_ready(self):
+        # Views need a running event loop, so the persistent RSVP buttons are registered here.
+        self.bot.add_view(RSVPView(self.bot))
+
+    def _queue_rsvp_edit(self, event_id, message):
+        """Schedules one embed update for a burst of RSVP clicks."""
+        pending = self._rsvp_edits.get(event_id)
+        if pending is not None:
+            self._rsvp_edits[event_id] = (message, pending[1])
+            return
+        handle = asyncio.get_running_loop().call_later(self.rsvp_edit_delay, self._apply_rsvp_edit, event_id)
+        self._rsvp_edits[event_id] = (message, handle)
+
+    def _apply_rsvp_edit(self, event_id):
+        message, handle = self._rsvp_edits.pop(event_id)
+        handle.cancel()
+        if not message.embeds or event_id not in self.rsvps:
+            return
+        embed = self._with_rsvp_fields(message.embeds[0].copy(), event_id)
+        task = asyncio.get_running_loop().create_task(self._edit_announcement(event_id, message, embed))
+        # Referenced until done so the edit isn't garbage collected mid-flight.
+        self._rsvp_edit_tasks.add(task)
+        task.add_done_callback(self._rsvp_edit_tasks.discard)
+
+    async def _edit_announcement(self, event_id, message, embed):
+        try:
+            await message.edit(embed=embed)
+        except discord.HTTPException as e:
+            log.warning("Couldn't update RSVPs on the announcement for event %s: %s", event_id, e, extra={'guild_id': message.guild.id if message.guild else None})
+
+    def _with_rsvp_fields(self, embed, event_id):
+        """Replaces the RSVP fields of an event embed with the current responses."""
+        labels = tuple(RSVP_LABELS.values())
+        for index in reversed(range(len(embed.fields))):
+            if embed.fields[index].name.startswith(labels):
+                embed.remove_field(index)
+        counts = self.rsvps.counts[event_id]
+        for status in STATUSES:
+            user_ids = self.rsvps.attendees(event_id, status)
+            names = ", ".join(f"<@{user_id}>" for user_id in user_ids[:MAX_RSVP_NAMES])
+            if len(user_ids) > MAX_RSVP_NAMES:
+                names += f" and {len(user_ids) - MAX_RSVP_NAMES} more"
+            embed.add_field(name=f"{RSVP_LABELS[status]} ({counts[status]})", value=names or "-", inline=True)
+        return embed
+
+    def _attendee_mentions(self, event_id):
+        """Mentions for everyone going to an event, fitted to one message."""
+        user_ids = self.rsvps.attendees(event_id)
+        mentions = []
+        length = 0
+        for index, user_id in enumerate(user_ids):
+            mention = f"<@{user_id}>"
+            # Leave room for the "and N more" suffix.
+            if length + len(mention) + 1 > 1950:
+                mentions.append(f"and {len(user_ids) - index} more")
+                break
+            mentions.append(mention)
+            length += len(mention) + 1
+        return " ".join(mentions)
+
+    def _events(self, guild) -> GuildEvents:
+        """Returns the reminders and series for a guild (or the primary guild's when there is none)."""
+        return self.events.get(self.bot.guild_configs.get(guild.id if guild else None).guild_id)
+
+    def _open_events(self, guild_id):
+        events = GuildEvents(self.bot.guild_configs.get(guild_id))
+        self._refresh_wakeup(events)
+        return events
+
+    async def _close_events(self, events):
+        # series_task only walks loaded guilds, so an unloaded guild also wakes for its next series occurrence.
+        self._set_wakeup(events.guild_id, self._next_wakeup(events))
+        await events.close()
+
+    def _set_wakeup(self, guild_id, due):
+        entry = self._wakeups.get(guild_id)
+        if entry is not None:
+            if entry['reminder_time'] == due:
+                return
+            self.wakeups.cancel(entry)
+            del self._wakeups[guild_id]
+        if due is not None:
+            entry = self._wakeups[guild_id] = {'reminder_time': due, 'guild_id': guild_id}
+            self.wakeups.add(entry)
+
+    def _next_wakeup(self, events):
+        """Returns when a guild next has work: its earliest reminder, or a series occurrence coming within the horizon."""
+        candidates = [events.scheduler.next_due()]
+        for rule in events.series.values():
+            occurrence = next(self._series_occurrences(rule), None)
+            # A finished series is due now, so that series_task removes it.
+            candidates.append(int((occurrence[1] - self.series_horizon).timestamp()) if occurrence else int(time.time()))
+        candidates = [due for due in candidates if due is not None]
+        return min(candidates) if candidates else None
+
+    def _refresh_wakeup(self, events, paced=False):
+        """Points a loaded guild's wakeup at its next reminder and records when the guild next needs loading."""
+        due = events.scheduler.next_due()
+        if paced and due is not None:
+            # Still catching up on a backlog; pace the next burst.
+            due = max(due, time.time() + self.reminder_burst_interval)
+        self._set_wakeup(events.guild_id, due)
+        next_wakeup = self._next_wakeup(events)
+        if events.guild_id not in self._next_wakeups or self._next_wakeups[events.guild_id] != next_wakeup:
+            self._next_wakeups[events.guild_id] = next_wakeup
+            self.wakeup_store.mark_dirty()
+
+    def _save_reminders(self, events):
+        # Coalesced and written off the event loop by the state store.
+        events.store.mark_dirty()
+        self._refresh_wakeup(events)
+
+    def _save_series(self, events):
+        events.series_store.mark_dirty()
+        self._refresh_wakeup(events)
+
+    async def cog_command_error(self, ctx, error):
+        await handle_command_error(ctx, error)
+
+    @tasks.loop(seconds=0)
     async def reminder_task(self):
-        await self.bot.wait_until_ready()
+        # Sleeps until the earliest guild wakeup is due; /event and /cancelevent wake it early.
+        for wakeup in await self.wakeups.next_batch():
+            self._wakeups.pop(wakeup['guild_id'], None)
+            events = self.events.get(wakeup['guild_id'])
+            due_reminders = events.scheduler.pop_due(limit=self.reminder_burst_size)
+            self._send_reminders(due_reminders)
+            if due_reminders:
+                events.store.mark_dirty()
+            self._refresh_wakeup(events, paced=len(due_reminders) >= self.reminder_burst_size)
 
-        current_time = int(datetime.datetime.now(pytz.utc).timestamp())
-        reminders_to_remove = []
-        for reminder in self.reminders:
-            if current_time >= reminder["reminder_time"]:
-                try:
-                    channel = self.bot.get_channel(reminder["channel_id"])
-                    if channel:
-                        embed = discord.Embed(
-                            title=f":bell: Reminder: {reminder['original_title']}",
-                            description=reminder["message_content"],
-                            color=discord.Color.orange()
-                        )
-                        embed.add_field(name="Event Time", value=f"<t:{reminder['reminder_time']}:F>", inline=False)
+    def _send_reminders(self, due_reminders):
+        for reminder in due_reminders:
+            try:
+                channel = self.bot.get_channel(reminder["channel_id"])
+                if channel:
+                    embed = discord.Embed(
+                        title=f":bell: Reminder: {reminder['original_title']}",
+                        description=reminder["message_content"],
+                        color=discord.Color.orange()
+                    )
+                    embed.add_field(name="Event Time", value=f"<t:{reminder['reminder_time']}:F>", inline=False)
+                    if reminder.get("mention_attendees"):
+                        # Only the members who said they're going, instead of the whole role.
+                        mention = self._attendee_mentions(reminder["event_id"])
+                    else:
                         mention = f"<@&{reminder['role_id']}>" if reminder.get("role_id") else ""
-                        await channel.send(content=mention, embed=embed)
-                    reminders_to_remove.append(reminder)
-                except Exception as e:
-                    print(f"[{datetime.datetime.now()}] Reminder error for event ID {reminder.get('event_id', 'N/A')}: {e}")
-                    reminders_to_remove.append(reminder)
-
-        if reminders_to_remove:
-            self.reminders = [r for r in self.reminders if r not in reminders_to_remove]
-            self._save_reminders()
+                    # Queued per channel, so one slow channel doesn't hold up the other reminders.
+                    self.bot.dispatcher.enqueue(channel.id, content=mention, embed=embed)
+            except Exception as e:
+                log.error("Reminder error for event ID %s: %s", reminder.get('event_id', 'N/A'), e)
 
     @reminder_task.before_loop
     async def before_reminder_task(self):
         await self.bot.wait_until_ready()
 
-    def date_to_epoch(self, date_string, time_string, timezone_string, date_format="%Y-%m-%d %H:%M:%S"):
+    def date_to_epoch(self, date_string, time_string, timezone_string, date_formats=DATE_FORMATS):
         try:
-            datetime_str = f"{date_string} {time_string}"
-            naive_dt_object = datetime.datetime.strptime(datetime_str, date_format)
-            local_timezone = pytz.timezone(timezone_string)
+            naive_dt_object = self.timezones.parse_datetime(date_string, time_string, tuple(date_formats))
+            local_timezone = self.timezones.resolve(timezone_string)
+            if naive_dt_object is None or local_timezone is None:
+                return None, None
             aware_dt_object = local_timezone.localize(naive_dt_object)
             utc_dt_object = aware_dt_object.astimezone(pytz.utc)
             return int(utc_dt_object.timestamp()), utc_dt_object
         except Exception as e:
-            print(f"Error converting date to epoch: {e}")
+            log.warning("Error converting date to epoch: %s", e)
             return None, None
 
+    def _event_embed(self, title, event_epoch_time, voice_channel_mention, host_mention, description):
+        embed = discord.Embed(
+            title=":alarm_clock: Odin's Valhalla Event :alarm_clock:",
+            color=discord.Color.blue()
+        )
+        embed.add_field(name="Event Title", value=title, inline=False)
+        embed.add_field(name="Time & Date", value=f"<t:{event_epoch_time}:F>", inline=False)
+        embed.add_field(name="Voice Channel", value=voice_channel_mention, inline=False)
+        embed.add_field(name="Host", value=host_mention, inline=False)
+        embed.add_field(name="Description", value=description, inline=False)
+        for status in STATUSES:
+            embed.add_field(name=f"{RSVP_LABELS[status]} (0)", value="-", inline=True)
+        return embed
+
+    def _schedule_reminders(self, events, event_id, title, event_datetime_utc, reminder_minutes, channel_id, role_id, mention_attendees=False):
+        """Adds the reminders for one event occurrence. Returns how many were scheduled."""
+        current_epoch = int(datetime.datetime.now(pytz.utc).timestamp())
+        scheduled_reminders_count = 0
+        for minutes in reminder_minutes:
+            if minutes is not None and minutes > 0:
+                reminder_epoch = int((event_datetime_utc - datetime.timedelta(minutes=minutes)).timestamp())
+                if reminder_epoch > current_epoch:
+                    events.scheduler.add({
+                        "event_id": event_id,
+                        "reminder_time": reminder_epoch,
+                        "channel_id": channel_id,
+                        "message_content": f"'{title}' starts in {minutes} min!",
+                        "original_title": title,
+                        "role_id": role_id,
+                        "mention_attendees": mention_attendees
+                    })
+                    scheduled_reminders_count += 1
+        if scheduled_reminders_count > 0:
+            self._save_reminders(events)
+        return scheduled_reminders_count
+
+    async def _create_scheduled_event(self, guild, title, description, event_datetime_utc, location, reason):
+        end_time = event_datetime_utc + datetime.timedelta(hours=1)
+
+        # --- MODIFIED PART FOR OLDER PYCORD/DISCORD.PY VERSIONS ---
+        # Removed entity_type and using 'location' with channel mention as fallback
+        return await guild.create_scheduled_event(
+            name=title,
+            description=description,
+            start_time=event_datetime_utc,
+            end_time=end_time,
+            location=location, # Using mention string for location
+            reason=reason
+        )
+        # --- END MODIFIED PART ---
+
     @discord.slash_command(description="Creates an event with a voice channel.")
+    @requires('events.manage')
     async def event(self, ctx,
                       title: str,
                       date: str,
                       time: str,
-                      timezone: str,
+                      timezone: Option(str, "Timezone, e.g. UTC, EST or Europe/London.", autocomplete=timezone_autocomplete),
                       host: discord.Member,
                       description: str,
                       voice_channel: discord.VoiceChannel,
                       reminder1_minutes: Option(int, required=False) = None,
                       reminder2_minutes: Option(int, required=False) = None,
                       reminder_channel: Option(discord.TextChannel, required=False) = None,
-                      mention_role: Option(discord.Role, required=False) = None):
-        if not self._user_is_admin(ctx):
-            await ctx.respond("You don't have permission to use this command.", ephemeral=True)
+                      mention_role: Option(discord.Role, required=False) = None,
+                      repeat: Option(str, "Repeat the event on a schedule.", choices=list(FREQUENCIES), required=False) = None,
+                      repeat_until: Option(str, "Last date to repeat on, YYYY-MM-DD (event timezone).", required=False) = None,
+                      repeat_count: Option(int, "Total number of occurrences, including this one.", min_value=2, required=False) = None,
+                      mention_attendees: Option(bool, "Reminders mention only members who RSVP'd going, instead of the role.", required=False) = False):
+        if self.timezones.resolve(timezone) is None:
+            suggestion = self.timezones.suggest(timezone)
+            hint = f" Did you mean `{suggestion}`?" if suggestion else ""
+            await ctx.respond(f"Unknown timezone '{timezone}'.{hint}", ephemeral=True)
             return
 
         event_epoch_time, event_datetime_utc = self.date_to_epoch(date, time, timezone)
@@ -100,82 +438,179 @@ class admin(commands.Cog):
             await ctx.respond("Invalid or past date/time. Please provide a future date/time.", ephemeral=True)
             return
 
+        if (repeat_until or repeat_count) and not repeat:
+            await ctx.respond("Please choose how often to repeat the event.", ephemeral=True)
+            return
+        until_local = None
+        if repeat_until:
+            until_local = self.timezones.parse_datetime(repeat_until, "23:59:59", DATE_FORMATS)
+            if until_local is None:
+                await ctx.respond("Invalid repeat end date. Please use the format YYYY-MM-DD.", ephemeral=True)
+                return
+
         await ctx.defer() 
 
-        embed = discord.Embed(
-            title=":alarm_clock: Odin's Valhalla Event :alarm_clock:",
-            color=discord.Color.blue()
-        )
-        embed.add_field(name="Event Title", value=title, inline=False)
-        embed.add_field(name="Time & Date", value=f"<t:{event_epoch_time}:F>", inline=False)
-        embed.add_field(name="Voice Channel", value=voice_channel.mention, inline=False)
-        embed.add_field(name="Host", value=host.mention, inline=False)
-        embed.add_field(name="Description", value=description, inline=False)
+        embed = self._event_embed(title, event_epoch_time, voice_channel.mention, host.mention, description)
 
         try:
-            end_time = event_datetime_utc + datetime.timedelta(hours=1)
-            
-            # --- MODIFIED PART FOR OLDER PYCORD/DISCORD.PY VERSIONS ---
-            # Removed entity_type and using 'location' with channel mention as fallback
-            created_event = await ctx.guild.create_scheduled_event(
-                name=title,
-                description=description,
-                start_time=event_datetime_utc,
-                end_time=end_time,
-                location=voice_channel.mention, # Using mention string for location
-                reason=f"Event created by {ctx.author.name}"
+            created_event = await self._create_scheduled_event(
+                ctx.guild, title, description, event_datetime_utc, voice_channel.mention,
+                f"Event created by {ctx.author.name}"
             )
-            # --- END MODIFIED PART ---
-
-            embed.set_footer(text=f"Event ID: {created_event.id}")
-            await ctx.followup.send(embed=embed) 
 
-            reminder_channel_id = reminder_channel.id if reminder_channel else getattr(self.config, 'REMINDER_CHANNEL_ID', ctx.channel.id)
+            events = self._events(ctx.guild)
+            reminder_channel_id = reminder_channel.id if reminder_channel else getattr(self.bot.guild_configs.get(ctx.guild.id), 'REMINDER_CHANNEL_ID', ctx.channel.id)
             role_id = mention_role.id if mention_role else None
-            current_epoch = int(datetime.datetime.now(pytz.utc).timestamp())
-            scheduled_reminders_count = 0
-
-            for minutes in [reminder1_minutes, reminder2_minutes]:
-                if minutes is not None and minutes > 0:
-                    reminder_epoch = int((event_datetime_utc - datetime.timedelta(minutes=minutes)).timestamp())
-                    if reminder_epoch > current_epoch:
-                        self.reminders.append({
-                            "event_id": created_event.id,
-                            "reminder_time": reminder_epoch,
-                            "channel_id": reminder_channel_id,
-                            "message_content": f"'{title}' starts in {minutes} min!",
-                            "original_title": title,
-                            "role_id": role_id
-                        })
-                        scheduled_reminders_count += 1
+
+            footer = f"Event ID: {created_event.id}"
+            if repeat:
+                # Only the rule is stored; series_task creates each later occurrence when it comes within the horizon.
+                series_id = str(created_event.id)
+                events.series[series_id] = {
+                    "series_id": series_id,
+                    "guild_id": ctx.guild.id,
+                    "title": title,
+                    "description": description,
+                    "host_mention": host.mention,
+                    "voice_channel_mention": voice_channel.mention,
+                    "timezone": timezone,
+                    "start_local": self.timezones.parse_datetime(date, time, DATE_FORMATS).strftime(DATE_FORMATS[0]),
+                    "frequency": repeat,
+                    "until_local": until_local.strftime(DATE_FORMATS[0]) if until_local else None,
+                    "count": repeat_count,
+                    "next_index": 1,
+                    "reminder_minutes": [reminder1_minutes, reminder2_minutes],
+                    "reminder_channel_id": reminder_channel_id,
+                    "role_id": role_id,
+                    "mention_attendees": mention_attendees
+                }
+                self._save_series(events)
+                footer += f" | Repeats {repeat} (Series ID: {series_id})"
+
+            embed.set_footer(text=footer)
+            self.rsvps.open(created_event.id, event_epoch_time)
+            await ctx.followup.send(embed=embed, view=RSVPView(self.bot)) 
+
+            scheduled_reminders_count = self._schedule_reminders(
+                events, created_event.id, title, event_datetime_utc, [reminder1_minutes, reminder2_minutes], reminder_channel_id, role_id,
+                mention_attendees
+            )
 
             if scheduled_reminders_count > 0:
-                self._save_reminders()
                 await ctx.followup.send(f"Event created and {scheduled_reminders_count} reminder(s) scheduled in <#{reminder_channel_id}>.", ephemeral=True)
             else:
                 await ctx.followup.send("Event created. No valid reminders were scheduled.", ephemeral=True)
 
 
         except discord.Forbidden:
-            print(f"[{datetime.datetime.now()}] Missing permissions to create scheduled event or send messages.")
+            log.warning("Missing permissions to create scheduled event or send messages.", extra=context_fields(ctx))
             await ctx.followup.send("I don't have permission to create scheduled events or send messages in the specified channel. Please check my role permissions.", ephemeral=True)
         except Exception as e:
-            print(f"[{datetime.datetime.now()}] Error creating scheduled event: {e}")
+            log.error("Error creating scheduled event: %s", e, exc_info=e, extra=context_fields(ctx))
             await ctx.followup.send("An unexpected error occurred while creating the server event. Please try again or contact support.", ephemeral=True)
 
-    @discord.slash_command(description="Cancels a scheduled event by its ID.")
-    async def cancelevent(self, ctx, event_id: str):
-        if not self._user_is_admin(ctx):
-            await ctx.respond("You don't have permission to use this command.", ephemeral=True)
+    def _series_occurrences(self, rule):
+        """Lazily yields (index, utc_datetime) for a series' remaining occurrences."""
+        until_local = rule.get("until_local")
+        return occurrences(
+            datetime.datetime.strptime(rule["start_local"], DATE_FORMATS[0]),
+            self.timezones.resolve(rule["timezone"]),
+            rule["frequency"],
+            start_index=rule["next_index"],
+            until=datetime.datetime.strptime(until_local, DATE_FORMATS[0]) if until_local else None,
+            count=rule.get("count")
+        )
+
+    @tasks.loop(minutes=10)
+    async def series_task(self):
+        now = datetime.datetime.now(pytz.utc)
+        horizon = now + self.series_horizon
+        # Guilds that aren't loaded are loaded by reminder_task once their next occurrence comes within the horizon.
+        for events in self.events.loaded().values():
+            for series_id, rule in list(events.series.items()):
+                finished = True
+                for index, occurrence_utc in self._series_occurrences(rule):
+                    if occurrence_utc > horizon:
+                        finished = False
+                        break
+                    if occurrence_utc > now:
+                        if not await self._create_series_occurrence(events, rule, occurrence_utc):
+                            finished = False
+                            break  # Try again on the next pass
+                    # Occurrences missed while the bot was offline are skipped.
+                    rule["next_index"] = index + 1
+                    events.series_store.mark_dirty()
+                if finished:
+                    log.info("Recurring event series %s ('%s') has ended.", series_id, rule['title'], extra={'guild_id': rule['guild_id']})
+                    del events.series[series_id]
+                    events.series_store.mark_dirty()
+            self._refresh_wakeup(events)
+        # RSVPs are kept for a day after an event starts, then dropped.
+        self.rsvps.prune(86400)
+
+    @series_task.before_loop
+    async def before_series_task(self):
+        await self.bot.wait_until_ready()
+
+    @tasks.loop(minutes=5)
+    async def evict_idle_events(self):
+        await self.events.evict_idle()
+
+    async def _create_series_occurrence(self, events, rule, occurrence_utc):
+        """Creates the Discord event, announcement and reminders for one occurrence."""
+        guild = self.bot.get_guild(rule["guild_id"])
+        if guild is None:
+            log.warning("Guild %s for event series %s not found.", rule['guild_id'], rule['series_id'])
+            return False
+        try:
+            created_event = await self._create_scheduled_event(
+                guild, rule["title"], rule["description"], occurrence_utc, rule["voice_channel_mention"],
+                f"Recurring event series {rule['series_id']}"
+            )
+        except Exception as e:
+            log.error("Error creating occurrence of event series %s: %s", rule['series_id'], e, extra={'guild_id': rule['guild_id']})
+            return False
+
+        event_epoch_time = int(occurrence_utc.timestamp())
+        embed = self._event_embed(rule["title"], event_epoch_time, rule["voice_channel_mention"], rule["host_mention"], rule["description"])
+        embed.set_footer(text=f"Event ID: {created_event.id} | Repeats {rule['frequency']} (Series ID: {rule['series_id']})")
+        self.rsvps.open(created_event.id, event_epoch_time)
+        self.bot.dispatcher.enqueue(rule["reminder_channel_id"], embed=embed, view=RSVPView(self.bot))
+        self._schedule_reminders(
+            events, created_event.id, rule["title"], occurrence_utc, rule["reminder_minutes"], rule["reminder_channel_id"], rule["role_id"],
+            rule.get("mention_attendees", False)
+        )
+        return True
+
+    @discord.slash_command(description="Stops a recurring event series. Already created events are kept.")
+    @requires('events.manage')
+    async def cancelseries(self, ctx, series_id: str):
+        events = self._events(ctx.guild)
+        rule = events.series.get(series_id.strip())
+        # Unconfigured guilds share the primary guild's store; don't let one guild stop another's.
+        if rule is None or rule["guild_id"] != ctx.guild.id:
+            await ctx.respond("No recurring event series with that ID.", ephemeral=True)
             return
+        del events.series[rule["series_id"]]
+        self._save_series(events)
+        await ctx.respond(f"Recurring event '{rule['title']}' will not be scheduled again. Use /cancelevent to cancel an already created occurrence.", ephemeral=True)
 
+    @discord.slash_command(description="Cancels a scheduled event by its ID.")
+    @requires('events.manage')
+    async def cancelevent(self, ctx, event_id: str):
         try:
             event_id = int(event_id)
         except ValueError:
             await ctx.respond("Invalid event ID format. Please provide a numerical ID.", ephemeral=True)
             return
 
-        scheduled_event = discord.utils.get(await ctx.guild.fetch_scheduled_events(), id=event_id)
+        # Pycord keeps scheduled events cached from the gateway, so this is normally a dict lookup.
+        scheduled_event = ctx.guild.get_scheduled_event(event_id)
+        if not scheduled_event:
+            try:
+                scheduled_event = await ctx.guild.fetch_scheduled_event(event_id)
+            except discord.NotFound:
+                scheduled_event = None
         if not scheduled_event:
             await ctx.respond("Event not found in Discord's scheduled events.", ephemeral=True)
             return
@@ -183,22 +618,105 @@ class admin(commands.Cog):
         try:
             await scheduled_event.delete()
         except discord.Forbidden:
-            print(f"[{datetime.datetime.now()}] Missing permissions to delete scheduled event ID {event_id}.")
+            log.warning("Missing permissions to delete scheduled event ID %s.", event_id, extra=context_fields(ctx))
             await ctx.respond("I don't have permission to cancel this scheduled event. Please check my role permissions.", ephemeral=True)
             return
         except Exception as e:
-            print(f"[{datetime.datetime.now()}] Error deleting event ID {event_id}: {e}")
+            log.error("Error deleting event ID %s: %s", event_id, e, extra=context_fields(ctx))
             await ctx.respond("An unexpected error occurred while cancelling the event.", ephemeral=True)
             return
 
-        original_count = len(self.reminders)
-        self.reminders = [r for r in self.reminders if r['event_id'] != event_id]
-        deleted_count = original_count - len(self.reminders)
+        events = self._events(ctx.guild)
+        deleted_count = events.scheduler.cancel_event(event_id)
 
         if deleted_count > 0:
-            self._save_reminders()
+            self._save_reminders(events)
 
         await ctx.respond(f"Event '{scheduled_event.name}' successfully canceled. {deleted_count} associated reminder(s) removed.", ephemeral=True)
 
+    @commands.Cog.listener()
+    async def on_scheduled_event_delete(self, scheduled_event):
+        # Covers events deleted directly in the Discord UI as well as through /cancelevent.
+        events = self._events(scheduled_event.guild)
+        if events.scheduler.cancel_event(scheduled_event.id):
+            self._save_reminders(events)
+        self.rsvps.close(scheduled_event.id)
+
+    @commands.Cog.listener()
+    async def on_scheduled_event_update(self, before, after):
+        if after.status == discord.ScheduledEventStatus.canceled:
+            events = self._events(after.guild)
+            if events.scheduler.cancel_event(after.id):
+                self._save_reminders(events)
+            self.rsvps.close(after.id)
+
+    @discord.slash_command(description="Shows bot performance statistics.")
+    @requires('bot.stats')
+    async def botstats(self, ctx):
+        events = self._events(ctx.guild)
+        metrics = self.bot.metrics
+        gauges = metrics.gauges()
+        uptime = datetime.timedelta(seconds=int(gauges['ovbot_uptime_seconds'][1]))
+        embed = discord.Embed(title=":bar_chart: Bot Stats", color=discord.Color.dark_teal())
+        embed.add_field(name="Uptime", value=str(uptime), inline=True)
+        embed.add_field(name="Gateway Latency", value=f"{gauges['ovbot_gateway_latency_seconds'][1] * 1000:.0f} ms", inline=True)
+        embed.add_field(
+            name="Event Loop Lag",
+            value=f"p99 {metrics.loop_lag.quantile(0.99) * 1000:.1f} ms / max {metrics.loop_lag.max * 1000:.1f} ms",
+            inline=True
+        )
+        embed.add_field(name="Pending Reminders", value=str(len(events.scheduler)), inline=True)
+        embed.add_field(name="Events Taking RSVPs", value=str(len(self.rsvps)), inline=True)
+        if 'ovbot_outbound_queue_depth' in gauges:
+            embed.add_field(
+                name="Outbound Queue",
+                value=f"{gauges['ovbot_outbound_queue_depth'][1]} queued, {gauges['ovbot_outbound_dropped_total'][1]} dropped",
+                inline=True
+            )
+        embed.add_field(
+            name="Reminder Flushes",
+            value=f"{events.store.flush_count} (last {events.store.last_flush_seconds * 1000:.1f} ms)",
+            inline=True
+        )
+
+        # Busiest commands first; Discord allows 25 fields per embed.
+        busiest = sorted(metrics.command_latency.items(), key=lambda item: item[1].count, reverse=True)[:15]
+        for name, histogram in busiest:
+            ack = metrics.command_ack[name]
+            embed.add_field(
+                name=f"/{name}",
+                value=(
+                    f"{histogram.count} calls, {metrics.command_errors[name]} errors\n"
+                    f"p50 {histogram.quantile(0.5) * 1000:.0f} ms / p95 {histogram.quantile(0.95) * 1000:.0f} ms\n"
+                    f"ack p95 {ack.quantile(0.95) * 1000:.0f} ms"
+                ),
+                inline=True
+            )
+        await ctx.respond(embed=embed, ephemeral=True)
+
+    @discord.slash_command(description="Reloads a cog without restarting the bot.")
+    @requires('bot.reload')
+    async def reload(self, ctx,
+                     cog: Option(str, "The cog to reload, e.g. cogs.admin.", autocomplete=extension_autocomplete)):
+        extension = cog if cog.startswith('cogs.') else f'cogs.{cog}'
+        if extension not in self.bot.extensions:
+            await ctx.respond(f"`{extension}` is not loaded.", ephemeral=True)
+            return
+
+        await ctx.defer(ephemeral=True)
+        started = time.perf_counter()
+        try:
+            await self.bot.reloader.reload(extension)
+        except UnreachableCommandsError as e:
+            log.error("Reloaded %s, but its commands are unreachable: %s", extension, e, extra=context_fields(ctx))
+            await ctx.followup.send(f"Reloaded `{extension}`, but some of its commands can't be used. Restart with `--force-sync` to resync them.\n`{e}`", ephemeral=True)
+            return
+        except Exception as e:
+            log.error("Failed to reload %s, kept the previous version. Error: %s", extension, e, exc_info=e, extra=context_fields(ctx))
+            await ctx.followup.send(f"Reloading `{extension}` failed, so the previous version is still running.\n`{e}`", ephemeral=True)
+            return
+        log.info("%s reloaded %s", ctx.author, extension, extra=context_fields(ctx))
+        await ctx.followup.send(f"Reloaded `{extension}` in {(time.perf_counter() - started) * 1000:.0f} ms.", ephemeral=True)
+
 def setup(bot):
     bot.add_cog(admin(bot))
@@ -0,0 +1,188 @@
+import discord
+from discord.ext import commands
+from discord import Option
+import logging
+import time
+from utils.hot_reload import take_handoff
+from utils.keywords import KeywordMatcher, normalize_phrase
+from utils.log import context_fields
+from utils.permissions import handle_command_error, requires
+from utils.state_store import StateStore
+
+TRIGGERS_FILE = 'chat_triggers.json'
+MAX_TRIGGERS = 500  # Per guild
+MAX_PHRASE_LENGTH = 100
+MAX_REPLY_LENGTH = 1000
+MAX_REPLIES_PER_MESSAGE = 3
+
+log = logging.getLogger(__name__)
+
+async def trigger_autocomplete(ctx: discord.AutocompleteContext):
+    triggers = ctx.cog.triggers_for(ctx.interaction.guild_id)
+    value = normalize_phrase(ctx.value or "")
+    return [phrase for phrase in sorted(triggers) if value in phrase][:25]
+
+class chat(commands.Cog):
+    """
+    Answers keywords in the RS3 general chat channel with canned replies.
+
+    Staff manage the triggers (boss names, items, clan FAQ) with /trigger.
+    Each guild's triggers are compiled into one Aho-Corasick matcher, so a
+    message is checked against all of them in a single pass; the matcher is
+    only rebuilt after the triggers change. Each trigger has a cooldown per
+    channel so a busy conversation doesn't get the same reply over and over.
+    """
+
+    def __init__(self, bot):
+        self.bot = bot
+        # Only these channels are ever matched against; everything else is dropped on the first check.
+        self.channel_ids = frozenset(
+            guild_config.RS3_GENERAL_CHAT_CHANNEL_ID
+            for guild_config in bot.guild_configs
+            if getattr(guild_config, 'RS3_GENERAL_CHAT_CHANNEL_ID', None)
+        )
+        self.default_cooldown = getattr(bot.config, 'CHAT_TRIGGER_COOLDOWN_SECONDS', 120.0)
+        # CHAT_TRIGGERS from config, used until a guild's staff edit their triggers.
+        self.configured = {
+            guild_config.guild_id: {
+                normalize_phrase(phrase): dict(reply) if isinstance(reply, dict) else {'reply': reply, 'cooldown': None}
+                for phrase, reply in getattr(guild_config, 'CHAT_TRIGGERS', {}).items()
+            }
+            for guild_config in bot.guild_configs
+        }
+        handoff = take_handoff(bot, self.qualified_name)
+        if handoff:
+            self.store = handoff['store']
+            self.triggers = handoff['triggers']
+            self._cooldowns = handoff['cooldowns']
+        else:
+            # Guilds that have edited their triggers: {guild ID: {phrase: {'reply': ..., 'cooldown': seconds or None}}}
+            self.store = StateStore(TRIGGERS_FILE, {}, flush_delay=getattr(bot.config, 'STATE_FLUSH_DELAY_SECONDS', 1.0))
+            self.triggers = {int(guild_id): triggers for guild_id, triggers in self.store.load().items()}
+            self._cooldowns = {}  # (channel ID, phrase) -> monotonic time the trigger may fire again
+        self.store.bind(lambda: {str(guild_id): triggers for guild_id, triggers in self.triggers.items()})
+        self._matchers = {}  # guild ID -> KeywordMatcher, dropped whenever that guild's triggers change
+
+    def export_state(self):
+        return {
+            'store': self.store,
+            'triggers': self.triggers,
+            'cooldowns': self._cooldowns
+        }
+
+    async def cog_command_error(self, ctx, error):
+        await handle_command_error(ctx, error)
+
+    def triggers_for(self, guild_id):
+        """Returns a guild's triggers: the edited set if staff changed any, otherwise CHAT_TRIGGERS from config."""
+        if guild_id in self.triggers:
+            return self.triggers[guild_id]
+        return self.configured.get(guild_id, {})
+
+    def _editable_triggers(self, guild_id):
+        # The first edit copies the configured defaults, which are then kept with the edits.
+        if guild_id not in self.triggers:
+            self.triggers[guild_id] = {phrase: dict(trigger) for phrase, trigger in self.configured.get(guild_id, {}).items()}
+        return self.triggers[guild_id]
+
+    def _matcher(self, guild_id):
+        matcher = self._matchers.get(guild_id)
+        if matcher is None:
+            matcher = self._matchers[guild_id] = KeywordMatcher(self.triggers_for(guild_id))
+        return matcher
+
+    def _triggers_changed(self, guild_id):
+        self._matchers.pop(guild_id, None)
+        self.store.mark_dirty()
+
+    @commands.Cog.listener()
+    async def on_message(self, message):
+        # Most messages are in other channels; they cost one set lookup.
+        if message.channel.id not in self.channel_ids or message.author.bot or not message.content:
+            return
+        matcher = self._matcher(message.guild.id)
+        if not matcher:
+            return
+        phrases = matcher.find(normalize_phrase(message.content))
+        if not phrases:
+            return
+
+        triggers = self.triggers_for(message.guild.id)
+        now = time.monotonic()
+        replies = []
+        for phrase in phrases:
+            key = (message.channel.id, phrase)
+            if self._cooldowns.get(key, 0) > now:
+                continue
+            trigger = triggers[phrase]
+            cooldown = trigger.get('cooldown')
+            self._cooldowns[key] = now + (self.default_cooldown if cooldown is None else cooldown)
+            replies.append(trigger['reply'])
+            if len(replies) == MAX_REPLIES_PER_MESSAGE:
+                break
+        if replies:
+            self.bot.dispatcher.enqueue(message.channel.id, content="\n".join(replies))
+
+    trigger = discord.SlashCommandGroup("trigger", "Keyword replies in the RS3 general chat.")
+
+    @trigger.command(description="Add or change a keyword reply.")
+    @requires('chat.triggers')
+    async def add(self, ctx,
+                  phrase: Option(str, "The word or phrase to respond to, e.g. a boss or item name."),
+                  reply: Option(str, "What the bot says, e.g. a guide link."),
+                  cooldown: Option(int, "Seconds before this trigger can fire again in the channel.", min_value=0, required=False) = None):
+        phrase = normalize_phrase(phrase)
+        if not phrase or len(phrase) > MAX_PHRASE_LENGTH:
+            await ctx.respond(f"Phrases must be 1 to {MAX_PHRASE_LENGTH} characters.", ephemeral=True)
+            return
+        if len(reply) > MAX_REPLY_LENGTH:
+            await ctx.respond(f"Replies are limited to {MAX_REPLY_LENGTH} characters.", ephemeral=True)
+            return
+        triggers = self._editable_triggers(ctx.guild.id)
+        if phrase not in triggers and len(triggers) >= MAX_TRIGGERS:
+            await ctx.respond(f"This server already has {MAX_TRIGGERS} triggers. Remove one first.", ephemeral=True)
+            return
+        updated = phrase in triggers
+        triggers[phrase] = {'reply': reply, 'cooldown': cooldown}
+        self._triggers_changed(ctx.guild.id)
+        log.info("%s %s chat trigger '%s'", ctx.author, "updated" if updated else "added", phrase, extra=context_fields(ctx))
+        await ctx.respond(f"{'Updated' if updated else 'Added'} the reply for `{phrase}`.", ephemeral=True)
+
+    @trigger.command(description="Remove a keyword reply.")
+    @requires('chat.triggers')
+    async def remove(self, ctx,
+                     phrase: Option(str, "The trigger to remove.", autocomplete=trigger_autocomplete)):
+        phrase = normalize_phrase(phrase)
+        triggers = self._editable_triggers(ctx.guild.id)
+        if triggers.pop(phrase, None) is None:
+            await ctx.respond(f"There's no trigger for `{phrase}`.", ephemeral=True)
+            return
+        self._triggers_changed(ctx.guild.id)
+        log.info("%s removed chat trigger '%s'", ctx.author, phrase, extra=context_fields(ctx))
+        await ctx.respond(f"Removed the reply for `{phrase}`.", ephemeral=True)
+
+    @trigger.command(name="list", description="List the keyword replies.")
+    @requires('chat.triggers')
+    async def list_triggers(self, ctx):
+        triggers = self.triggers_for(ctx.guild.id)
+        if not triggers:
+            await ctx.respond("No keyword replies are set up. Add one with /trigger add.", ephemeral=True)
+            return
+        lines = []
+        for phrase in sorted(triggers):
+            reply = triggers[phrase]['reply']
+            lines.append(f"`{phrase}` → {reply if len(reply) <= 80 else reply[:79] + '…'}")
+        # Discord allows 4096 characters in an embed description.
+        description = ""
+        for index, line in enumerate(lines):
+            if len(description) + len(line) + 30 > 4096:
+                description += f"…and {len(lines) - index} more"
+                break
+            description += line + "\n"
+        embed = discord.Embed(title=f":speech_balloon: Keyword Replies ({len(triggers)})", description=description, color=discord.Color.blurple())
+        await ctx.respond(embed=embed, ephemeral=True)
+
+
+def setup(bot):
+    """Called by Pycord to add the cog to the bot."""
+    bot.add_cog(chat(bot))
@@ -1,7 +1,13 @@
 import discord
 from discord.ext import commands
 from discord import Option
-import random
+import logging
+from utils.dice import DiceError, roll
+from utils.log import context_fields
+
+MESSAGE_LIMIT = 2000  # Discord's limit for message content
+
+log = logging.getLogger(__name__)
 
 class randoms(commands.Cog):
     """
@@ -15,15 +21,27 @@ class randoms(commands.Cog):
         # [CORRECTED] The config is now accessed through the bot instance.
         self.config = bot.config # Access config via bot.config
 
-    @discord.slash_command(description="Rolls a random number between 1 and a user-specified number.")
-    async def roll(self, ctx, max_number: int):
-        """Rolls a random number between 1 and a user-specified number."""
-        if max_number <= 0:
-            await ctx.respond("Please enter a positive number.")
+    @discord.slash_command(description="Rolls dice, e.g. 4d6kh3, 100d20+5 or 2d6!. A plain number rolls 1 to that number.")
+    async def roll(self, ctx,
+                   dice: Option(str, "Dice to roll: NdS, ! to explode, kh/kl/dh/dl to keep or drop, + - * / and brackets.")):
+        """Rolls a dice expression and shows the individual dice where there are few enough to list."""
+        expression = dice.strip()
+        if expression.isdigit():
+            # The original /roll took a maximum number; keep that working.
+            expression = f"1d{expression}"
+        try:
+            total, breakdown = roll(expression)
+        except DiceError as e:
+            await ctx.respond(f"Couldn't roll `{dice[:100]}`: {e}", ephemeral=True)
             return
 
-        random_number = random.randrange(1, max_number + 1) # Use max_number + 1 to make it inclusive
-        await ctx.respond(f"You rolled: {random_number} (1 to {max_number})")
+        header = f"🎲 `{expression}` → "
+        footer = f" = **{total:,}**"
+        room = MESSAGE_LIMIT - len(header) - len(footer)
+        if len(breakdown) > room:
+            breakdown = breakdown[:room - 1] + "…"
+        log.debug("Rolled %s = %d", expression, total, extra=context_fields(ctx))
+        await ctx.respond(f"{header}{breakdown}{footer}")
 
 # [CORRECTED] The setup function now only takes `bot` as an argument.
 def setup(bot):
@@ -0,0 +1,271 @@
+import discord
+from discord.ext import commands, tasks
+from discord import Option
+import asyncio
+import collections
+import logging
+import time
+import urllib.parse
+import aiohttp
+from utils.hot_reload import take_handoff
+from utils.log import context_fields
+from utils.permissions import handle_command_error, requires
+from utils.roster import DEFAULT_ROSTER_URL, RoleEditQueue, diff_rosters, fetch_roster, normalize_name
+from utils.state_store import StateStore
+
+ROSTER_FILE = 'roster.json'
+MAX_NAME_QUERIES = 50  # Changed names looked up one by one before paging through every member instead
+
+log = logging.getLogger(__name__)
+
+
+class roster(commands.Cog):
+    """
+    Keeps Discord roles in line with RS3 clan ranks.
+
+    Each guild with ROSTER_CLAN_NAME and ROSTER_RANK_ROLE_IDS configured gets its
+    clan's member list downloaded periodically. Discord members are matched by
+    display name. Only members whose roster entry changed since the last sync,
+    or who changed on Discord since then, are checked and edited. If the list
+    is byte-for-byte unchanged and nobody changed on Discord, the sync stops
+    after the download.
+    """
+
+    def __init__(self, bot):
+        self.bot = bot
+        self.guilds = {
+            guild_config.guild_id: guild_config
+            for guild_config in bot.guild_configs
+            if getattr(guild_config, 'ROSTER_CLAN_NAME', None) and getattr(guild_config, 'ROSTER_RANK_ROLE_IDS', None)
+        }
+        handoff = take_handoff(bot, self.qualified_name)
+        if handoff:
+            self.store = handoff['store']
+            self.snapshots = handoff['snapshots']
+            self.dirty = handoff['dirty']
+            self.last_reports = handoff['last_reports']
+        else:
+            # Last synced roster per guild: {'digest': ..., 'members': {normalized name: [name, rank]}}
+            self.store = StateStore(ROSTER_FILE, {}, flush_delay=getattr(bot.config, 'STATE_FLUSH_DELAY_SECONDS', 1.0))
+            self.snapshots = self.store.load()
+            self.store.bind(lambda: self.snapshots)
+            self.dirty = collections.defaultdict(set)  # guild_id -> IDs of members changed on Discord since the last sync
+            self.last_reports = {}  # guild_id -> report of the last sync
+        self.edits = RoleEditQueue(
+            concurrency=getattr(bot.config, 'ROSTER_EDIT_CONCURRENCY', 2),
+            per_second=getattr(bot.config, 'ROSTER_EDITS_PER_SECOND', 2.0)
+        )
+        self._lock = asyncio.Lock()
+        self._session = None
+        self.bot.metrics.register_gauge(
+            'ovbot_roster_last_sync_seconds', 'Duration of the most recent roster sync.',
+            lambda: max((report['total_ms'] for report in self.last_reports.values()), default=0) / 1000
+        )
+        if self.guilds:
+            self.sync_task.change_interval(minutes=getattr(bot.config, 'ROSTER_SYNC_MINUTES', 30))
+            self.sync_task.start()
+
+    def export_state(self):
+        return {
+            'store': self.store,
+            'snapshots': self.snapshots,
+            'dirty': self.dirty,
+            'last_reports': self.last_reports
+        }
+
+    def cog_unload(self):
+        self.sync_task.cancel()
+        if self._session is not None:
+            asyncio.create_task(self._session.close())
+
+    def _get_session(self):
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=60))
+        return self._session
+
+    async def cog_command_error(self, ctx, error):
+        await handle_command_error(ctx, error)
+
+    # Anything that could change which roles a member should have marks them for the next sync.
+    @commands.Cog.listener()
+    async def on_member_join(self, member):
+        if member.guild.id in self.guilds:
+            self.dirty[member.guild.id].add(member.id)
+
+    @commands.Cog.listener()
+    async def on_member_update(self, before, after):
+        if after.guild.id in self.guilds and (before.display_name != after.display_name or before.roles != after.roles):
+            self.dirty[after.guild.id].add(after.id)
+
+    @tasks.loop(minutes=30)
+    async def sync_task(self):
+        for guild_id in self.guilds:
+            try:
+                await self.sync_guild(guild_id)
+            except Exception as e:
+                log.error("Roster sync failed: %s", e, exc_info=e, extra={'guild_id': guild_id})
+
+    @sync_task.before_loop
+    async def before_sync_task(self):
+        await self.bot.wait_until_ready()
+
+    async def _guild_members(self, guild, names=None, member_ids=()):
+        """
+        Returns the guild's members; given `names`, at least those whose normalized
+        display name is one of them, plus the members in `member_ids`.
+        """
+        if guild.chunked:
+            return guild.members
+        if names is None or len(names) > MAX_NAME_QUERIES:
+            # Paging through the whole member list is only worth it for full syncs and mass changes.
+            return [member async for member in guild.fetch_members(limit=None)]
+        members = {}
+        member_ids = list(member_ids)
+        for start in range(0, len(member_ids), 100):
+            for member in await guild.query_members(user_ids=member_ids[start:start + 100], limit=100, cache=False):
+                members[member.id] = member
+        # Discord matches the start of a name, and separators differ between RSNs and
+        # display names, so look up the first word and compare normalized names after.
+        for prefix in {name.split(' ')[0] for name in names}:
+            found = await guild.query_members(query=prefix, limit=100, cache=False)
+            if len(found) == 100:
+                # Too common a prefix to be sure the member we want was included.
+                return [member async for member in guild.fetch_members(limit=None)]
+            members.update((member.id, member) for member in found)
+        return list(members.values())
+
+    def _desired_roles(self, guild_config, entry):
+        """Returns the managed role IDs a member with this roster entry (or None) should hold."""
+        if entry is None:
+            return set()
+        rank_roles = {rank.lower(): role_id for rank, role_id in guild_config.ROSTER_RANK_ROLE_IDS.items()}
+        desired = {rank_roles[entry[1].lower()]} if entry[1].lower() in rank_roles else set()
+        member_role_id = getattr(guild_config, 'ROSTER_MEMBER_ROLE_ID', None)
+        if member_role_id:
+            desired.add(member_role_id)
+        return desired
+
+    async def sync_guild(self, guild_id, full=False):
+        """Runs one sync for a guild and returns its report."""
+        async with self._lock:
+            guild_config = self.guilds[guild_id]
+            guild = self.bot.get_guild(guild_id)
+            if guild is None:
+                raise RuntimeError(f"Guild {guild_id} is not available")
+            started = time.perf_counter()
+            url = getattr(guild_config, 'ROSTER_URL', DEFAULT_ROSTER_URL).format(
+                clan=urllib.parse.quote_plus(guild_config.ROSTER_CLAN_NAME)
+            )
+            current, digest = await fetch_roster(self._get_session(), url)
+            report = {
+                'members': len(current), 'joined': 0, 'left': 0, 'rank_changed': 0, 'checked': 0, 'edits': 0, 'failed': 0,
+                'skipped': False, 'download_ms': (time.perf_counter() - started) * 1000
+            }
+
+            snapshot = self.snapshots.get(str(guild_id))
+            dirty = self.dirty.pop(guild_id, set())
+            if snapshot and not full and snapshot['digest'] == digest and not dirty:
+                report['skipped'] = True
+                return self._finish(guild_id, report, started)
+
+            try:
+                previous = {key: tuple(value) for key, value in snapshot['members'].items()} if snapshot else {}
+                joined, left, rank_changed = diff_rosters(previous, current)
+                report.update(joined=len(joined), left=len(left), rank_changed=len(rank_changed))
+                if not current:
+                    raise RuntimeError("The roster download had no members; not removing anyone's roles.")
+                if previous and not full and len(left) > len(previous) // 2:
+                    # A mostly-missing list is far more likely a Jagex outage than a mass exodus.
+                    raise RuntimeError(
+                        f"{len(left)} of {len(previous)} members are missing from the roster download. "
+                        "Not removing roles; run /rostersync full:True if this is correct."
+                    )
+
+                if snapshot is None or full:
+                    candidates = [member for member in await self._guild_members(guild) if not member.bot]
+                else:
+                    changed_names = joined | left | rank_changed
+                    candidates = [
+                        member for member in await self._guild_members(guild, changed_names, dirty)
+                        if not member.bot and (member.id in dirty or normalize_name(member.display_name) in changed_names)
+                    ]
+
+                managed = set(guild_config.ROSTER_RANK_ROLE_IDS.values())
+                if getattr(guild_config, 'ROSTER_MEMBER_ROLE_ID', None):
+                    managed.add(guild_config.ROSTER_MEMBER_ROLE_ID)
+                remove_departed = getattr(guild_config, 'ROSTER_REMOVE_DEPARTED', True)
+                edits = []
+                for member in candidates:
+                    name = normalize_name(member.display_name)
+                    entry = current.get(name)
+                    # Members who don't match an RSN are only touched if they matched one last time, i.e. they
+                    # left the clan; guests, alts and nicknamed staff never had their roles from the roster.
+                    if entry is None and (not remove_departed or name not in previous):
+                        continue
+                    held = {role.id for role in member.roles} & managed
+                    desired = self._desired_roles(guild_config, entry)
+                    add = [role for role in map(guild.get_role, desired - held) if role is not None]
+                    remove = [role for role in map(guild.get_role, held - desired) if role is not None]
+                    if add or remove:
+                        edits.append((member, add, remove))
+                report['checked'] = len(candidates)
+                report['edits'] = len(edits)
+
+                failed, rejected = await self.edits.run(edits, reason="Clan roster sync")
+            except BaseException:
+                # Whatever stopped the sync, the members changed on Discord still need checking.
+                self.dirty[guild_id] |= dirty
+                raise
+            report['failed'] = len(failed) + len(rejected)
+            # Failed edits are retried on the next sync even if nothing else changes. Rejected ones
+            # (already logged) would fail the same way, so they wait until the member or roster changes.
+            self.dirty[guild_id].update(member.id for member in failed)
+
+            self.snapshots[str(guild_id)] = {'digest': digest, 'members': {key: list(value) for key, value in current.items()}}
+            self.store.mark_dirty()
+            return self._finish(guild_id, report, started)
+
+    def _finish(self, guild_id, report, started):
+        report['total_ms'] = (time.perf_counter() - started) * 1000
+        self.last_reports[guild_id] = report
+        if report['skipped']:
+            log.info("Roster unchanged (%d members), sync skipped in %.0f ms", report['members'], report['total_ms'], extra={'guild_id': guild_id})
+        else:
+            log.info(
+                "Roster sync: %d members, %d joined, %d left, %d rank changes; %d checked, %d role edits (%d failed) in %.0f ms (download %.0f ms)",
+                report['members'], report['joined'], report['left'], report['rank_changed'], report['checked'],
+                report['edits'], report['failed'], report['total_ms'], report['download_ms'], extra={'guild_id': guild_id}
+            )
+        return report
+
+    @discord.slash_command(description="Syncs Discord roles with the RS3 clan roster now.")
+    @requires('roster.sync')
+    async def rostersync(self, ctx,
+                         full: Option(bool, "Check every member, not just the ones that changed.", required=False) = False):
+        if ctx.guild.id not in self.guilds:
+            await ctx.respond("Roster sync isn't configured for this server.", ephemeral=True)
+            return
+        await ctx.defer(ephemeral=True)
+        try:
+            report = await self.sync_guild(ctx.guild.id, full=full)
+        except Exception as e:
+            log.error("Roster sync failed: %s", e, extra=context_fields(ctx))
+            await ctx.followup.send(f"Roster sync failed: {e}", ephemeral=True)
+            return
+
+        embed = discord.Embed(title=":scroll: Roster Sync", color=discord.Color.blurple())
+        embed.add_field(name="Clan Members", value=str(report['members']), inline=True)
+        if report['skipped']:
+            embed.description = "The roster hasn't changed since the last sync."
+        else:
+            embed.add_field(name="Joined / Left", value=f"{report['joined']} / {report['left']}", inline=True)
+            embed.add_field(name="Rank Changes", value=str(report['rank_changed']), inline=True)
+            embed.add_field(name="Members Checked", value=str(report['checked']), inline=True)
+            embed.add_field(name="Role Edits", value=f"{report['edits'] - report['failed']} applied, {report['failed']} failed", inline=True)
+        embed.set_footer(text=f"Took {report['total_ms']:.0f} ms (download {report['download_ms']:.0f} ms)")
+        await ctx.followup.send(embed=embed, ephemeral=True)
+
+
+def setup(bot):
+    """Called by Pycord to add the cog to the bot."""
+    bot.add_cog(roster(bot))
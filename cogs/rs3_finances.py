@@ -1,41 +1,83 @@
 import discord
 from discord.ext import commands
 from discord import Option
-import json
-import os
+import asyncio
+import csv
 import datetime
+import io
+import logging
 import pytz
-
-# Custom exception for channel checks to provide a specific error message.
-class WrongChannelError(commands.CheckFailure):
-    pass
-
-# [ADDED] Custom exception for role checks to provide a specific error message.
-class NotBankManagerError(commands.CheckFailure):
-    pass
-
-# Custom check function to see if the user has a bank manager role.
-def is_bank_manager():
-    async def predicate(ctx):
-        # Get the list of allowed role IDs from the config file attached to the bot.
-        allowed_role_ids = ctx.bot.config.BANK_MANAGER_ROLE_IDS
-        # Check if any of the user's roles are in the allowed list.
-        if any(role.id in allowed_role_ids for role in ctx.author.roles):
-            return True
-        # [MODIFIED] Raise a specific error if the user does not have the role.
-        raise NotBankManagerError("User does not have a required bank manager role.")
-    return commands.check(predicate)
-
-# Custom check function to see if the command is used in the correct channel.
-def in_admin_channel():
-    async def predicate(ctx):
-        allowed_channel_id = ctx.bot.config.ADMIN_BOT_COMMANDS_CHANNEL_ID
-        if ctx.channel.id == allowed_channel_id:
-            return True
+import re
+from discord.ext import tasks
+from utils.grand_exchange import GrandExchangeError
+from utils.guilds import PartitionManager
+from utils.hot_reload import take_handoff
+from utils.log import context_fields
+from utils.ledger import REPORT_WINDOWS, BankLedger
+from utils.permissions import handle_command_error, in_admin_channel, requires
+from utils.state_store import StateStore
+
+HISTORY_PAGE_SIZE = 10
+# A message can carry at most 10 embeds, and each description at most 4096 characters.
+MAX_EMBEDS_PER_MESSAGE = 10
+EMBED_DESCRIPTION_LIMIT = 4096
+BATCH_ADD_WORDS = ('add', 'deposit', '+')
+BATCH_REMOVE_WORDS = ('remove', 'withdraw', 'withdrawal', '-')
+SPARKLINE_CHARS = "▁▂▃▄▅▆▇█"
+REPORT_PERIOD_NAMES = {'day': "Daily", 'week': "Weekly", 'month': "Monthly"}
+MAX_DONATION_ITEMS = 50
+INDEX_WAIT_SECONDS = 2.0  # How long /clanbank add waits for the item index before giving up
+# One donated item: "2 Abyssal whip", "2x Abyssal whip", "Abyssal whip x2" or just "Abyssal whip".
+ITEM_ENTRY = re.compile(
+    r'^(?:(?P<lead>\d+(?:\.\d+)?[kmb]?)\s*x?\s+)?(?P<name>.+?)(?:\s+x\s*(?P<trail>\d+(?:\.\d+)?[kmb]?))?$',
+    re.IGNORECASE
+)
+
+
+async def item_autocomplete(ctx: discord.AutocompleteContext):
+    # Answered from the in-memory item index; until it has loaded, there is nothing to suggest.
+    grand_exchange = ctx.bot.grand_exchange
+    if grand_exchange.index is None:
+        grand_exchange.warm()
+        return []
+    return grand_exchange.index.complete(ctx.value)
+
+log = logging.getLogger(__name__)
+
+
+class ClanBank:
+    """One guild's clan bank: the running total, its JSON state file and its SQLite ledger."""
+
+    def __init__(self, guild_config, handoff=None):
+        self.guild_id = guild_config.guild_id
+        self.file_path = guild_config.data_path('BANK_FILE_PATH', 'clan_bank.json')
+        if handoff:
+            # Taken over from the cog instance being reloaded, pending writes and all.
+            self.store, self.total, self.ledger = handoff['store'], handoff['total'], handoff['ledger']
         else:
-            # Raise a custom exception to be caught by the error handler.
-            raise WrongChannelError(f"This command can only be used in the designated admin channel.")
-    return commands.check(predicate)
+            # Each change is journaled as the new total; the journal is folded back into the JSON file periodically.
+            self.store = StateStore(
+                self.file_path,
+                {'total': 0},
+                flush_delay=getattr(guild_config, 'STATE_FLUSH_DELAY_SECONDS', 1.0),
+                journal=getattr(guild_config, 'BANK_JOURNAL_ENABLED', True)
+            )
+            self.total = self.store.load().get('total', 0)
+            # Every deposit and withdrawal is also recorded in a local SQLite ledger for auditing.
+            self.ledger = BankLedger(guild_config.data_path('LEDGER_FILE_PATH', 'clan_bank_ledger.sqlite3'))
+        self.store.bind(lambda: {'total': self.total})
+
+    def export_state(self):
+        return {'store': self.store, 'total': self.total, 'ledger': self.ledger}
+
+    def save(self):
+        """Schedules a save of the current bank total."""
+        self.store.mark_dirty({'total': self.total})
+
+    async def close(self):
+        """Writes out anything pending and releases the ledger connection."""
+        await self.store.flush()
+        await self.ledger.close()
 
 
 class RS3Finances(commands.Cog):
@@ -45,27 +87,42 @@ class RS3Finances(commands.Cog):
 
     def __init__(self, bot):
         self.bot = bot
-        # Get the bank file path from the bot's config.
-        self.bank_file_path = self.bot.config.BANK_FILE_PATH
-        self.bank_total = self._load_bank()
+        # Each guild's bank is loaded on first use and closed again once the guild has been idle a while.
+        self.banks = PartitionManager(
+            lambda guild_id: ClanBank(self.bot.guild_configs.get(guild_id)),
+            lambda bank: bank.close(),
+            idle_seconds=getattr(self.bot.config, 'GUILD_STATE_IDLE_SECONDS', 3600)
+        )
+        # On /reload the previous instance hands over the banks it had open (see utils/hot_reload.py).
+        self._handed_off = False
+        handoff = take_handoff(bot, self.qualified_name)
+        for guild_id, state in (handoff or {}).items():
+            self.banks.adopt(guild_id, ClanBank(self.bot.guild_configs.get(guild_id), state))
+        self.bot.metrics.register_gauge(
+            'ovbot_bank_partitions_loaded', 'Clan banks currently loaded in memory.', lambda: len(self.banks)
+        )
+        self.evict_idle_banks.start()
 
-    def _load_bank(self):
-        """Loads the bank total from the JSON file specified in the config."""
-        if os.path.exists(self.bank_file_path):
-            try:
-                with open(self.bank_file_path, 'r') as f:
-                    data = json.load(f)
-                    return data.get('total', 0)
-            except (json.JSONDecodeError, IOError):
-                return 0
-        return 0
-
-    def _save_bank(self):
-        """Saves the current bank total to the JSON file specified in the config."""
-        # Ensure the directory exists before trying to save the file.
-        os.makedirs(os.path.dirname(self.bank_file_path), exist_ok=True)
-        with open(self.bank_file_path, 'w') as f:
-            json.dump({'total': self.bank_total}, f, indent=4)
+    def _bank(self, guild) -> ClanBank:
+        """Returns the clan bank for a guild (or the primary guild's bank when there is none)."""
+        return self.banks.get(self.bot.guild_configs.get(guild.id if guild else None).guild_id)
+
+    def export_state(self):
+        self._handed_off = True
+        return {guild_id: bank.export_state() for guild_id, bank in self.banks.loaded().items()}
+
+    def cog_unload(self):
+        self.evict_idle_banks.cancel()
+        if not self._handed_off:
+            # Unloaded for good: write out the totals and close the ledgers.
+            asyncio.create_task(self.banks.close_all())
+
+    async def cog_command_error(self, ctx, error):
+        await handle_command_error(ctx, error, missing_capability_message="You do not have a required role to manage the clan bank.")
+
+    @tasks.loop(minutes=5)
+    async def evict_idle_banks(self):
+        await self.banks.evict_idle()
 
     def _format_gp(self, amount):
         """Formats a number into a GP string (e.g., 1.1k, 1.05m, 1.15b)."""
@@ -97,13 +154,271 @@ class RS3Finances(commands.Cog):
         except ValueError:
             return None
 
-    async def _log_transaction(self, ctx, transaction_type: str, amount: int, description: str | None, color: discord.Color):
-        """Sends a log of the transaction to the log channel."""
-        log_channel_id = self.bot.config.CLAN_BANK_LOG_CHANNEL_ID
+    def _parse_items(self, index, text):
+        """
+        Reads a list of donated items, e.g. '2 Abyssal whip, 100 Saradomin brew (4)'.
+
+        Returns [(quantity, item ID)]. Raises ValueError with a message for the
+        user if an entry can't be understood.
+        """
+        entries = []
+        errors = []
+        for raw in re.split(r'[,;\n]', text):
+            raw = raw.strip()
+            if not raw:
+                continue
+            match = ITEM_ENTRY.match(raw)
+            name = match['name'].strip()
+            quantity = self._parse_gp_string(match['lead'] or match['trail'] or '1')
+            item_id = index.resolve(name)
+            if quantity is None or quantity <= 0:
+                errors.append(f"Invalid quantity in '{raw}'")
+            elif item_id is None:
+                suggestion = index.suggest(name)
+                errors.append(f"Unknown item '{name}'" + (f" (did you mean '{suggestion}'?)" if suggestion else ""))
+            else:
+                entries.append((quantity, item_id))
+        if not entries and not errors:
+            errors.append("No items given.")
+        if len(entries) > MAX_DONATION_ITEMS:
+            errors.append(f"At most {MAX_DONATION_ITEMS} different items can be donated at once.")
+        if errors:
+            raise ValueError("\n".join(errors))
+        return entries
+
+    async def _value_items(self, index, entries):
+        """
+        Values parsed items at current Grand Exchange prices.
+
+        Returns (total value, [(quantity, name, unit price)]). Raises ValueError with
+        a message for the user if an item has no price.
+        """
+        # One request for all of them (minus whatever is cached).
+        prices = await self.bot.grand_exchange.prices([item_id for _, item_id in entries])
+        valued = []
+        errors = []
+        for quantity, item_id in entries:
+            entry = prices[item_id]
+            if entry is None:
+                errors.append(f"No Grand Exchange price for '{index.name(item_id)}'")
+            else:
+                valued.append((quantity, index.name(item_id), entry['price']))
+        if errors:
+            raise ValueError("\n".join(errors))
+        return sum(quantity * price for quantity, _, price in valued), valued
+
+    async def _respond_privately(self, ctx, message):
+        """Sends an ephemeral reply, replacing the public "thinking" message if the command was deferred."""
+        if ctx.interaction.response.is_done():
+            await ctx.interaction.delete_original_response()
+        await ctx.respond(message, ephemeral=True)
+
+    async def _record_transaction(self, bank, ctx, amount: int, description: str | None, balance: int):
+        """Writes a transaction (signed amount) and the balance right after it to the ledger."""
+        try:
+            await bank.ledger.record(
+                int(datetime.datetime.now(pytz.utc).timestamp()),
+                ctx.author.id,
+                ctx.author.display_name,
+                amount,
+                description,
+                balance
+            )
+        except Exception as e:
+            log.error("Failed to write transaction to the clan bank ledger. %s", e, extra=context_fields(ctx))
+
+    def _parse_batch_lines(self, lines):
+        """
+        Parses batch entries one line at a time, yielding (line_number, amount, reason, error).
+
+        Each line is `type, amount[, reason]` (type is add/remove) or the shorthand
+        `+amount[, reason]` / `-amount[, reason]`. Blank lines, `#` comments and a
+        `type,amount,reason` header are skipped. `amount` is signed; `error` is set
+        (and amount is None) for lines that can't be parsed.
+        """
+        for line_number, row in enumerate(csv.reader(lines), start=1):
+            fields = [field.strip() for field in row]
+            if not fields or not fields[0] or fields[0].startswith('#'):
+                continue
+            if line_number == 1 and fields[0].lower() == 'type':
+                continue
+
+            kind = fields[0].lower()
+            if kind[:1] in ('+', '-') and len(kind) > 1:
+                # Shorthand: "+10m, reason"
+                fields = [kind[0], kind[1:]] + fields[1:]
+                kind = kind[0]
+            if kind in BATCH_ADD_WORDS:
+                sign = 1
+            elif kind in BATCH_REMOVE_WORDS:
+                sign = -1
+            else:
+                yield line_number, None, None, f"unknown type '{fields[0]}' (use add/remove)"
+                continue
+
+            if len(fields) < 2 or not fields[1]:
+                yield line_number, None, None, "missing amount"
+                continue
+            parsed_amount = self._parse_gp_string(fields[1])
+            if parsed_amount is None or parsed_amount <= 0:
+                yield line_number, None, None, f"invalid amount '{fields[1]}'"
+                continue
+            reason = ", ".join(field for field in fields[2:] if field) or None
+            yield line_number, sign * parsed_amount, reason, None
+
+    async def _process_batch(self, author, send, lines, strict: bool):
+        """Validates and applies a batch of transactions, then reports back via `send`."""
+        bank = self._bank(author.guild)
+        max_entries = getattr(self.bot.config, 'BATCH_MAX_ENTRIES', 500)
+        entries = []
+        errors = []
+        running = bank.total
+        for line_number, amount, reason, error in self._parse_batch_lines(lines):
+            if error is None and len(entries) >= max_entries:
+                error = f"batch limit of {max_entries} entries reached"
+            if error is None and running + amount < 0:
+                error = f"withdrawal of {self._format_gp(-amount)} GP would overdraw the bank"
+            if error is not None:
+                errors.append(f"Line {line_number}: {error}")
+                continue
+            running += amount
+            entries.append((line_number, amount, reason))
+
+        if not entries or (strict and errors):
+            embed = discord.Embed(title="⚠️ Batch Rejected", color=discord.Color.red())
+            embed.description = "No transactions were applied." if not errors else self._join_limited(
+                errors, "No transactions were applied.\n\n"
+            )
+            await send(embed=embed, ephemeral=True)
+            return
+
+        # Apply the whole batch in one step: no awaits between reading and writing the total.
+        created_at = int(datetime.datetime.now(pytz.utc).timestamp())
+        ledger_rows = []
+        balance = bank.total
+        for _, amount, reason in entries:
+            balance += amount
+            ledger_rows.append((created_at, author.id, author.display_name, amount, reason, balance))
+        bank.total = balance
+        bank.save()
+
+        deposited = sum(amount for _, amount, _ in entries if amount > 0)
+        withdrawn = -sum(amount for _, amount, _ in entries if amount < 0)
+        embed = discord.Embed(title="📦 Batch Applied", color=discord.Color.blurple())
+        embed.add_field(name="Transactions", value=str(len(entries)), inline=True)
+        embed.add_field(name="Deposited", value=f"{self._format_gp(deposited)} GP", inline=True)
+        embed.add_field(name="Withdrawn", value=f"{self._format_gp(withdrawn)} GP", inline=True)
+        embed.add_field(name="New Balance", value=f"{self._format_gp(bank.total)} GP", inline=False)
+        if errors:
+            embed.add_field(name=f"Skipped Lines ({len(errors)})", value=self._join_limited(errors, limit=1024), inline=False)
+        embed.set_footer(text=f"Batch by {author.display_name}")
+        ledger_write = asyncio.create_task(self._record_batch(bank, author, ledger_rows))
+        await send(embed=embed)
+        await ledger_write
+        await self._log_batch(bank, author, entries, deposited, withdrawn)
+
+    async def _record_batch(self, bank, author, ledger_rows):
+        """Writes a batch's transactions to the ledger in one go."""
+        try:
+            await bank.ledger.record_many(ledger_rows)
+        except Exception as e:
+            log.error("Failed to write batch to the clan bank ledger. %s", e, extra={'guild_id': bank.guild_id, 'user_id': author.id})
+
+    def _join_limited(self, lines, prefix="", limit=EMBED_DESCRIPTION_LIMIT):
+        """Joins lines for an embed, cutting off with a count of what didn't fit."""
+        text = prefix
+        for index, line in enumerate(lines):
+            suffix = f"\n...and {len(lines) - index} more"
+            if len(text) + len(line) + 1 + len(suffix) > limit:
+                return text + suffix.lstrip("\n")
+            text += line + "\n"
+        return text
+
+    def _parse_date(self, s: str) -> int | None:
+        """Parses a YYYY-MM-DD date (UTC) into an epoch timestamp. Returns None if invalid."""
+        try:
+            return int(datetime.datetime.strptime(s.strip(), "%Y-%m-%d").replace(tzinfo=pytz.utc).timestamp())
+        except ValueError:
+            return None
+
+    def _history_embed(self, rows, filters_text: str) -> discord.Embed:
+        """Builds one page of the transaction history."""
+        embed = discord.Embed(
+            title="📜 Clan Bank History",
+            description=filters_text or None,
+            color=discord.Color.gold()
+        )
+        if not rows:
+            embed.description = (filters_text + "\n\n" if filters_text else "") + "No transactions found."
+        for row in rows:
+            sign = "+" if row['amount'] >= 0 else "-"
+            value = f"**{sign}{self._format_gp(abs(row['amount']))} GP** by {row['executor_name']}"
+            if row['reason']:
+                value += f"\nReason: {row['reason']}"
+            value += f"\nBalance: {self._format_gp(row['balance'])} GP"
+            embed.add_field(name=f"#{row['id']} • <t:{row['created_at']}:f>", value=value, inline=False)
+        return embed
+
+    def _sparkline(self, values):
+        """Renders values as a row of block characters scaled to the largest one."""
+        peak = max(values, default=0)
+        if peak <= 0:
+            return SPARKLINE_CHARS[0] * len(values)
+        # Anything above zero gets at least the second step, so quiet periods stand apart from empty ones.
+        return "".join(
+            SPARKLINE_CHARS[max(1, round(value / peak * (len(SPARKLINE_CHARS) - 1))) if value > 0 else 0]
+            for value in values
+        )
+
+    def _report_embed(self, report, bank) -> discord.Embed:
+        """Builds the /clanbank report embed from the ledger's rollups."""
+        period = report['period']
+        series = report['series']
+        deposits = [bucket['deposits'] for bucket in series]
+        withdrawals = [bucket['withdrawals'] for bucket in series]
+        income, spend = sum(deposits), sum(withdrawals)
+        # Short-term average over the last quarter of the window, to compare against the whole window.
+        recent = max(1, len(series) // 4)
+
+        embed = discord.Embed(
+            title=f"📈 Clan Bank Report: {REPORT_PERIOD_NAMES[period]}",
+            description=f"Last {len(series)} {period}s, oldest first (UTC). Current balance: **{self._format_gp(bank.total)} GP**",
+            color=discord.Color.gold()
+        )
+        embed.add_field(
+            name=f"Income: {self._format_gp(income)} GP",
+            value=f"`{self._sparkline(deposits)}`\n"
+                  f"Avg/{period}: {self._format_gp(income // len(series))} GP "
+                  f"(last {recent}: {self._format_gp(sum(deposits[-recent:]) // recent)} GP)",
+            inline=False
+        )
+        embed.add_field(
+            name=f"Spend: {self._format_gp(spend)} GP",
+            value=f"`{self._sparkline(withdrawals)}`\n"
+                  f"Avg/{period}: {self._format_gp(spend // len(series))} GP "
+                  f"(last {recent}: {self._format_gp(sum(withdrawals[-recent:]) // recent)} GP)",
+            inline=False
+        )
+        net = income - spend
+        embed.add_field(name="Net", value=f"{'+' if net >= 0 else '-'}{self._format_gp(abs(net))} GP", inline=True)
+        embed.add_field(name="Transactions", value=str(sum(bucket['count'] for bucket in series)), inline=True)
+
+        contributors = report['top_contributors']
+        if contributors:
+            lines = [
+                f"{rank}. {row['executor_name']}: {self._format_gp(row['deposits'])} GP ({row['count']} transactions)"
+                for rank, row in enumerate(contributors, start=1)
+            ]
+            embed.add_field(name="Top Contributors (all time)", value="\n".join(lines), inline=False)
+        return embed
+
+    async def _log_transaction(self, bank, ctx, transaction_type: str, amount: int, description: str | None, color: discord.Color):
+        """Sends a log of the transaction to the guild's log channel."""
+        log_channel_id = self.bot.guild_configs.get(bank.guild_id).CLAN_BANK_LOG_CHANNEL_ID
         log_channel = self.bot.get_channel(log_channel_id)
 
         if not log_channel:
-            print(f"[{datetime.datetime.now()}] ERROR: Clan bank log channel with ID {log_channel_id} not found.")
+            log.error("Clan bank log channel with ID %s not found.", log_channel_id, extra={'guild_id': bank.guild_id})
             return
 
         embed = discord.Embed(
@@ -115,20 +430,55 @@ class RS3Finances(commands.Cog):
         embed.add_field(name="Amount", value=f"{self._format_gp(amount)} GP", inline=False)
         if description:
             embed.add_field(name="Reason", value=description, inline=False)
-        embed.add_field(name="New Balance", value=f"{self._format_gp(self.bank_total)} GP", inline=False)
+        embed.add_field(name="New Balance", value=f"{self._format_gp(bank.total)} GP", inline=False)
         
-        try:
-            await log_channel.send(embed=embed)
-        except Exception as e:
-            print(f"[{datetime.datetime.now()}] ERROR: Failed to send message to clan bank log channel. {e}")
+        # Queued log embeds for the channel are packed into as few messages as possible.
+        self.bot.dispatcher.enqueue(log_channel_id, embed=embed)
 
 
+    async def _log_batch(self, bank, author, entries, deposited: int, withdrawn: int):
+        """Sends one log message for a whole batch, with the entries spread over several embeds."""
+        log_channel_id = self.bot.guild_configs.get(bank.guild_id).CLAN_BANK_LOG_CHANNEL_ID
+        log_channel = self.bot.get_channel(log_channel_id)
+
+        if not log_channel:
+            log.error("Clan bank log channel with ID %s not found.", log_channel_id, extra={'guild_id': bank.guild_id})
+            return
+
+        summary = discord.Embed(
+            title="Bank Transaction Log: Batch",
+            color=discord.Color.blurple(),
+            timestamp=datetime.datetime.now(pytz.utc)
+        )
+        summary.add_field(name="Executor", value=author.mention, inline=False)
+        summary.add_field(name="Transactions", value=str(len(entries)), inline=True)
+        summary.add_field(name="Deposited", value=f"{self._format_gp(deposited)} GP", inline=True)
+        summary.add_field(name="Withdrawn", value=f"{self._format_gp(withdrawn)} GP", inline=True)
+        summary.add_field(name="New Balance", value=f"{self._format_gp(bank.total)} GP", inline=False)
+        embeds = [summary]
+
+        description = ""
+        for index, (line_number, amount, reason) in enumerate(entries):
+            sign = "+" if amount > 0 else "-"
+            line = f"`L{line_number}` {sign}{self._format_gp(abs(amount))} GP" + (f" — {reason}" if reason else "")
+            if len(description) + len(line) + 1 > EMBED_DESCRIPTION_LIMIT - 40:
+                if len(embeds) == MAX_EMBEDS_PER_MESSAGE - 1:
+                    description += f"...and {len(entries) - index} more"
+                    break
+                embeds.append(discord.Embed(description=description, color=discord.Color.blurple()))
+                description = ""
+            description += line + "\n"
+        if description:
+            embeds.append(discord.Embed(description=description, color=discord.Color.blurple()))
+
+        self.bot.dispatcher.enqueue(log_channel_id, embeds=embeds)
+
     clanbank = discord.SlashCommandGroup("clanbank", "Commands for managing the clan bank.")
 
     @clanbank.command(description="Check the current value of the clan bank.")
     async def check(self, ctx):
         """Displays the current value of the clan bank."""
-        formatted_total = self._format_gp(self.bank_total)
+        formatted_total = self._format_gp(self._bank(ctx.guild).total)
         embed = discord.Embed(
             title="💰 Clan Bank Balance 💰",
             description=f"The current clan bank total is **{formatted_total} GP**.",
@@ -137,44 +487,85 @@ class RS3Finances(commands.Cog):
         await ctx.respond(embed=embed)
 
     @clanbank.command(description="Add funds to the clan bank.")
-    @is_bank_manager()
+    @requires('bank.write')
     @in_admin_channel() # Restrict command to a specific channel
     async def add(self, ctx,
-                  amount: Option(str, "The amount of GP to add (e.g., 500000, 500k, 10m).", required=True),
-                  description: Option(str, "Reason for adding the funds.", required=False) = None
+                  amount: Option(str, "The amount of GP to add (e.g., 500000, 500k, 10m).", required=False) = None,
+                  description: Option(str, "Reason for adding the funds.", required=False) = None,
+                  items: Option(str, "Donated items, valued at GE prices (e.g. '2 Abyssal whip, 100 Saradomin brew (4)').", required=False) = None
                   ):
-        """Adds funds to the clan bank."""
-        parsed_amount = self._parse_gp_string(amount)
-
-        if parsed_amount is None:
-            await ctx.respond("Invalid amount format. Please use a number, or suffixes like 'k', 'm', 'b'.", ephemeral=True)
+        """Adds funds (GP and/or items valued at Grand Exchange prices) to the clan bank."""
+        if amount is None and items is None:
+            await ctx.respond("Please provide an amount, items, or both.", ephemeral=True)
             return
+
+        parsed_amount = 0
+        if amount is not None:
+            parsed_amount = self._parse_gp_string(amount)
+
+            if parsed_amount is None:
+                await ctx.respond("Invalid amount format. Please use a number, or suffixes like 'k', 'm', 'b'.", ephemeral=True)
+                return
             
-        if parsed_amount <= 0:
-            await ctx.respond("Please provide a positive amount to add.", ephemeral=True)
-            return
+            if parsed_amount <= 0:
+                await ctx.respond("Please provide a positive amount to add.", ephemeral=True)
+                return
 
-        self.bank_total += parsed_amount
-        self._save_bank()
+        reason = description
+        valued_items = []
+        if items:
+            try:
+                # The item list is checked before deferring, so typos get a private reply. The
+                # index is normally loaded at startup; on a cold start, don't outlast the interaction.
+                index = await asyncio.wait_for(self.bot.grand_exchange.load_index(), timeout=INDEX_WAIT_SECONDS)
+                entries = self._parse_items(index, items)
+                await ctx.defer() # Pricing may need a request to the Grand Exchange
+                item_value, valued_items = await self._value_items(index, entries)
+            except asyncio.TimeoutError:
+                await ctx.respond("The Grand Exchange item list is still loading. Please try again in a moment.", ephemeral=True)
+                return
+            except ValueError as e:
+                await self._respond_privately(ctx, f"Nothing was added.\n{e}")
+                return
+            except GrandExchangeError as e:
+                log.warning("Grand Exchange lookup failed: %s", e, extra=context_fields(ctx))
+                await self._respond_privately(ctx, "Couldn't get Grand Exchange prices right now, so nothing was added. Please try again later.")
+                return
+            parsed_amount += item_value
+            item_summary = ", ".join(f"{quantity:,} x {name}" for quantity, name, _ in valued_items)
+            description = f"{description} (items: {item_summary})" if description else f"Items: {item_summary}"
+
+        bank = self._bank(ctx.guild)
+        bank.total += parsed_amount
+        bank.save()
         
         formatted_amount = self._format_gp(parsed_amount)
-        formatted_total = self._format_gp(self.bank_total)
+        formatted_total = self._format_gp(bank.total)
 
         embed = discord.Embed(
             title="✅ Funds Added",
             color=discord.Color.green()
         )
         embed.add_field(name="Amount Added", value=f"{formatted_amount} GP", inline=False)
-        if description:
-            embed.add_field(name="Reason", value=description, inline=False)
+        if valued_items:
+            lines = [
+                f"{quantity:,} x {name} @ {self._format_gp(price)} = {self._format_gp(quantity * price)} GP"
+                for quantity, name, price in valued_items
+            ]
+            embed.add_field(name="Items (GE prices)", value=self._join_limited(lines, limit=1024), inline=False)
+        if reason:
+            embed.add_field(name="Reason", value=reason, inline=False)
         embed.add_field(name="New Balance", value=f"{formatted_total} GP", inline=False)
         embed.set_footer(text=f"Transaction by {ctx.author.display_name}")
 
+        # Queued before the first await, so concurrent commands reach the ledger in the order they changed the total.
+        ledger_write = asyncio.create_task(self._record_transaction(bank, ctx, parsed_amount, description, bank.total))
         await ctx.respond(embed=embed)
-        await self._log_transaction(ctx, "Deposit", parsed_amount, description, discord.Color.green())
+        await ledger_write
+        await self._log_transaction(bank, ctx, "Deposit", parsed_amount, description, discord.Color.green())
 
     @clanbank.command(description="Remove funds from the clan bank.")
-    @is_bank_manager()
+    @requires('bank.write')
     @in_admin_channel() # Restrict command to a specific channel
     async def remove(self, ctx,
                      amount: Option(str, "The amount of GP to remove (e.g., 500000, 500k, 10m).", required=True),
@@ -191,15 +582,16 @@ class RS3Finances(commands.Cog):
             await ctx.respond("Please provide a positive amount to remove.", ephemeral=True)
             return
         
-        if parsed_amount > self.bank_total:
+        bank = self._bank(ctx.guild)
+        if parsed_amount > bank.total:
             await ctx.respond("Cannot remove more funds than what is currently in the bank.", ephemeral=True)
             return
 
-        self.bank_total -= parsed_amount
-        self._save_bank()
+        bank.total -= parsed_amount
+        bank.save()
 
         formatted_amount = self._format_gp(parsed_amount)
-        formatted_total = self._format_gp(self.bank_total)
+        formatted_total = self._format_gp(bank.total)
 
         embed = discord.Embed(
             title="❌ Funds Removed",
@@ -211,28 +603,205 @@ class RS3Finances(commands.Cog):
         embed.add_field(name="New Balance", value=f"{formatted_total} GP", inline=False)
         embed.set_footer(text=f"Transaction by {ctx.author.display_name}")
 
+        ledger_write = asyncio.create_task(self._record_transaction(bank, ctx, -parsed_amount, description, bank.total))
         await ctx.respond(embed=embed)
-        await self._log_transaction(ctx, "Withdrawal", parsed_amount, description, discord.Color.red())
-
-    # Updated error handler to distinguish between check failures.
-    @add.error
-    @remove.error
-    async def on_clanbank_error(self, ctx, error):
-        """Handles errors for the clanbank commands."""
-        if isinstance(error, WrongChannelError):
-            # Let the user know they are in the wrong channel.
-            admin_channel = self.bot.get_channel(self.bot.config.ADMIN_BOT_COMMANDS_CHANNEL_ID)
-            await ctx.respond(f"This command can only be used in {admin_channel.mention}.", ephemeral=True)
-        # [MODIFIED] Catch the new, more specific role error.
-        elif isinstance(error, NotBankManagerError):
-            await ctx.respond("You do not have a required role to manage the clan bank.", ephemeral=True)
-        elif isinstance(error, commands.CheckFailure):
-            # Fallback for any other permission errors.
-            await ctx.respond("You do not have permission to use this command.", ephemeral=True)
+        await ledger_write
+        await self._log_transaction(bank, ctx, "Withdrawal", parsed_amount, description, discord.Color.red())
+
+    @clanbank.command(description="Browse the clan bank transaction history.")
+    @requires('bank.history')
+    @in_admin_channel() # Restrict command to a specific channel
+    async def history(self, ctx,
+                      user: Option(discord.Member, "Only show transactions made by this member.", required=False) = None,
+                      start_date: Option(str, "Earliest date to include, YYYY-MM-DD (UTC).", required=False) = None,
+                      end_date: Option(str, "Latest date to include, YYYY-MM-DD (UTC).", required=False) = None
+                      ):
+        """Shows the clan bank ledger one page at a time."""
+        since = until = None
+        filters = []
+        if start_date:
+            since = self._parse_date(start_date)
+            if since is None:
+                await ctx.respond("Invalid start date. Please use the format YYYY-MM-DD.", ephemeral=True)
+                return
+            filters.append(f"From: {start_date}")
+        if end_date:
+            until = self._parse_date(end_date)
+            if until is None:
+                await ctx.respond("Invalid end date. Please use the format YYYY-MM-DD.", ephemeral=True)
+                return
+            until += 86400 # Include the whole end day
+            filters.append(f"To: {end_date}")
+        if user:
+            filters.append(f"Member: {user.mention}")
+
+        view = HistoryView(self, ctx.guild, ctx.author.id, user.id if user else None, since, until, " | ".join(filters))
+        rows = await view.load_page()
+        await ctx.respond(embed=self._history_embed(rows, view.filters_text), view=view)
+
+    @clanbank.command(description="Show income, spend and top contributors over time.")
+    @requires('bank.history')
+    @in_admin_channel() # Restrict command to a specific channel
+    async def report(self, ctx,
+                     period: Option(str, "Group totals by day, week or month.", choices=list(REPORT_WINDOWS), required=False) = 'day',
+                     rebuild: Option(bool, "Recompute the report totals from the full transaction history first.", required=False) = False
+                     ):
+        """Shows the clan bank rollups. Reads a fixed number of rows however long the history is."""
+        bank = self._bank(ctx.guild)
+        if rebuild:
+            if not self.bot.permissions.has(ctx.author, 'bank.write'):
+                await ctx.respond("You do not have a required role to rebuild the clan bank report.", ephemeral=True)
+                return
+            await ctx.defer()
+            await bank.ledger.rebuild_rollups()
+        report = await bank.ledger.report(period, int(datetime.datetime.now(pytz.utc).timestamp()))
+        await ctx.respond(embed=self._report_embed(report, bank))
+
+    @clanbank.command(description="Apply many deposits and withdrawals at once.")
+    @requires('bank.write')
+    @in_admin_channel() # Restrict command to a specific channel
+    async def batch(self, ctx,
+                    file: Option(discord.Attachment, "CSV/text file with one 'add|remove, amount, reason' per line.", required=False) = None,
+                    strict: Option(bool, "Reject the whole batch if any line is invalid.", required=False) = False
+                    ):
+        """Applies a batch of transactions from an attachment, or from a multi-line form."""
+        if file is None:
+            # No attachment: collect the lines in a modal, which supports multi-line input.
+            await ctx.send_modal(BatchModal(self, strict))
+            return
+
+        await ctx.defer()
+        try:
+            data = await file.read()
+        except Exception as e:
+            log.error("Failed to read batch attachment. %s", e, extra=context_fields(ctx))
+            await ctx.followup.send("Could not read the attached file.", ephemeral=True)
+            return
+        lines = io.StringIO(data.decode('utf-8-sig', errors='replace'))
+        await self._process_batch(ctx.author, ctx.followup.send, lines, strict)
+
+    @discord.slash_command(description="Look up an item's current Grand Exchange price.")
+    async def price(self, ctx,
+                    item: Option(str, "The item name.", autocomplete=item_autocomplete),
+                    quantity: Option(str, "How many (e.g. 100, 10k).", required=False) = "1"
+                    ):
+        """Shows the Grand Exchange price of an item."""
+        parsed_quantity = self._parse_gp_string(quantity)
+        if parsed_quantity is None or parsed_quantity <= 0:
+            await ctx.respond("Please provide a positive quantity.", ephemeral=True)
+            return
+        try:
+            index = await self.bot.grand_exchange.load_index()
+            item_id = index.resolve(item)
+            if item_id is None:
+                suggestion = index.suggest(item)
+                await ctx.respond(f"Unknown item '{item}'." + (f" Did you mean '{suggestion}'?" if suggestion else ""), ephemeral=True)
+                return
+            entry = await self.bot.grand_exchange.price(item_id)
+        except GrandExchangeError as e:
+            log.warning("Grand Exchange lookup failed: %s", e, extra=context_fields(ctx))
+            await ctx.respond("Couldn't reach the Grand Exchange right now. Please try again later.", ephemeral=True)
+            return
+        if entry is None:
+            await ctx.respond(f"The Grand Exchange has no price for {index.name(item_id)}.", ephemeral=True)
+            return
+
+        embed = discord.Embed(title=f"💹 {index.name(item_id)}", color=discord.Color.gold())
+        embed.add_field(name="Price", value=f"{entry['price']:,} GP ({self._format_gp(entry['price'])})", inline=True)
+        if parsed_quantity != 1:
+            total = entry['price'] * parsed_quantity
+            embed.add_field(name=f"x {parsed_quantity:,}", value=f"{total:,} GP ({self._format_gp(total)})", inline=True)
+        if isinstance(entry.get('volume'), int):
+            embed.add_field(name="Daily Volume", value=f"{entry['volume']:,}", inline=True)
+        if entry.get('timestamp'):
+            embed.set_footer(text=f"Price as of {entry['timestamp']}")
+        await ctx.respond(embed=embed)
+
+
+class BatchModal(discord.ui.Modal):
+    """Multi-line input for /clanbank batch when no file is attached."""
+
+    def __init__(self, cog, strict: bool):
+        super().__init__(title="Clan Bank Batch")
+        self.bot = cog.bot
+        self.strict = strict
+        self.add_item(discord.ui.InputText(
+            label="One entry per line: add|remove, amount, reason",
+            placeholder="add, 10m, Boss drop split\nremove, 2.5m, Event prizes",
+            style=discord.InputTextStyle.long,
+            max_length=4000
+        ))
+
+    @property
+    def cog(self):
+        return self.bot.get_cog('RS3Finances')
+
+    async def callback(self, interaction):
+        await interaction.response.defer()
+        lines = io.StringIO(self.children[0].value)
+        await self.cog._process_batch(interaction.user, interaction.followup.send, lines, self.strict)
+
+
+class HistoryView(discord.ui.View):
+    """Older/Newer buttons for /clanbank history, paging through the ledger by transaction ID."""
+
+    def __init__(self, cog, guild, author_id, executor_id, since, until, filters_text):
+        super().__init__(timeout=300)
+        self.bot = cog.bot
+        self.guild = guild
+        self.author_id = author_id
+        self.executor_id = executor_id
+        self.since = since
+        self.until = until
+        self.filters_text = filters_text
+        self.newest_id = None
+        self.oldest_id = None
+
+    @property
+    def cog(self):
+        return self.bot.get_cog('RS3Finances')
+
+    async def load_page(self, before_id=None, after_id=None):
+        # Looked up per page: the bank may have been closed as idle since the last click.
+        rows = await self.cog._bank(self.guild).ledger.history(
+            executor_id=self.executor_id,
+            since=self.since,
+            until=self.until,
+            before_id=before_id,
+            after_id=after_id,
+            limit=HISTORY_PAGE_SIZE
+        )
+        if rows:
+            self.newest_id = rows[0]['id']
+            self.oldest_id = rows[-1]['id']
+        elif before_id is not None:
+            # Walked off the old end; "Newer" should land back on the page we came from.
+            self.newest_id = before_id - 1
+        elif after_id is not None:
+            self.oldest_id = after_id + 1
+        # Only the page size tells us whether there may be more in the direction we moved.
+        if after_id is None:
+            self.older.disabled = len(rows) < HISTORY_PAGE_SIZE
+            self.newer.disabled = before_id is None
         else:
-            # For any other errors, log them and send a generic message.
-            print(f"An unhandled error occurred in a clanbank command: {error}")
-            await ctx.respond("An unexpected error occurred. Please try again later.", ephemeral=True)
+            self.newer.disabled = len(rows) < HISTORY_PAGE_SIZE
+            self.older.disabled = False
+        return rows
+
+    async def interaction_check(self, interaction):
+        return interaction.user.id == self.author_id
+
+    async def _show(self, interaction, **page):
+        rows = await self.load_page(**page)
+        await interaction.response.edit_message(embed=self.cog._history_embed(rows, self.filters_text), view=self)
+
+    @discord.ui.button(label="Newer", style=discord.ButtonStyle.secondary)
+    async def newer(self, button, interaction):
+        await self._show(interaction, after_id=self.newest_id)
+
+    @discord.ui.button(label="Older", style=discord.ButtonStyle.secondary)
+    async def older(self, button, interaction):
+        await self._show(interaction, before_id=self.oldest_id)
 
 
 def setup(bot):
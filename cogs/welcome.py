@@ -0,0 +1,121 @@
+from discord.ext import commands
+import asyncio
+import logging
+import string
+
+log = logging.getLogger(__name__)
+
+DEFAULT_WELCOME_MESSAGE = "Welcome to Odin's Valhalla, {mentions}! Say hi and have a look around the clan channels."
+DEFAULT_WELCOME_BATCH_MESSAGE = "Welcome to Odin's Valhalla, {mentions}! That's {count} new faces, say hi and have a look around the clan channels."
+TEMPLATE_FIELDS = ('mentions', 'count', 'guild')
+
+
+def compile_template(template):
+    """
+    Parses a str.format-style template once and returns a render(**fields) function.
+
+    Rendering is then a join over the pre-split parts, and an unknown field is
+    reported when the cog loads rather than on the first join.
+    """
+    parts = []
+    for literal, field, spec, conversion in string.Formatter().parse(template):
+        if literal:
+            parts.append(literal)
+        if field is not None:
+            if field not in TEMPLATE_FIELDS:
+                raise ValueError(f"Unknown field {{{field}}} in welcome template (use {', '.join(TEMPLATE_FIELDS)})")
+            parts.append((field, spec or ''))
+
+    def render(**fields):
+        return "".join(part if isinstance(part, str) else format(fields[part[0]], part[1]) for part in parts)
+    return render
+
+
+class _PendingWelcome:
+    def __init__(self, handle):
+        self.member_ids = []  # Capped at the batch size; later joins only bump `overflow`
+        self.overflow = 0
+        self.handle = handle
+
+
+class welcome(commands.Cog):
+    """
+    Welcomes new members in the door channel.
+
+    Joins are collected per guild for a short window (or until a batch is full)
+    and welcomed with one message, so a recruitment wave or a raid doesn't post
+    a message per member. While earlier welcomes are still waiting to go out,
+    further joins are only counted, so memory stays bounded however many arrive.
+    """
+
+    def __init__(self, bot):
+        self.bot = bot
+        self.batch_seconds = getattr(bot.config, 'WELCOME_BATCH_SECONDS', 10.0)
+        self.batch_size = getattr(bot.config, 'WELCOME_BATCH_MAX_MENTIONS', 40)
+        self.max_queued = getattr(bot.config, 'WELCOME_MAX_QUEUED_MESSAGES', 2)
+        self.templates = {
+            guild_config.guild_id: (
+                compile_template(getattr(guild_config, 'WELCOME_MESSAGE', DEFAULT_WELCOME_MESSAGE)),
+                compile_template(getattr(guild_config, 'WELCOME_BATCH_MESSAGE', DEFAULT_WELCOME_BATCH_MESSAGE))
+            )
+            for guild_config in bot.guild_configs
+        }
+        self.pending = {}  # guild_id -> _PendingWelcome
+
+    def cog_unload(self):
+        # Send whatever is waiting rather than forgetting it.
+        for guild_id in list(self.pending):
+            self._flush(guild_id, force=True)
+
+    def _door_channel_id(self, guild_id):
+        return getattr(self.bot.guild_configs.get(guild_id), 'THE_DOOR_CHANNEL_ID', None)
+
+    @commands.Cog.listener()
+    async def on_member_join(self, member):
+        guild_id = member.guild.id
+        if member.bot or guild_id not in self.templates or not self._door_channel_id(guild_id):
+            return
+
+        pending = self.pending.get(guild_id)
+        if pending is None:
+            handle = asyncio.get_running_loop().call_later(self.batch_seconds, self._flush, guild_id)
+            pending = self.pending[guild_id] = _PendingWelcome(handle)
+        if len(pending.member_ids) < self.batch_size:
+            pending.member_ids.append(member.id)
+        else:
+            pending.overflow += 1
+
+        if len(pending.member_ids) >= self.batch_size and not pending.overflow:
+            # A full batch goes out straight away instead of waiting for the window to close.
+            self._flush(guild_id)
+
+    def _flush(self, guild_id, force=False):
+        pending = self.pending.pop(guild_id, None)
+        if pending is None:
+            return
+        pending.handle.cancel()
+        channel_id = self._door_channel_id(guild_id)
+
+        if not force and self.bot.dispatcher.queue_depth(channel_id) >= self.max_queued:
+            # The channel is still working through earlier welcomes; keep counting and try again later.
+            pending.handle = asyncio.get_running_loop().call_later(self.batch_seconds, self._flush, guild_id)
+            self.pending[guild_id] = pending
+            return
+
+        count = len(pending.member_ids) + pending.overflow
+        mentions = [f"<@{member_id}>" for member_id in pending.member_ids]
+        if pending.overflow:
+            mentions.append(f"{pending.overflow} more")
+        mentions = mentions[0] if len(mentions) == 1 else f"{', '.join(mentions[:-1])} and {mentions[-1]}"
+
+        single, batch = self.templates[guild_id]
+        render = single if count == 1 else batch
+        guild = self.bot.get_guild(guild_id)
+        content = render(mentions=mentions, count=count, guild=guild.name if guild else "the server")
+        if self.bot.dispatcher.enqueue(channel_id, content=content):
+            log.info("Welcomed %d new member(s)", count, extra={'guild_id': guild_id})
+
+
+def setup(bot):
+    """Called by Pycord to add the cog to the bot."""
+    bot.add_cog(welcome(bot))
@@ -26,3 +26,139 @@ BANK_MANAGER_ROLE_IDS = [
 # Path to JSON file for clan bank data
 # (Change this if running from a different path or locally)
 BANK_FILE_PATH = '/opt/ovbot/clan_bank.json'
+
+# Reminder catch-up after downtime: reminders missed while the bot was offline are
+# sent in bursts of at most REMINDER_CATCHUP_BURST, spaced REMINDER_CATCHUP_INTERVAL_SECONDS apart.
+REMINDER_CATCHUP_BURST = 10
+REMINDER_CATCHUP_INTERVAL_SECONDS = 1.0
+
+# Persistence: mutations within this many seconds are coalesced into a single write.
+STATE_FLUSH_DELAY_SECONDS = 1.0
+# Append bank changes to a small journal file and compact it periodically,
+# instead of rewriting clan_bank.json on every change.
+BANK_JOURNAL_ENABLED = True
+
+# SQLite ledger of every clan bank transaction (used by /clanbank history).
+# Defaults to clan_bank_ledger.sqlite3 next to BANK_FILE_PATH.
+LEDGER_FILE_PATH = '/opt/ovbot/clan_bank_ledger.sqlite3'
+
+# Maximum number of entries accepted by a single /clanbank batch.
+BATCH_MAX_ENTRIES = 500
+
+# Outbound message queues: at most CHANNEL_RATE_LIMIT_MESSAGES per channel every
+# CHANNEL_RATE_LIMIT_SECONDS, and at most CHANNEL_QUEUE_MAX messages waiting per channel.
+CHANNEL_RATE_LIMIT_MESSAGES = 5
+CHANNEL_RATE_LIMIT_SECONDS = 5.0
+CHANNEL_QUEUE_MAX = 1000
+
+# Where the fingerprint of the last synced slash commands is kept.
+# Commands are only re-synced when it changes (or with `python ov_bot.py --force-sync`).
+COMMAND_HASH_FILE = '/opt/ovbot/.command_hash'
+
+# Member caching: 'full' keeps every guild member in memory (pycord's default),
+# 'tracked' keeps only members with the staff/bank manager roles above, and
+# 'lru' keeps up to MEMBER_CACHE_MAX_SIZE recently seen members. Anyone not
+# cached is fetched when needed. Extra members are evicted every MEMBER_CACHE_TRIM_SECONDS.
+MEMBER_CACHE_POLICY = 'tracked'
+MEMBER_CACHE_MAX_SIZE = 5000
+MEMBER_CACHE_TRIM_SECONDS = 60.0
+# Download the full member list on connect. Only useful with the 'full' policy.
+CHUNK_GUILDS_AT_STARTUP = False
+
+# Prometheus text-format metrics file for node-exporter's textfile collector.
+# Leave as None to only expose metrics through /botstats.
+METRICS_FILE_PATH = None  # e.g. '/var/lib/node_exporter/textfile_collector/ovbot.prom'
+METRICS_WRITE_INTERVAL_SECONDS = 15.0
+
+# Optional: map role IDs to capabilities explicitly. When unset, RUNESCAPE_STAFF_ROLE_ID
+# grants 'events.manage', 'bot.stats', 'bot.reload', 'roster.sync' and 'chat.triggers', and each BANK_MANAGER_ROLE_IDS role grants
+# 'bank.write' and 'bank.history'.
+# ROLE_CAPABILITIES = {
+#     123456789012345682: {'events.manage', 'bot.stats', 'bot.reload', 'roster.sync', 'chat.triggers', 'bank.write', 'bank.history'},
+#     123456789012345685: {'bank.write', 'bank.history'},
+# }
+
+# Recurring events: occurrences are created (as Discord events with reminders) once
+# they fall within this many hours from now.
+RECURRING_EVENT_HORIZON_HOURS = 168
+
+# Optional: serve more than one guild. Each entry overrides any of the settings above
+# for that guild (channel IDs, role IDs, BANK_FILE_PATH, LEDGER_FILE_PATH, ...).
+# Guilds other than GUILD_ID keep their clan bank, reminders and event series under
+# guilds/<guild id>/ next to BANK_FILE_PATH unless they set their own paths (BANK_FILE_PATH,
+# LEDGER_FILE_PATH, REMINDERS_FILE, SERIES_FILE). When unset, only GUILD_ID is served.
+# GUILDS = {
+#     123456789012345678: {},
+#     223456789012345678: {
+#         'CLAN_BANK_LOG_CHANNEL_ID': 223456789012345681,
+#         'ADMIN_BOT_COMMANDS_CHANNEL_ID': 223456789012345684,
+#         'REMINDER_CHANNEL_ID': 223456789012345686,
+#         'RUNESCAPE_STAFF_ROLE_ID': 223456789012345682,
+#         'BANK_MANAGER_ROLE_IDS': [223456789012345685],
+#     },
+# }
+# A guild's clan bank, reminders and event series are unloaded after this many seconds without use.
+# Unloaded guilds are loaded again when one of their reminders or series occurrences comes due.
+GUILD_STATE_IDLE_SECONDS = 3600
+# Connect through several gateway shards (pycord's AutoShardedBot). Only needed for many guilds.
+AUTO_SHARD = False
+
+# Dev mode: reload a cog as soon as its file changes (same as starting with --dev).
+DEV_RELOAD = False
+
+# Logging. Records are JSON lines (time, level, logger, message and cog/command/guild_id/user_id
+# where known); set LOG_FORMAT = 'text' for plain lines when running in a terminal.
+LOG_LEVEL = 'INFO'
+LOG_FORMAT = 'json'
+# Per-module levels, e.g. {'discord': 'WARNING', 'cogs.rs3_finances': 'DEBUG'}
+LOG_LEVELS = {'discord': 'WARNING'}
+# The same warning/error is logged at most LOG_RATE_LIMIT_BURST times per window.
+LOG_RATE_LIMIT_WINDOW_SECONDS = 60.0
+LOG_RATE_LIMIT_BURST = 5
+
+# Welcome messages in THE_DOOR_CHANNEL_ID. Joins are collected for WELCOME_BATCH_SECONDS (or until
+# WELCOME_BATCH_MAX_MENTIONS have joined) and welcomed together. Fields: {mentions}, {count}, {guild}.
+WELCOME_MESSAGE = "Welcome to Odin's Valhalla, {mentions}! Say hi and have a look around the clan channels."
+WELCOME_BATCH_MESSAGE = "Welcome to Odin's Valhalla, {mentions}! That's {count} new faces, say hi and have a look around the clan channels."
+WELCOME_BATCH_SECONDS = 10.0
+WELCOME_BATCH_MAX_MENTIONS = 40
+# While this many welcomes are still queued for the channel, new joins are only counted.
+WELCOME_MAX_QUEUED_MESSAGES = 2
+
+# Grand Exchange prices for /price and item donations on /clanbank add. Point these at a
+# local stub server for testing.
+GE_API_BASE_URL = 'https://api.weirdgloop.org'
+GE_ITEM_INDEX_URL = 'https://chisel.weirdgloop.org/gazproj/gazbot/rs_dump.json'
+# The item name -> ID index is cached here and refreshed once a day.
+GE_ITEM_INDEX_FILE = '/opt/ovbot/ge_items.json'
+GE_PRICE_CACHE_SECONDS = 300.0
+
+# Clan roster sync: every ROSTER_SYNC_MINUTES the clan member list is downloaded and Discord members
+# (matched by display name = RSN) get the role for their clan rank. Leave ROSTER_RANK_ROLE_IDS empty to
+# disable. ROSTER_URL may point at a local stand-in; {clan} is replaced with the URL-quoted clan name.
+ROSTER_CLAN_NAME = "Odin's Valhalla"
+ROSTER_URL = 'https://secure.runescape.com/m=clan-hiscores/members_lite.ws?clanName={clan}'
+ROSTER_RANK_ROLE_IDS = {}  # e.g. {'Owner': RUNESCAPE_STAFF_ROLE_ID, 'General': 123456789012345690, 'Recruit': 123456789012345691}
+ROSTER_MEMBER_ROLE_ID = None  # Optional role every clan member gets
+# Take the managed roles away from members who left the clan (matched an RSN at the last sync but no
+# longer do). Members who never matched an RSN, like guests or nicknamed staff, are never touched.
+ROSTER_REMOVE_DEPARTED = True
+ROSTER_SYNC_MINUTES = 30
+# Role edits are paced to stay clear of Discord's rate limits.
+ROSTER_EDIT_CONCURRENCY = 2
+ROSTER_EDITS_PER_SECOND = 2.0
+
+# RSVP buttons on event announcements. Responses are journalled to disk in batches every
+# RSVP_FLUSH_SECONDS, and the announcement's counts are edited at most once per RSVP_EDIT_DEBOUNCE_SECONDS.
+RSVP_FLUSH_SECONDS = 5.0
+RSVP_EDIT_DEBOUNCE_SECONDS = 3.0
+
+# Keyword replies in RS3_GENERAL_CHAT_CHANNEL_ID. These are the starting set; once staff change
+# them with /trigger, the edited set is kept in chat_triggers.json instead. A reply can also be
+# {'reply': ..., 'cooldown': seconds} to override the cooldown for that trigger.
+CHAT_TRIGGERS = {
+    'araxxor': "Araxxor guide: https://runescape.wiki/w/Araxxor/Strategies",
+    'clan citadel': "Cap at the citadel every week! Guide: https://runescape.wiki/w/Clan_Citadel",
+}
+# How long a trigger stays quiet in a channel after it has replied.
+CHAT_TRIGGER_COOLDOWN_SECONDS = 120.0
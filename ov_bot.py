@@ -1,3 +1,5 @@
+import time
+STARTUP_STARTED = time.perf_counter() # Measured before the heavy imports so they're included in the timings
 import discord
 from discord.ext import commands
 import config
@@ -5,14 +7,54 @@ import os
 import asyncio
 import signal
 import sys
-import datetime
+import logging
+from utils.command_sync import sync_if_changed
+from utils.dispatcher import MessageDispatcher
+from utils.grand_exchange import DEFAULT_BASE_URL, DEFAULT_ITEM_INDEX_URL, GrandExchange
+from utils.guilds import GuildConfigs
+from utils.hot_reload import Reloader
+from utils.log import setup_logging
+from utils.member_cache import MemberCacheTrimmer, log_memory_report, member_cache_flags
+from utils.metrics import Metrics
+from utils.permissions import PermissionEngine
+from utils.state_store import flush_all
 
 BOT_TOKEN = config.TOKEN
 
+# Everything logs through a queue to a writer thread, so a slow stdout never blocks the event loop (see utils/log.py)
+setup_logging(
+    level=getattr(config, 'LOG_LEVEL', 'INFO'),
+    levels=getattr(config, 'LOG_LEVELS', {'discord': 'WARNING'}),
+    json_format=getattr(config, 'LOG_FORMAT', 'json') == 'json',
+    rate_limit_window=getattr(config, 'LOG_RATE_LIMIT_WINDOW_SECONDS', 60.0),
+    rate_limit_burst=getattr(config, 'LOG_RATE_LIMIT_BURST', 5)
+)
+log = logging.getLogger('ov_bot')
+
+# Pass --force-sync to push slash commands to Discord even if they haven't changed.
+FORCE_SYNC = '--force-sync' in sys.argv[1:]
+COMMAND_HASH_FILE = getattr(config, 'COMMAND_HASH_FILE', '.command_hash')
+# Pass --dev to reload cogs as soon as their files change.
+DEV_RELOAD = '--dev' in sys.argv[1:] or getattr(config, 'DEV_RELOAD', False)
+
+startup_phase_started = time.perf_counter()
+startup_complete = False
+
+def log_startup_phase(phase):
+    global startup_phase_started
+    now = time.perf_counter()
+    log.info("Startup: %s took %.0f ms (%.0f ms total)", phase, (now - startup_phase_started) * 1000, (now - STARTUP_STARTED) * 1000)
+    startup_phase_started = now
+
+log_startup_phase("imports")
+
 cogs_list = [
     'admin',
     'randoms',
-    'rs3_finances' # The new cog for clan finances
+    'rs3_finances', # The new cog for clan finances
+    'welcome',
+    'roster',
+    'chat'
 ]
 
 intents = discord.Intents.default()
@@ -20,48 +62,130 @@ intents.guilds = True
 intents.message_content = True
 intents.members = True
 
-bot = commands.Bot(command_prefix='?', intents=intents, guild_ids=[config.GUILD_ID])
+# 'full' caches every guild member (the pycord default); 'tracked' and 'lru' keep only
+# the members the cogs actually use and fetch the rest on demand (see utils/member_cache.py)
+MEMBER_CACHE_POLICY = getattr(config, 'MEMBER_CACHE_POLICY', 'full')
+
+# Every guild in config.GUILDS (or just GUILD_ID) gets its own channels, roles and clan bank (see utils/guilds.py)
+guild_configs = GuildConfigs(config)
+GUILD_IDS = guild_configs.guild_ids
+
+# Large deployments can let pycord split the guilds over several gateway shards
+bot_class = commands.AutoShardedBot if getattr(config, 'AUTO_SHARD', False) else commands.Bot
+
+# Commands are synced from on_ready, and only when they've changed (see utils/command_sync.py).
+# debug_guilds scopes every command to our guilds as it's added, including commands re-added by /reload.
+bot = bot_class(
+    command_prefix='?',
+    intents=intents,
+    debug_guilds=GUILD_IDS,
+    auto_sync_commands=False,
+    member_cache_flags=member_cache_flags(MEMBER_CACHE_POLICY),
+    chunk_guilds_at_startup=getattr(config, 'CHUNK_GUILDS_AT_STARTUP', MEMBER_CACHE_POLICY == 'full')
+)
 bot.config = config # Attach the config module to the bot instance for cogs to access
+bot.guild_configs = guild_configs
+# Outbound messages from cogs go through per-channel queues (see utils/dispatcher.py)
+bot.dispatcher = MessageDispatcher(
+    bot,
+    rate=getattr(config, 'CHANNEL_RATE_LIMIT_MESSAGES', 5),
+    per=getattr(config, 'CHANNEL_RATE_LIMIT_SECONDS', 5.0),
+    max_queue=getattr(config, 'CHANNEL_QUEUE_MAX', 1000)
+)
+# Evicts members from pycord's cache beyond what MEMBER_CACHE_POLICY keeps
+bot.member_cache = MemberCacheTrimmer(
+    bot,
+    MEMBER_CACHE_POLICY,
+    tracked_role_ids=[
+        role_id
+        for guild_config in guild_configs
+        for role_id in (guild_config.RUNESCAPE_STAFF_ROLE_ID, *guild_config.BANK_MANAGER_ROLE_IDS)
+    ],
+    max_size=getattr(config, 'MEMBER_CACHE_MAX_SIZE', 5000),
+    interval=getattr(config, 'MEMBER_CACHE_TRIM_SECONDS', 60.0)
+)
+bot.member_cache.install()
+# Role -> capability resolution shared by every cog's checks (see utils/permissions.py)
+bot.permissions = PermissionEngine.from_config(config)
+bot.permissions.install(bot)
+# Times every slash command and samples loop lag; /botstats and METRICS_FILE_PATH expose it
+bot.metrics = Metrics(
+    bot,
+    prometheus_path=getattr(config, 'METRICS_FILE_PATH', None),
+    interval=getattr(config, 'METRICS_WRITE_INTERVAL_SECONDS', 15.0)
+)
+bot.metrics.install()
+# Shared Grand Exchange client (one pooled HTTP session, cached prices) for /price and item donations
+bot.grand_exchange = GrandExchange(
+    base_url=getattr(config, 'GE_API_BASE_URL', DEFAULT_BASE_URL),
+    index_url=getattr(config, 'GE_ITEM_INDEX_URL', DEFAULT_ITEM_INDEX_URL),
+    index_path=getattr(config, 'GE_ITEM_INDEX_FILE', 'ge_items.json'),
+    cache_ttl=getattr(config, 'GE_PRICE_CACHE_SECONDS', 300.0)
+)
+# /reload and dev mode swap cog code in place, handing their state to the new version (see utils/hot_reload.py)
+bot.reloader = Reloader(bot, command_hash_path=COMMAND_HASH_FILE)
 
 for cog_name in cogs_list:
     try:
         bot.load_extension(f'cogs.{cog_name}')
-        print(f'[{datetime.datetime.now()}] Loaded cog: {cog_name}')
+        log.info("Loaded cog: %s", cog_name)
+        log_startup_phase(f"load_extension({cog_name})")
     except Exception as e:
-        print(f'[{datetime.datetime.now()}] Failed to load cog {cog_name}. Error: {e}')
+        log.error("Failed to load cog %s. Error: %s", cog_name, e, exc_info=e)
+
+@bot.event
+async def on_connect():
+    if not startup_complete:
+        log_startup_phase("login")
 
 @bot.event
 async def on_ready():
-    print(f'[{datetime.datetime.now()}] Logged in as {bot.user.name}')
-    print(f'[{datetime.datetime.now()}] Bot ID: {bot.user.id}')
-    print(f'[{datetime.datetime.now()}] ------')
+    global startup_complete
+    # on_ready fires again after every gateway reconnect; only the first one needs any work.
+    if startup_complete:
+        log.info("Reconnected as %s", bot.user.name)
+        return
+    startup_complete = True
+    log_startup_phase("first ready")
+    bot.metrics.start()
+    bot.member_cache.start()
+    if DEV_RELOAD:
+        bot.reloader.watch()
+    bot.grand_exchange.warm() # Item names for autocomplete, loaded in the background
+
+    log.info("Logged in as %s (ID: %s)", bot.user.name, bot.user.id)
+    log.info("Serving %d guild(s) over %d shard(s)", len(GUILD_IDS), bot.shard_count or 1)
+    log_memory_report(bot, MEMBER_CACHE_POLICY)
 
-    print(f"[{datetime.datetime.now()}] Attempting explicit sync of slash commands for guild ID: {config.GUILD_ID}")
     try:
-        await asyncio.sleep(0.5)
-        synced_commands = await bot.sync_commands(guild_ids=[config.GUILD_ID])
-        if synced_commands is not None:
-            print(f"[{datetime.datetime.now()}] Successfully synced {len(synced_commands)} commands.")
-            for command in synced_commands:
-                print(f"[{datetime.datetime.now()}]   - /{command.name} (ID: {command.id})")
+        synced_commands = await sync_if_changed(bot, GUILD_IDS, COMMAND_HASH_FILE, force=FORCE_SYNC)
+        if synced_commands is None:
+            log.info("Slash commands unchanged since last sync. Skipping sync, using the existing command IDs.")
         else:
-            print(f"[{datetime.datetime.now()}] bot.sync_commands returned None.")
+            log.info("Successfully synced %d commands for guild ID(s): %s.", len(synced_commands), ', '.join(map(str, GUILD_IDS)))
+            log_startup_phase("command sync")
     except Exception as e:
-        print(f"[{datetime.datetime.now()}] Failed to explicitly sync slash commands. Error: {e}")
+        log.error("Failed to explicitly sync slash commands. Error: %s", e, exc_info=e)
 
 async def shutdown(loop, signal=None):
     if signal:
-        print(f"[{datetime.datetime.now()}] Received exit signal {signal.name}...")
-    print(f"[{datetime.datetime.now()}] Closing Discord connection...")
+        log.info("Received exit signal %s...", signal.name)
+    log.info("Draining outbound message queues...")
+    await bot.dispatcher.drain()
+    # Persist anything still waiting in a coalescing window before tearing down.
+    log.info("Flushing persistent state...")
+    await flush_all()
+    await bot.grand_exchange.close()
+    log.info("Closing Discord connection...")
     await bot.close()
-    print(f"[{datetime.datetime.now()}] Discord connection closed.")
+    log.info("Discord connection closed.")
     tasks = [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
     for task in tasks:
         task.cancel()
     await asyncio.gather(*tasks, return_exceptions=True)
-    print(f"[{datetime.datetime.now()}] Shutting down event loop...")
+    log.info("Shutting down event loop...")
     loop.stop()
-    print(f"[{datetime.datetime.now()}] Event loop stopped.")
+    log.info("Event loop stopped.")
     sys.exit(0)
 
 def handle_signal(signum, frame):
@@ -0,0 +1,83 @@
+import hashlib
+import json
+import logging
+import discord
+
+log = logging.getLogger(__name__)
+
+
+def _normalize(value):
+    # Some payload fields (contexts, integration_types, channel_types) come from sets,
+    # so their order changes between runs. Sort plain value lists; keep option order.
+    if isinstance(value, dict):
+        return {key: _normalize(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple, set, frozenset)):
+        items = [_normalize(item) for item in value]
+        if all(isinstance(item, (int, str)) for item in items):
+            return sorted(items, key=str)
+        return items
+    return value
+
+
+def command_fingerprint(commands, guild_ids):
+    """Returns a stable hash of the command payloads that would be sent to Discord."""
+    payloads = sorted(
+        json.dumps(_normalize(command.to_dict()), sort_keys=True, default=str) for command in commands
+    )
+    digest = hashlib.sha256()
+    digest.update(json.dumps(sorted(guild_ids or [])).encode())
+    for payload in payloads:
+        digest.update(payload.encode())
+    return digest.hexdigest()
+
+
+def read_fingerprint(path):
+    try:
+        with open(path, 'r') as f:
+            return f.read().strip() or None
+    except OSError:
+        return None
+
+
+def write_fingerprint(path, fingerprint):
+    try:
+        with open(path, 'w') as f:
+            f.write(fingerprint)
+    except OSError as e:
+        log.warning("Could not save command fingerprint to %s: %s", path, e)
+
+
+async def attach_command_ids(bot, guild_ids):
+    """
+    Looks up the IDs Discord already has for the bot's guild commands, without writing anything.
+
+    Interactions are matched to commands by ID, so commands need their IDs even
+    when nothing was synced. Returns the pending commands Discord doesn't have.
+    """
+    for guild_id in guild_ids:
+        for data in await bot.http.get_guild_commands(bot.user.id, guild_id):
+            command = discord.utils.get(bot.pending_application_commands, name=data['name'], type=data.get('type'))
+            if command is not None:
+                command.id = data['id']
+                bot._application_commands[command.id] = command
+    return [command for command in bot.pending_application_commands if command.id is None]
+
+
+async def sync_if_changed(bot, guild_ids, path, force=False):
+    """
+    Syncs the bot's slash commands only when their payloads changed since the last sync.
+
+    Returns the synced commands, or None if the sync was skipped. A skipped sync
+    still reads the existing command IDs (one request per guild), so interactions
+    resolve to the current command objects, including ones recreated by /reload.
+    If Discord is missing any of our commands, they're synced after all.
+    """
+    fingerprint = command_fingerprint(bot.pending_application_commands, guild_ids)
+    if not force and read_fingerprint(path) == fingerprint:
+        missing = await attach_command_ids(bot, guild_ids)
+        if not missing:
+            return None
+        log.warning("Discord doesn't have /%s; syncing slash commands.", ", /".join(command.name for command in missing))
+    synced_commands = await bot.sync_commands(guild_ids=guild_ids)
+    write_fingerprint(path, fingerprint)
+    return synced_commands if synced_commands is not None else list(bot.pending_application_commands)
@@ -0,0 +1,337 @@
+import collections
+import functools
+import math
+import random
+import re
+
+# Limits that keep one /roll from tying up the event loop.
+MAX_EXPRESSION_LENGTH = 200
+MAX_DICE_TERMS = 20
+MAX_DICE = 10_000_000  # Across all terms of an expression
+MAX_SIDES = 1_000_000
+MAX_LARGE_SIDED_DICE = 100_000  # Dice with more than MULTINOMIAL_MAX_SIDES sides are drawn one by one
+MAX_EXPLOSIONS = 100  # Per die
+# Up to this many dice are rolled (and shown) individually; larger pools are rolled as face counts.
+INDIVIDUAL_DICE = 1000
+MULTINOMIAL_MAX_SIDES = 1000
+
+TOKEN_RE = re.compile(
+    r'\s*(?:(?P<dice>(?P<count>\d*)d(?P<sides>\d+|%)(?P<modifiers>(?:!|[kd][hl]?\d+)*))'
+    r'|(?P<number>\d+)|(?P<op>[-+*/()]))'
+)
+MODIFIER_RE = re.compile(r'!|([kd])([hl]?)(\d+)')
+
+
+class DiceError(ValueError):
+    """The expression can't be parsed or is too large to roll."""
+
+
+def _binomial(rng, n, p):
+    """
+    Draws from Binomial(n, p) in O(1) expected time.
+
+    A port of random.binomialvariate() from Python 3.12 (geometric method for
+    small n*p, Hörmann's BTRS rejection method otherwise).
+    """
+    if p <= 0.0 or n == 0:
+        return 0
+    if p >= 1.0:
+        return n
+    if p > 0.5:
+        return n - _binomial(rng, n, 1.0 - p)
+    if n * p < 10.0:
+        x = y = 0
+        c = math.log2(1.0 - p)
+        while True:
+            y += math.floor(math.log2(rng.random()) / c) + 1
+            if y > n:
+                return x
+            x += 1
+
+    spq = math.sqrt(n * p * (1.0 - p))
+    b = 1.15 + 2.53 * spq
+    a = -0.0873 + 0.0248 * b + 0.01 * p
+    c = n * p + 0.5
+    vr = 0.92 - 4.2 / b
+    setup_complete = False
+    while True:
+        u = rng.random() - 0.5
+        us = 0.5 - abs(u)
+        k = math.floor((2.0 * a / us + b) * u + c)
+        if k < 0 or k > n:
+            continue
+        v = rng.random()
+        if us >= 0.07 and v <= vr:
+            return k
+        if not setup_complete:
+            alpha = (2.83 + 5.1 / b) * spq
+            lpq = math.log(p / (1.0 - p))
+            m = math.floor((n + 1) * p)
+            h = math.lgamma(m + 1) + math.lgamma(n - m + 1)
+            setup_complete = True
+        v *= alpha / (a / (us * us) + b)
+        if math.log(v) <= h - math.lgamma(k + 1) - math.lgamma(n - k + 1) + (k - m) * lpq:
+            return k
+
+
+def face_counts(rng, count, sides):
+    """
+    Rolls `count` dice and returns {face: how many dice showed it}.
+
+    For dice with few sides this draws the multinomial distribution of the
+    faces directly (one binomial per face), so the cost depends on the number
+    of sides rather than the number of dice. Other dice are drawn in one
+    random.choices() batch.
+    """
+    if sides <= MULTINOMIAL_MAX_SIDES:
+        counts = {}
+        remaining = count
+        for face in range(1, sides):
+            drawn = _binomial(rng, remaining, 1.0 / (sides - face + 1))
+            if drawn:
+                counts[face] = drawn
+                remaining -= drawn
+            if not remaining:
+                break
+        if remaining:
+            counts[sides] = remaining
+        return counts
+    return collections.Counter(rng.choices(range(1, sides + 1), k=count))
+
+
+class Number:
+    def __init__(self, value):
+        self.value = value
+
+    def dice_count(self):
+        return 0
+
+    def evaluate(self, rng):
+        return self.value, str(self.value)
+
+
+class Dice:
+    """An NdS term with optional exploding (!) and keep/drop (khN, klN, dhN, dlN) modifiers."""
+
+    def __init__(self, count, sides, explode=False, keep=None):
+        self.count = count
+        self.sides = sides
+        self.explode = explode
+        self.keep = keep  # None or ('h' | 'l', how many dice are kept)
+
+    def dice_count(self):
+        return self.count
+
+    def evaluate(self, rng):
+        if self.count <= INDIVIDUAL_DICE:
+            return self._evaluate_each(rng)
+        return self._evaluate_counts(rng)
+
+    def _evaluate_each(self, rng):
+        values = rng.choices(range(1, self.sides + 1), k=self.count)
+        if self.explode:
+            for i, value in enumerate(values):
+                roll = value
+                for _ in range(MAX_EXPLOSIONS):
+                    if roll != self.sides:
+                        break
+                    roll = rng.randint(1, self.sides)
+                    value += roll
+                values[i] = value
+
+        kept = set(range(self.count))
+        if self.keep is not None:
+            direction, keep = self.keep
+            order = sorted(range(self.count), key=values.__getitem__, reverse=direction == 'h')
+            kept = set(order[:keep])
+        total = sum(values[i] for i in kept)
+        shown = ", ".join(str(value) if i in kept else f"~~{value}~~" for i, value in enumerate(values))
+        return total, f"[{shown}]"
+
+    def _evaluate_counts(self, rng):
+        counts = self._exploded_counts(rng, self.count, 0) if self.explode else face_counts(rng, self.count, self.sides)
+        faces = sorted(counts, reverse=self.keep is None or self.keep[0] == 'h')
+        remaining = self.count if self.keep is None else self.keep[1]
+        total = 0
+        for face in faces:
+            taken = min(counts[face], remaining)
+            total += face * taken
+            remaining -= taken
+            if not remaining:
+                break
+        if self.keep is not None:
+            return total, f"({self.count:,} dice, {self.keep[1]:,} kept)"
+        return total, f"({self.count:,} dice)"
+
+    def _exploded_counts(self, rng, count, depth):
+        counts = face_counts(rng, count, self.sides)
+        exploding = counts.pop(self.sides, 0)
+        if exploding and depth < MAX_EXPLOSIONS:
+            # Each die that showed the top face adds another roll, which may explode in turn.
+            for face, drawn in self._exploded_counts(rng, exploding, depth + 1).items():
+                counts[self.sides + face] = counts.get(self.sides + face, 0) + drawn
+        elif exploding:
+            counts[self.sides] = exploding
+        return counts
+
+
+class Negate:
+    def __init__(self, operand):
+        self.operand = operand
+
+    def dice_count(self):
+        return self.operand.dice_count()
+
+    def evaluate(self, rng):
+        value, text = self.operand.evaluate(rng)
+        return -value, f"-{text}"
+
+
+class BinaryOp:
+    def __init__(self, op, left, right):
+        self.op = op
+        self.left = left
+        self.right = right
+
+    def dice_count(self):
+        return self.left.dice_count() + self.right.dice_count()
+
+    def evaluate(self, rng):
+        left, left_text = self.left.evaluate(rng)
+        right, right_text = self.right.evaluate(rng)
+        if self.op == '+':
+            value = left + right
+        elif self.op == '-':
+            value = left - right
+        elif self.op == '*':
+            value = left * right
+        else:
+            if right == 0:
+                raise DiceError("Division by zero.")
+            value = left // right  # Dice results round down
+        return value, f"{left_text} {self.op} {right_text}"
+
+
+class Group:
+    def __init__(self, inner):
+        self.inner = inner
+
+    def dice_count(self):
+        return self.inner.dice_count()
+
+    def evaluate(self, rng):
+        value, text = self.inner.evaluate(rng)
+        return value, f"({text})"
+
+
+def _dice_term(match):
+    count = int(match.group('count') or 1)
+    sides = 100 if match.group('sides') == '%' else int(match.group('sides'))
+    if count < 1 or sides < 1:
+        raise DiceError("Dice need at least one die and one side.")
+    if sides > MAX_SIDES:
+        raise DiceError(f"Dice can have at most {MAX_SIDES:,} sides.")
+    if sides > MULTINOMIAL_MAX_SIDES and count > MAX_LARGE_SIDED_DICE:
+        raise DiceError(f"At most {MAX_LARGE_SIDED_DICE:,} dice with more than {MULTINOMIAL_MAX_SIDES:,} sides.")
+
+    explode = False
+    keep = None
+    for modifier in MODIFIER_RE.finditer(match.group('modifiers')):
+        if modifier.group(0) == '!':
+            if sides == 1:
+                raise DiceError("A d1 can't explode.")
+            explode = True
+            continue
+        action, direction, amount = modifier.group(1), modifier.group(2) or ('h' if modifier.group(1) == 'k' else 'l'), int(modifier.group(3))
+        if keep is not None:
+            raise DiceError("Use one keep or drop modifier per dice term.")
+        amount = min(amount, count)
+        if action == 'k':
+            keep = (direction, amount)
+        else:
+            # Dropping the lowest N is keeping the highest count - N, and vice versa.
+            keep = ('h' if direction == 'l' else 'l', count - amount)
+    return Dice(count, sides, explode, keep)
+
+
+@functools.lru_cache(maxsize=256)
+def parse(expression):
+    """
+    Compiles a dice expression such as '4d6kh3', '100d20+5' or '(2d6!)*10' to a tree.
+
+    Supports NdS (N defaults to 1, d% is d100), ! (explode on the top face),
+    kh/kl/dh/dl (k alone keeps highest, d alone drops lowest), + - * / and
+    parentheses. Results are cached, so repeated expressions skip parsing.
+    """
+    if len(expression) > MAX_EXPRESSION_LENGTH:
+        raise DiceError(f"Expressions are limited to {MAX_EXPRESSION_LENGTH} characters.")
+    tokens = []
+    position = 0
+    text = expression.lower().rstrip()
+    while position < len(text):
+        match = TOKEN_RE.match(text, position)
+        if match is None or match.end() == position:
+            raise DiceError(f"Unexpected `{text[position:].strip()[:20]}`.")
+        tokens.append(match)
+        position = match.end()
+    if not tokens:
+        raise DiceError("Enter something to roll, like `2d6+3`.")
+
+    index = 0
+    terms = 0
+
+    def peek():
+        return tokens[index].group('op') if index < len(tokens) else None
+
+    def expr():
+        nonlocal index
+        node = term()
+        while peek() in ('+', '-'):
+            op = peek()
+            index += 1
+            node = BinaryOp(op, node, term())
+        return node
+
+    def term():
+        nonlocal index
+        node = factor()
+        while peek() in ('*', '/'):
+            op = peek()
+            index += 1
+            node = BinaryOp(op, node, factor())
+        return node
+
+    def factor():
+        nonlocal index, terms
+        if index >= len(tokens):
+            raise DiceError("The expression ends too early.")
+        token = tokens[index]
+        index += 1
+        if token.group('op') == '-':
+            return Negate(factor())
+        if token.group('op') == '(':
+            node = expr()
+            if peek() != ')':
+                raise DiceError("Missing `)`.")
+            index += 1
+            return Group(node)
+        if token.group('dice'):
+            terms += 1
+            if terms > MAX_DICE_TERMS:
+                raise DiceError(f"At most {MAX_DICE_TERMS} dice terms per roll.")
+            return _dice_term(token)
+        if token.group('number'):
+            return Number(int(token.group('number')))
+        raise DiceError(f"Unexpected `{token.group('op')}`.")
+
+    tree = expr()
+    if index < len(tokens):
+        raise DiceError(f"Unexpected `{tokens[index].group(0).strip()}`.")
+    if tree.dice_count() > MAX_DICE:
+        raise DiceError(f"At most {MAX_DICE:,} dice per roll.")
+    return tree
+
+
+def roll(expression, rng=random):
+    """Rolls a dice expression. Returns (total, breakdown text). Raises DiceError."""
+    return parse(' '.join(expression.split())).evaluate(rng)
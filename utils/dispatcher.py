@@ -0,0 +1,160 @@
+import asyncio
+import collections
+import logging
+import time
+
+import discord
+
+log = logging.getLogger(__name__)
+
+MAX_EMBEDS_PER_MESSAGE = 10
+MAX_CONTENT_LENGTH = 2000
+
+
+def retry_after(error, default):
+    """
+    Returns how many seconds a 429 asked us to wait, read from its response headers.
+
+    Pycord's HTTPException has no retry_after of its own. Pycord also retries
+    429s itself, so one that reaches us has outlasted those retries.
+    """
+    headers = getattr(getattr(error, 'response', None), 'headers', None) or {}
+    for header in ('Retry-After', 'X-RateLimit-Reset-After'):
+        try:
+            return max(float(headers[header]), 0.0)
+        except (KeyError, TypeError, ValueError):
+            continue
+    return default
+
+
+class _ChannelQueue:
+    def __init__(self):
+        self.messages = collections.deque()
+        self.sent_at = collections.deque()  # Send times inside the current rate window
+        self.worker = None
+
+
+class MessageDispatcher:
+    """
+    Sends outbound messages through per-channel queues.
+
+    Cogs call enqueue() instead of awaiting channel.send(), so a slow or
+    rate-limited channel never holds up anything else. Each channel gets its own
+    worker task (started on demand, exiting when its queue drains), so different
+    channels send concurrently. Before each send, consecutive queued messages for
+    the same channel are packed into one, up to 10 embeds and 2000 characters of
+    content. Each channel is held to `rate` messages per `per` seconds, which
+    mirrors Discord's per-channel limit, so we wait locally instead of collecting
+    429s. A message with a view (buttons) is always sent on its own.
+    """
+
+    def __init__(self, bot, rate=5, per=5.0, max_queue=1000, max_retries=3):
+        self.bot = bot
+        self.rate = rate
+        self.per = per
+        self.max_queue = max_queue
+        self.max_retries = max_retries
+        self._channels = {}
+        self.sent = 0
+        self.coalesced = 0
+        self.dropped = 0
+        self.backoffs = 0
+
+    def enqueue(self, channel_id, content=None, embed=None, embeds=None, view=None):
+        """Queues a message for a channel. Returns False if it had to be dropped."""
+        embeds = list(embeds or [])
+        if embed is not None:
+            embeds.append(embed)
+
+        queue = self._channels.get(channel_id)
+        if queue is None:
+            queue = self._channels[channel_id] = _ChannelQueue()
+        if len(queue.messages) >= self.max_queue:
+            self.dropped += 1
+            log.warning("Outbound queue for channel %s is full. Dropping message.", channel_id)
+            return False
+
+        queue.messages.append((content or None, embeds, view))
+        if queue.worker is None or queue.worker.done():
+            queue.worker = asyncio.get_running_loop().create_task(self._drain_channel(channel_id, queue))
+        return True
+
+    def queue_depth(self, channel_id=None):
+        """Returns the number of queued messages for one channel, or for all of them."""
+        if channel_id is not None:
+            queue = self._channels.get(channel_id)
+            return len(queue.messages) if queue else 0
+        return sum(len(queue.messages) for queue in self._channels.values())
+
+    def stats(self):
+        return {
+            "queue_depth": self.queue_depth(),
+            "active_channels": sum(1 for q in self._channels.values() if q.worker and not q.worker.done()),
+            "sent": self.sent,
+            "coalesced": self.coalesced,
+            "dropped": self.dropped,
+            "backoffs": self.backoffs,
+        }
+
+    def _next_batch(self, queue):
+        """Pops the next message, merged with as many following messages as fit in one."""
+        content, embeds, view = queue.messages.popleft()
+        embeds = list(embeds)
+        while view is None and queue.messages:
+            next_content, next_embeds, next_view = queue.messages[0]
+            if next_view is not None or len(embeds) + len(next_embeds) > MAX_EMBEDS_PER_MESSAGE:
+                break
+            if next_content:
+                merged = f"{content}\n{next_content}" if content else next_content
+                if len(merged) > MAX_CONTENT_LENGTH:
+                    break
+                content = merged
+            embeds.extend(next_embeds)
+            queue.messages.popleft()
+            self.coalesced += 1
+        return content, embeds, view
+
+    async def _wait_for_slot(self, queue):
+        now = time.monotonic()
+        while queue.sent_at and now - queue.sent_at[0] >= self.per:
+            queue.sent_at.popleft()
+        if len(queue.sent_at) >= self.rate:
+            self.backoffs += 1
+            await asyncio.sleep(self.per - (now - queue.sent_at[0]))
+            queue.sent_at.popleft()
+
+    async def _drain_channel(self, channel_id, queue):
+        while queue.messages:
+            await self._wait_for_slot(queue)
+            content, embeds, view = self._next_batch(queue)
+
+            channel = self.bot.get_channel(channel_id)
+            if channel is None:
+                self.dropped += 1
+                log.error("Channel with ID %s not found. Dropping message.", channel_id)
+                continue
+
+            for attempt in range(self.max_retries + 1):
+                try:
+                    await channel.send(content=content, embeds=embeds or None, view=view)
+                    queue.sent_at.append(time.monotonic())
+                    self.sent += 1
+                    break
+                except discord.HTTPException as e:
+                    retryable = e.status == 429 or e.status >= 500
+                    if not retryable or attempt == self.max_retries:
+                        self.dropped += 1
+                        log.error("Failed to send message to channel %s. %s", channel_id, e)
+                        break
+                    self.backoffs += 1
+                    await asyncio.sleep(retry_after(e, 2 ** attempt) if e.status == 429 else 2 ** attempt)
+                except Exception as e:
+                    self.dropped += 1
+                    log.error("Failed to send message to channel %s. %s", channel_id, e)
+                    break
+
+    async def drain(self, timeout=10.0):
+        """Waits for every queue to empty (used on shutdown)."""
+        workers = [q.worker for q in self._channels.values() if q.worker and not q.worker.done()]
+        if workers:
+            await asyncio.wait(workers, timeout=timeout)
@@ -0,0 +1,287 @@
+import asyncio
+import bisect
+import collections
+import difflib
+import json
+import logging
+import os
+import time
+
+import aiohttp
+
+log = logging.getLogger(__name__)
+
+# Weird Gloop's Grand Exchange API: exact prices, and up to 100 items per request.
+DEFAULT_BASE_URL = 'https://api.weirdgloop.org'
+LATEST_PRICES_PATH = '/exchange/history/rs/latest'
+# Every tradeable item with its ID, refreshed by Weird Gloop from the official GE database.
+DEFAULT_ITEM_INDEX_URL = 'https://chisel.weirdgloop.org/gazproj/gazbot/rs_dump.json'
+MAX_IDS_PER_REQUEST = 100
+MAX_CHOICES = 25  # Discord's limit for autocomplete results
+
+
+class GrandExchangeError(Exception):
+    """The price service couldn't be reached or sent something unexpected."""
+
+
+class ItemIndex:
+    """
+    A sorted name -> item ID index for lookups and autocomplete.
+
+    Exact names resolve with a dict lookup, partial names with a bisect into the
+    sorted keys, and typos fall back to difflib.
+    """
+
+    def __init__(self, items):
+        self._ids = {}  # lowercase name -> item ID
+        self._names = {}  # item ID -> display name
+        for item_id, name in items.items():
+            self._ids.setdefault(name.lower(), item_id)
+            self._names[item_id] = name
+        self._keys = sorted(self._ids)
+
+    def __len__(self):
+        return len(self._names)
+
+    def name(self, item_id):
+        return self._names.get(item_id)
+
+    def resolve(self, text):
+        """Returns the ID for an exact (case-insensitive) item name, or None."""
+        return self._ids.get(text.strip().lower())
+
+    def complete(self, text, limit=MAX_CHOICES):
+        """Returns up to `limit` item names matching what the user has typed so far."""
+        text = (text or '').strip().lower()
+        if not text:
+            return []
+        results = []
+        start = bisect.bisect_left(self._keys, text)
+        for key in self._keys[start:start + limit]:
+            if not key.startswith(text):
+                break
+            results.append(self._names[self._ids[key]])
+        if not results:
+            results = [self._names[self._ids[key]] for key in difflib.get_close_matches(text, self._keys, n=limit, cutoff=0.6)]
+        return results
+
+    def suggest(self, text):
+        """Returns the closest item name for an unknown input, or None."""
+        matches = self.complete(text, limit=1)
+        return matches[0] if matches else None
+
+
+class TTLCache:
+    """An LRU cache whose entries also expire `ttl` seconds after they were stored."""
+
+    def __init__(self, maxsize=1024, ttl=300.0, clock=time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self._entries = collections.OrderedDict()  # key -> (expires_at, value)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key, default=None):
+        entry = self._entries.get(key)
+        if entry is None:
+            return default
+        if entry[0] <= self._clock():
+            del self._entries[key]
+            return default
+        self._entries.move_to_end(key)
+        return entry[1]
+
+    def __contains__(self, key):
+        return self.get(key, self) is not self
+
+    def put(self, key, value):
+        self._entries[key] = (self._clock() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+
+class GrandExchange:
+    """
+    RS3 Grand Exchange prices over one pooled aiohttp session.
+
+    Prices are cached (TTL + LRU). Lookups for items that are already being
+    fetched wait on that request instead of sending another, and the items
+    still missing after the cache are fetched together, up to 100 per request.
+
+    The item index is loaded from `index_path` when it is recent, otherwise
+    downloaded once and saved there.
+    """
+
+    def __init__(self, base_url=DEFAULT_BASE_URL, index_url=DEFAULT_ITEM_INDEX_URL, index_path='ge_items.json',
+                 cache_ttl=300.0, cache_size=2048, index_max_age=86400.0, timeout=10.0):
+        self.base_url = base_url.rstrip('/')
+        self.index_url = index_url
+        self.index_path = index_path
+        self.index_max_age = index_max_age
+        self.timeout = timeout
+        self.cache = TTLCache(cache_size, cache_ttl)
+        self.index = None
+        self.requests = 0
+        self._session = None
+        self._inflight = {}  # item ID -> Future resolving to its price entry
+        self._index_task = None
+        self._fetches = set()  # Running fetch tasks, referenced so they aren't garbage collected
+
+    def _get_session(self):
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+                connector=aiohttp.TCPConnector(limit=10),
+                headers={'User-Agent': 'ov_bot (Odin\'s Valhalla clan Discord bot)'}
+            )
+        return self._session
+
+    async def close(self):
+        if self._session is not None:
+            await self._session.close()
+
+    async def _get_json(self, url, params=None):
+        self.requests += 1
+        try:
+            async with self._get_session().get(url, params=params) as response:
+                if response.status != 200:
+                    raise GrandExchangeError(f"{url} returned HTTP {response.status}")
+                return await response.json(content_type=None)
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+            raise GrandExchangeError(f"Request to {url} failed: {e!r}") from e
+
+    def warm(self):
+        """Starts loading the item index in the background if it isn't loaded or loading yet."""
+        if self.index is None and self._index_task is None:
+            self._index_task = asyncio.ensure_future(self._load_index())
+            self._index_task.add_done_callback(self._index_loaded)
+        return self._index_task
+
+    def _index_loaded(self, task):
+        if task.cancelled() or task.exception() is not None:
+            if not task.cancelled():
+                log.warning("Could not load the Grand Exchange item index: %s", task.exception())
+            self._index_task = None  # Let the next lookup try again
+        else:
+            self.index = task.result()
+
+    async def load_index(self):
+        """Returns the item index, loading it on first use. Concurrent callers share one load."""
+        if self.index is not None:
+            return self.index
+        return await asyncio.shield(self.warm())
+
+    async def _load_index(self):
+        loop = asyncio.get_running_loop()
+        data = await loop.run_in_executor(None, self._read_cached_index)
+        if data is None:
+            data = await self._get_json(self.index_url)
+            items = self._parse_index(data)
+            await loop.run_in_executor(None, self._write_cached_index, data)
+        else:
+            items = self._parse_index(data)
+        log.info("Loaded %d Grand Exchange items.", len(items))
+        return ItemIndex(items)
+
+    def _parse_index(self, data):
+        """Returns {item ID: name} from the item dump. Raises GrandExchangeError if it isn't shaped as expected."""
+        if not isinstance(data, dict):
+            raise GrandExchangeError(f"Unexpected item index: {data!r:.200}")
+        try:
+            return {
+                int(entry['id']): str(entry['name'])
+                for entry in data.values()
+                if isinstance(entry, dict) and 'id' in entry and entry.get('name')
+            }
+        except (TypeError, ValueError) as e:
+            raise GrandExchangeError(f"Unreadable item index: {e}") from e
+
+    def _read_cached_index(self):
+        try:
+            if time.time() - os.path.getmtime(self.index_path) > self.index_max_age:
+                return None
+            with open(self.index_path, 'r') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        # A damaged copy is downloaded again rather than failing every lookup until it expires.
+        return data if isinstance(data, dict) else None
+
+    def _write_cached_index(self, data):
+        try:
+            tmp_path = f"{self.index_path}.tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self.index_path)
+        except OSError as e:
+            log.warning("Could not save the Grand Exchange item index to %s: %s", self.index_path, e)
+
+    async def prices(self, item_ids):
+        """
+        Returns {item_id: price entry or None} for the given IDs.
+
+        A price entry is {'id', 'price', 'volume', 'timestamp'}; None means the
+        service has no price for that item.
+        """
+        results = {}
+        waiting = {}
+        missing = []
+        for item_id in dict.fromkeys(item_ids):
+            cached = self.cache.get(item_id, self)
+            if cached is not self:
+                results[item_id] = cached
+            elif item_id in self._inflight:
+                waiting[item_id] = self._inflight[item_id]
+            else:
+                missing.append(item_id)
+
+        loop = asyncio.get_running_loop()
+        for start in range(0, len(missing), MAX_IDS_PER_REQUEST):
+            chunk = missing[start:start + MAX_IDS_PER_REQUEST]
+            futures = {item_id: loop.create_future() for item_id in chunk}
+            self._inflight.update(futures)
+            waiting.update(futures)
+            task = asyncio.ensure_future(self._fetch(futures))
+            self._fetches.add(task)
+            task.add_done_callback(self._fetches.discard)
+
+        for item_id, future in waiting.items():
+            results[item_id] = await future
+        return results
+
+    async def price(self, item_id):
+        """Returns the price entry for one item (or None)."""
+        return (await self.prices([item_id]))[item_id]
+
+    async def _fetch(self, futures):
+        try:
+            data = await self._get_json(
+                f"{self.base_url}{LATEST_PRICES_PATH}",
+                params={'id': '|'.join(str(item_id) for item_id in futures)}
+            )
+            if not isinstance(data, dict):
+                raise GrandExchangeError(f"Unexpected price response: {data!r:.200}")
+            for item_id, future in futures.items():
+                entry = data.get(str(item_id))
+                if isinstance(entry, dict) and entry.get('price') is not None:
+                    entry = {
+                        'id': item_id,
+                        'price': int(entry['price']),
+                        'volume': entry.get('volume'),
+                        'timestamp': entry.get('timestamp')
+                    }
+                else:
+                    entry = None
+                self.cache.put(item_id, entry)
+                future.set_result(entry)
+        except Exception as e:
+            for future in futures.values():
+                if not future.done():
+                    future.set_exception(e if isinstance(e, GrandExchangeError) else GrandExchangeError(str(e)))
+        finally:
+            for item_id, future in futures.items():
+                if self._inflight.get(item_id) is future:
+                    del self._inflight[item_id]
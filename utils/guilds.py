@@ -0,0 +1,128 @@
+import logging
+import os
+import time
+
+log = logging.getLogger(__name__)
+
+
+class GuildConfig:
+    """
+    Config for one guild: its entry in config.GUILDS, falling back to the global config.
+
+    Attribute access works like the config module itself, so cogs can read
+    `guild_config.CLAN_BANK_LOG_CHANNEL_ID` without caring which guild they serve.
+    """
+
+    def __init__(self, base, guild_id, overrides, is_primary):
+        self._base = base
+        self.guild_id = guild_id
+        self.overrides = dict(overrides)
+        self.is_primary = is_primary
+
+    def __getattr__(self, name):
+        overrides = self.__dict__.get('overrides', {})
+        if name in overrides:
+            return overrides[name]
+        return getattr(self._base, name)
+
+    def data_path(self, attribute, default_filename):
+        """
+        Returns where this guild's copy of a data file lives.
+
+        The primary guild keeps the global layout (so existing single-guild
+        installs keep their data): the global setting if there is one, otherwise
+        `default_filename` next to BANK_FILE_PATH. Other guilds use their own
+        override, or a per-guild directory next to BANK_FILE_PATH.
+        """
+        if attribute in self.overrides:
+            return self.overrides[attribute]
+        base_dir = os.path.dirname(self._base.BANK_FILE_PATH)
+        if self.is_primary:
+            return getattr(self._base, attribute, None) or os.path.join(base_dir, default_filename)
+        return os.path.join(base_dir, 'guilds', str(self.guild_id), default_filename)
+
+
+class GuildConfigs:
+    """
+    Per-guild configuration.
+
+    config.GUILDS maps guild IDs to dicts of overrides (channel and role IDs,
+    file paths, ...). Without it the bot serves the single config.GUILD_ID.
+    """
+
+    def __init__(self, config):
+        self.config = config
+        guilds = getattr(config, 'GUILDS', None) or {config.GUILD_ID: {}}
+        self.primary_id = config.GUILD_ID if config.GUILD_ID in guilds else next(iter(guilds))
+        self._configs = {
+            guild_id: GuildConfig(config, guild_id, overrides, guild_id == self.primary_id)
+            for guild_id, overrides in guilds.items()
+        }
+
+    @property
+    def guild_ids(self):
+        return list(self._configs)
+
+    def get(self, guild_id):
+        """Returns the config for a guild (the primary guild's config if it isn't configured)."""
+        return self._configs.get(guild_id) or self._configs[self.primary_id]
+
+    def __iter__(self):
+        return iter(self._configs.values())
+
+
+class PartitionManager:
+    """
+    Lazily loaded per-guild state.
+
+    A partition is created by `open_partition(guild_id)` the first time a guild
+    needs it and closed with `close_partition(partition)` after `idle_seconds`
+    without use, so memory tracks the guilds that are actually active.
+    """
+
+    def __init__(self, open_partition, close_partition, idle_seconds=3600):
+        self._open = open_partition
+        self._close = close_partition
+        self.idle_seconds = idle_seconds
+        self._partitions = {}  # guild_id -> partition
+        self._last_used = {}  # guild_id -> monotonic time
+
+    def __len__(self):
+        return len(self._partitions)
+
+    def get(self, guild_id):
+        partition = self._partitions.get(guild_id)
+        if partition is None:
+            partition = self._partitions[guild_id] = self._open(guild_id)
+        self._last_used[guild_id] = time.monotonic()
+        return partition
+
+    def adopt(self, guild_id, partition):
+        """Takes over an already open partition (e.g. one handed over on reload)."""
+        self._partitions[guild_id] = partition
+        self._last_used[guild_id] = time.monotonic()
+
+    def loaded(self):
+        return dict(self._partitions)
+
+    async def evict_idle(self):
+        """Closes partitions that haven't been used for idle_seconds. Returns how many."""
+        cutoff = time.monotonic() - self.idle_seconds
+        idle = [guild_id for guild_id, last_used in self._last_used.items() if last_used < cutoff]
+        for guild_id in idle:
+            await self._evict(guild_id)
+        return len(idle)
+
+    async def close_all(self):
+        for guild_id in list(self._partitions):
+            await self._evict(guild_id)
+
+    async def _evict(self, guild_id):
+        partition = self._partitions.pop(guild_id, None)
+        self._last_used.pop(guild_id, None)
+        if partition is None:
+            return
+        try:
+            await self._close(partition)
+        except Exception as e:
+            log.error("Failed to close state for guild %s: %s", guild_id, e, extra={'guild_id': guild_id})
@@ -0,0 +1,108 @@
+import asyncio
+import logging
+import os
+
+from utils.command_sync import sync_if_changed
+
+log = logging.getLogger(__name__)
+
+
+class UnreachableCommandsError(RuntimeError):
+    """The extension reloaded, but some of its commands can't be invoked from Discord."""
+
+
+def take_handoff(bot, cog_name):
+    """Returns the state the previous instance of a cog handed over on reload, or None."""
+    return getattr(bot, 'handoff', {}).get(cog_name)
+
+
+class Reloader:
+    """
+    Reloads cog extensions in place, keeping their in-memory state.
+
+    Before an extension is reloaded, each of its cogs with an `export_state()`
+    method hands over its live state; the new instance picks it up with
+    `take_handoff(bot, name)` in `__init__` instead of reading its files again.
+    Nothing is written to disk and the gateway connection is left alone.
+
+    If the new module fails to import or set up, pycord runs the old module's
+    setup again. That picks up the same handoff, so the old version carries on
+    with the state it had.
+
+    Views and modals outlive a reload, so they look their cog up with
+    `bot.get_cog()` when clicked or submitted instead of keeping a reference to
+    the instance that created them.
+    """
+
+    def __init__(self, bot, command_hash_path=None):
+        self.bot = bot
+        self.command_hash_path = command_hash_path
+        self._lock = asyncio.Lock()
+        self._watch_task = None
+        bot.handoff = {}
+
+    async def reload(self, extension):
+        """Reloads an extension such as 'cogs.admin'. Raises (after rolling back) if the new code fails."""
+        async with self._lock:
+            for cog in list(self.bot.cogs.values()):
+                if type(cog).__module__ == extension and hasattr(cog, 'export_state'):
+                    self.bot.handoff[cog.qualified_name] = cog.export_state()
+            try:
+                self.bot.reload_extension(extension)
+            finally:
+                self.bot.handoff.clear()
+
+            # Only writes to Discord if the reload changed a command's definition.
+            if self.command_hash_path:
+                guild_ids = self.bot.guild_configs.guild_ids
+                await sync_if_changed(self.bot, guild_ids, self.command_hash_path)
+                unresolved = self.unresolved_commands(extension)
+                if unresolved:
+                    log.warning("Commands from %s can't be invoked after the reload (%s); forcing a sync.", extension, ", ".join(unresolved))
+                    await sync_if_changed(self.bot, guild_ids, self.command_hash_path, force=True)
+                    unresolved = self.unresolved_commands(extension)
+                    if unresolved:
+                        raise UnreachableCommandsError(f"Discord can't reach /{', /'.join(unresolved)}")
+
+    def unresolved_commands(self, extension):
+        """
+        Returns the names of an extension's commands that interactions can't reach.
+
+        An interaction is routed by command ID, falling back to the name within
+        the command's guilds, so each command needs both to still run.
+        """
+        return [
+            command.qualified_name for command in self.bot.pending_application_commands
+            if type(command.cog).__module__ == extension
+            and (not command.guild_ids or command.id is None or self.bot._application_commands.get(command.id) is not command)
+        ]
+
+    def watch(self, interval=1.0):
+        """Dev mode: reloads an extension whenever its source file changes."""
+        if self._watch_task is None:
+            self._watch_task = asyncio.create_task(self._watch(interval))
+
+    async def _watch(self, interval):
+        log.info("Watching %d extension(s) for changes.", len(self.bot.extensions))
+        mtimes = self._mtimes()
+        while True:
+            await asyncio.sleep(interval)
+            current = self._mtimes()
+            for extension, mtime in current.items():
+                if mtimes.get(extension, mtime) == mtime:
+                    continue
+                try:
+                    await self.reload(extension)
+                    log.info("Reloaded %s", extension)
+                except Exception as e:
+                    log.error("Failed to reload %s, kept the previous version. Error: %s", extension, e, exc_info=e)
+            mtimes = current
+
+    def _mtimes(self):
+        mtimes = {}
+        for extension, module in self.bot.extensions.items():
+            try:
+                mtimes[extension] = os.stat(module.__file__).st_mtime_ns
+            except (AttributeError, TypeError, OSError):
+                pass
+        return mtimes
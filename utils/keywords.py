@@ -0,0 +1,75 @@
+import collections
+
+
+def normalize_phrase(text):
+    """Lowercases and collapses whitespace, so triggers and messages compare alike."""
+    return ' '.join(text.lower().split())
+
+
+class KeywordMatcher:
+    """
+    Finds every trigger phrase in a text in one pass (Aho-Corasick).
+
+    The phrases are compiled once into a trie with failure links, so matching
+    costs one dict lookup per character of the message however many triggers
+    there are. Matches must start and end on word boundaries, so 'zuk' doesn't
+    fire on 'zukini'.
+    """
+
+    def __init__(self, phrases):
+        self.phrases = sorted({normalize_phrase(phrase) for phrase in phrases if phrase.strip()})
+        self._goto = [{}]  # state -> {character: next state}
+        self._fail = [0]
+        self._output = [()]  # state -> indexes of the phrases that end here
+        for index, phrase in enumerate(self.phrases):
+            state = 0
+            for char in phrase:
+                next_state = self._goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][char] = next_state
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append(())
+                state = next_state
+            self._output[state] += (index,)
+
+        # Breadth-first, so each state's failure link points at an already finished state.
+        queue = collections.deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_state] = self._goto[fallback].get(char, 0)
+                self._output[next_state] += self._output[self._fail[next_state]]
+
+    def __len__(self):
+        return len(self.phrases)
+
+    def find(self, text):
+        """
+        Returns the phrases found in `text` (already normalized), in order.
+
+        A phrase inside a longer match ('zuk' in 'tz kal zuk') isn't reported.
+        """
+        spans = []
+        goto, fail, output, phrases = self._goto, self._fail, self._output, self.phrases
+        state = 0
+        for position, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for index in output[state]:
+                start = position - len(phrases[index]) + 1
+                if (start == 0 or not text[start - 1].isalnum()) and (position + 1 == len(text) or not text[position + 1].isalnum()):
+                    spans.append((start, position, phrases[index]))
+        found = []
+        for start, end, phrase in spans:
+            inside_longer = any(other_start <= start and end <= other_end and (other_start, other_end) != (start, end)
+                                for other_start, other_end, _ in spans)
+            if not inside_longer and phrase not in found:
+                found.append(phrase)
+        return found
@@ -0,0 +1,262 @@
+import asyncio
+import datetime
+import os
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS transactions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    created_at INTEGER NOT NULL,
+    executor_id INTEGER NOT NULL,
+    executor_name TEXT NOT NULL,
+    amount INTEGER NOT NULL,
+    reason TEXT,
+    balance INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_transactions_created_at ON transactions (created_at, id);
+CREATE INDEX IF NOT EXISTS idx_transactions_executor ON transactions (executor_id, id);
+CREATE TABLE IF NOT EXISTS rollups (
+    period TEXT NOT NULL,
+    bucket INTEGER NOT NULL,
+    deposits INTEGER NOT NULL DEFAULT 0,
+    withdrawals INTEGER NOT NULL DEFAULT 0,
+    count INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (period, bucket)
+);
+CREATE TABLE IF NOT EXISTS contributors (
+    executor_id INTEGER PRIMARY KEY,
+    executor_name TEXT NOT NULL,
+    deposits INTEGER NOT NULL DEFAULT 0,
+    withdrawals INTEGER NOT NULL DEFAULT 0,
+    count INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_contributors_deposits ON contributors (deposits);
+"""
+# Bumped when the rollup tables change; older ledgers are rebuilt from their transactions on open.
+ROLLUP_VERSION = 1
+
+# How many buckets of each period a report covers.
+REPORT_WINDOWS = {'day': 30, 'week': 12, 'month': 12}
+WEEK_START = 4 * 86400  # 1970-01-01 was a Thursday; buckets start on Mondays
+
+
+def period_start(period, timestamp):
+    """Returns the epoch timestamp (UTC) at which the day/week/month containing `timestamp` starts."""
+    if period == 'day':
+        return timestamp - timestamp % 86400
+    if period == 'week':
+        return timestamp - (timestamp - WEEK_START) % (7 * 86400)
+    moment = datetime.datetime.fromtimestamp(timestamp, datetime.timezone.utc)
+    return int(moment.replace(day=1, hour=0, minute=0, second=0, microsecond=0).timestamp())
+
+
+def previous_period_start(period, bucket):
+    """Returns the start of the period before the one starting at `bucket`."""
+    return period_start(period, bucket - 1)
+
+
+class BankLedger:
+    """
+    An append-only record of clan bank transactions in a local SQLite file.
+
+    `amount` is signed (deposits positive, withdrawals negative) and every row
+    carries the bank `balance` right after it was applied, so the balance at any
+    point in time is a single index lookup rather than a sum over history.
+
+    All database work runs on one dedicated worker thread, which owns the
+    connection, so the event loop never blocks on disk.
+
+    Per-period totals (day/week/month) and per-member sums are kept in rollup
+    tables, updated in the same commit as each insert, so reports read a fixed
+    number of rows however long the history gets. They can be rebuilt from the
+    transactions at any time with `rebuild_rollups()`.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='ledger')
+        self._conn = None
+
+    def _connect(self):
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.row_factory = sqlite3.Row
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(SCHEMA)
+            if self._conn.execute("PRAGMA user_version").fetchone()[0] < ROLLUP_VERSION:
+                self._rebuild_rollups(self._conn)
+        return self._conn
+
+    async def _run(self, func, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, func, *args)
+
+    def _apply_rollups(self, conn, rows):
+        """Adds transactions (created_at, executor_id, executor_name, amount, ...) to the rollup tables."""
+        buckets = {}
+        members = {}
+        for created_at, executor_id, executor_name, amount, *_ in rows:
+            deposit, withdrawal = (amount, 0) if amount >= 0 else (0, -amount)
+            for period in REPORT_WINDOWS:
+                totals = buckets.setdefault((period, period_start(period, created_at)), [0, 0, 0])
+                totals[0] += deposit
+                totals[1] += withdrawal
+                totals[2] += 1
+            member = members.setdefault(executor_id, [executor_name, 0, 0, 0])
+            member[0] = executor_name
+            member[1] += deposit
+            member[2] += withdrawal
+            member[3] += 1
+        conn.executemany(
+            "INSERT INTO rollups (period, bucket, deposits, withdrawals, count) VALUES (?, ?, ?, ?, ?) "
+            "ON CONFLICT (period, bucket) DO UPDATE SET deposits = deposits + excluded.deposits, "
+            "withdrawals = withdrawals + excluded.withdrawals, count = count + excluded.count",
+            [(period, bucket, *totals) for (period, bucket), totals in buckets.items()]
+        )
+        conn.executemany(
+            "INSERT INTO contributors (executor_id, executor_name, deposits, withdrawals, count) VALUES (?, ?, ?, ?, ?) "
+            "ON CONFLICT (executor_id) DO UPDATE SET executor_name = excluded.executor_name, "
+            "deposits = deposits + excluded.deposits, withdrawals = withdrawals + excluded.withdrawals, "
+            "count = count + excluded.count",
+            [(executor_id, *member) for executor_id, member in members.items()]
+        )
+
+    def _rebuild_rollups(self, conn):
+        with conn:
+            conn.execute("DELETE FROM rollups")
+            conn.execute("DELETE FROM contributors")
+            cursor = conn.execute("SELECT created_at, executor_id, executor_name, amount FROM transactions ORDER BY id")
+            while True:
+                rows = cursor.fetchmany(5000)
+                if not rows:
+                    break
+                self._apply_rollups(conn, [tuple(row) for row in rows])
+            conn.execute(f"PRAGMA user_version = {ROLLUP_VERSION}")
+
+    async def rebuild_rollups(self):
+        """Recomputes the rollup tables from the raw transactions."""
+        await self._run(lambda: self._rebuild_rollups(self._connect()))
+
+    def _record(self, created_at, executor_id, executor_name, amount, reason, balance):
+        conn = self._connect()
+        with conn:
+            cursor = conn.execute(
+                "INSERT INTO transactions (created_at, executor_id, executor_name, amount, reason, balance) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (created_at, executor_id, executor_name, amount, reason, balance)
+            )
+            self._apply_rollups(conn, [(created_at, executor_id, executor_name, amount)])
+        return cursor.lastrowid
+
+    async def record(self, created_at, executor_id, executor_name, amount, reason, balance):
+        """Appends a transaction and returns its ID."""
+        return await self._run(self._record, created_at, executor_id, executor_name, amount, reason, balance)
+
+    def _record_many(self, rows):
+        conn = self._connect()
+        with conn:
+            conn.executemany(
+                "INSERT INTO transactions (created_at, executor_id, executor_name, amount, reason, balance) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                rows
+            )
+            self._apply_rollups(conn, rows)
+
+    async def record_many(self, rows):
+        """Appends many transactions in a single SQLite commit.
+
+        Each row is (created_at, executor_id, executor_name, amount, reason, balance).
+        """
+        await self._run(self._record_many, rows)
+
+    def _page(self, executor_id, since, until, before_id, after_id, limit):
+        clauses = []
+        params = []
+        if executor_id is not None:
+            clauses.append("executor_id = ?")
+            params.append(executor_id)
+        if since is not None:
+            clauses.append("created_at >= ?")
+            params.append(since)
+        if until is not None:
+            clauses.append("created_at < ?")
+            params.append(until)
+        if before_id is not None:
+            clauses.append("id < ?")
+            params.append(before_id)
+        if after_id is not None:
+            clauses.append("id > ?")
+            params.append(after_id)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        # Paging forwards (newer) walks the index ascending; results are always returned newest first.
+        order = "ASC" if after_id is not None else "DESC"
+        rows = self._connect().execute(
+            f"SELECT * FROM transactions {where} ORDER BY id {order} LIMIT ?",
+            (*params, limit)
+        ).fetchall()
+        rows = [dict(row) for row in rows]
+        if after_id is not None:
+            rows.reverse()
+        return rows
+
+    async def history(self, executor_id=None, since=None, until=None, before_id=None, after_id=None, limit=10):
+        """
+        Returns one page of transactions, newest first, using keyset pagination.
+
+        Pass the smallest ID of the current page as `before_id` for the next (older)
+        page, or the largest ID as `after_id` for the previous (newer) page.
+        """
+        return await self._run(self._page, executor_id, since, until, before_id, after_id, limit)
+
+    def _balance_at(self, timestamp):
+        row = self._connect().execute(
+            "SELECT balance FROM transactions WHERE created_at <= ? ORDER BY created_at DESC, id DESC LIMIT 1",
+            (timestamp,)
+        ).fetchone()
+        return row["balance"] if row else 0
+
+    async def balance_at(self, timestamp):
+        """Returns the bank balance as of the given epoch timestamp."""
+        return await self._run(self._balance_at, timestamp)
+
+    def _report(self, period, now, top):
+        conn = self._connect()
+        # Walk back a fixed number of buckets; empty periods have no row and count as zero.
+        buckets = [period_start(period, now)]
+        while len(buckets) < REPORT_WINDOWS[period]:
+            buckets.append(previous_period_start(period, buckets[-1]))
+        buckets.reverse()
+        rows = {
+            row['bucket']: dict(row)
+            for row in conn.execute(
+                "SELECT bucket, deposits, withdrawals, count FROM rollups WHERE period = ? AND bucket >= ?",
+                (period, buckets[0])
+            )
+        }
+        series = [rows.get(bucket, {'bucket': bucket, 'deposits': 0, 'withdrawals': 0, 'count': 0}) for bucket in buckets]
+        contributors = [
+            dict(row) for row in conn.execute(
+                "SELECT * FROM contributors WHERE deposits > 0 ORDER BY deposits DESC LIMIT ?", (top,)
+            )
+        ]
+        return {'period': period, 'series': series, 'top_contributors': contributors}
+
+    async def report(self, period, now, top=5):
+        """
+        Returns the last REPORT_WINDOWS[period] buckets of deposits/withdrawals (oldest
+        first, ending with the bucket containing `now`) and the top depositors.
+        """
+        return await self._run(self._report, period, now, top)
+
+    def _close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    async def close(self):
+        await self._run(self._close)
+        self._executor.shutdown(wait=False)
@@ -0,0 +1,131 @@
+import atexit
+import datetime
+import json
+import logging
+import logging.handlers
+import queue
+import sys
+import time
+
+# Extra fields a record may carry (pass them with `extra=`, e.g. extra=context_fields(ctx)).
+CONTEXT_FIELDS = ('cog', 'command', 'guild_id', 'user_id')
+
+
+def context_fields(ctx):
+    """Returns the cog/command/guild/user fields for a log record about an application command."""
+    fields = {}
+    if getattr(ctx, 'cog', None) is not None:
+        fields['cog'] = ctx.cog.qualified_name
+    if getattr(ctx, 'command', None) is not None:
+        fields['command'] = ctx.command.qualified_name
+    guild = getattr(ctx, 'guild', None)
+    if guild is not None:
+        fields['guild_id'] = guild.id
+    author = getattr(ctx, 'author', None) or getattr(ctx, 'user', None)
+    if author is not None:
+        fields['user_id'] = author.id
+    return fields
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: time, level, logger, message, context fields and any traceback."""
+
+    def format(self, record):
+        entry = {
+            'time': datetime.datetime.fromtimestamp(record.created, datetime.timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        for field in CONTEXT_FIELDS + ('suppressed',):
+            value = getattr(record, field, None)
+            if value is not None:
+                entry[field] = value
+        if record.exc_info:
+            entry['exc_info'] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    """The bot's original `[timestamp] message` layout, for running in a terminal."""
+
+    def __init__(self):
+        super().__init__('[%(asctime)s] %(levelname)s %(name)s: %(message)s')
+
+    def format(self, record):
+        text = super().format(record)
+        if getattr(record, 'suppressed', None):
+            text += f" ({record.suppressed} similar messages suppressed)"
+        return text
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Drops repeats of the same warning/error beyond `burst` per `window` seconds.
+
+    Records are grouped by logger and message template (not the formatted
+    text), so a failure that repeats with a different channel or event ID
+    still counts as one message. The next record let through reports how many
+    were dropped.
+    """
+
+    def __init__(self, window=60.0, burst=5, level=logging.WARNING):
+        super().__init__()
+        self.window = window
+        self.burst = burst
+        self.level = level
+        self._seen = {}  # (logger, level, template) -> [window start, count, suppressed]
+
+    def filter(self, record):
+        if record.levelno < self.level:
+            return True
+        now = time.monotonic()
+        key = (record.name, record.levelno, record.msg)
+        state = self._seen.get(key)
+        if state is None or now - state[0] >= self.window:
+            suppressed = state[2] if state else 0
+            self._seen[key] = [now, 1, 0]
+            if len(self._seen) > 1000:
+                # Forget templates that haven't been seen within the window.
+                self._seen = {k: v for k, v in self._seen.items() if now - v[0] < self.window}
+            if suppressed:
+                record.suppressed = suppressed
+            return True
+        state[1] += 1
+        if state[1] <= self.burst:
+            return True
+        state[2] += 1
+        return False
+
+
+def setup_logging(level='INFO', levels=None, json_format=True, rate_limit_window=60.0, rate_limit_burst=5, stream=None):
+    """
+    Routes all logging through a queue to a background writer thread.
+
+    Records are formatted where they're logged and then only put on an
+    in-memory queue, so a slow stdout (journald backpressure) stalls the writer
+    thread instead of the event loop. `levels` maps logger names (e.g.
+    'discord', 'cogs.rs3_finances') to their own levels. Returns the listener;
+    it is stopped (and the queue drained) at exit.
+    """
+    formatter = JsonFormatter() if json_format else TextFormatter()
+    log_queue = queue.SimpleQueue()
+
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    queue_handler.setFormatter(formatter)
+    queue_handler.addFilter(RateLimitFilter(rate_limit_window, rate_limit_burst))
+
+    writer = logging.StreamHandler(stream or sys.stdout)
+    writer.setFormatter(logging.Formatter('%(message)s'))  # Already formatted by the queue handler
+    listener = logging.handlers.QueueListener(log_queue, writer)
+    listener.start()
+    atexit.register(listener.stop)
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
+    root.setLevel(level)
+    for name, logger_level in (levels or {}).items():
+        logging.getLogger(name).setLevel(logger_level)
+    return listener
@@ -0,0 +1,132 @@
+import asyncio
+import collections
+import logging
+import os
+import resource
+
+import discord
+
+log = logging.getLogger(__name__)
+
+POLICIES = ('full', 'tracked', 'lru')
+
+
+def member_cache_flags(policy):
+    """
+    Returns the pycord member cache flags for a policy.
+
+    'full' caches (and chunks) every member. The other policies let pycord
+    cache only members who join or use a command, and MemberCacheTrimmer
+    keeps that within budget.
+    """
+    if policy not in POLICIES:
+        raise ValueError(f"Unknown member cache policy '{policy}'. Use one of: {', '.join(POLICIES)}")
+    if policy == 'full':
+        return discord.MemberCacheFlags.all()
+    return discord.MemberCacheFlags(voice=False, joined=True, interaction=True)
+
+
+class MemberCacheTrimmer:
+    """
+    Holds pycord's member cache to a policy's budget.
+
+    Pycord never lets go of a member once cached. Every `interval` seconds this
+    evicts the members the policy doesn't keep:
+    - 'tracked': members without one of `tracked_role_ids` (staff, bank managers).
+    - 'lru': the least recently seen members beyond `max_size`, across all guilds.
+
+    The bot's own member is always kept. Members stay in pycord's cache, so the
+    ones kept get on_member_update as usual; an evicted member is fetched again
+    when needed and cached again the next time they use a command. Evictions are
+    dispatched as on_member_evict(guild_id, member_id) for caches keyed on members.
+    """
+
+    def __init__(self, bot, policy, tracked_role_ids=(), max_size=5000, interval=60.0):
+        self.bot = bot
+        self.policy = policy
+        self.tracked_role_ids = frozenset(tracked_role_ids)
+        self.max_size = max_size
+        self.interval = interval
+        self.evicted = 0
+        self._recent = collections.OrderedDict()  # (guild_id, member_id) -> None, least recently seen first
+        self._task = None
+
+    def install(self):
+        if self.policy == 'full':
+            return
+        self.bot.add_listener(self._on_application_command, 'on_application_command')
+        self.bot.add_listener(self._on_member_join, 'on_member_join')
+
+    def start(self):
+        """Starts trimming periodically. Call once the loop is running."""
+        if self.policy != 'full' and self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._trim_periodically())
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def _seen(self, member):
+        guild = getattr(member, 'guild', None)
+        if guild is None:
+            return
+        key = (guild.id, member.id)
+        self._recent[key] = None
+        self._recent.move_to_end(key)
+        while len(self._recent) > self.max_size:
+            self._recent.popitem(last=False)
+
+    async def _on_application_command(self, ctx):
+        self._seen(ctx.author)
+
+    async def _on_member_join(self, member):
+        self._seen(member)
+
+    def trim(self):
+        """Evicts the members the policy doesn't keep. Returns how many were evicted."""
+        cached = [
+            (guild, member) for guild in self.bot.guilds for member in guild.members
+            if guild.me is None or member.id != guild.me.id
+        ]
+        if self.policy == 'tracked':
+            evict = [
+                (guild, member) for guild, member in cached
+                if not any(role.id in self.tracked_role_ids for role in member.roles)
+            ]
+        else:
+            # Members cached without being seen here (e.g. from a member update) go first.
+            order = {key: index for index, key in enumerate(self._recent)}
+            cached.sort(key=lambda item: order.get((item[0].id, item[1].id), -1))
+            evict = cached[:max(len(cached) - self.max_size, 0)]
+        for guild, member in evict:
+            guild._remove_member(member)
+            self._recent.pop((guild.id, member.id), None)
+            self.bot.dispatch('member_evict', guild.id, member.id)
+        self.evicted += len(evict)
+        return len(evict)
+
+    async def _trim_periodically(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                evicted = self.trim()
+                if evicted:
+                    log.debug("Evicted %d members from the '%s' member cache.", evicted, self.policy)
+            except Exception as e:
+                log.error("Failed to trim the member cache. %s", e, exc_info=e)
+
+
+def resident_memory_mb():
+    """Returns the process's resident memory in MiB (peak RSS where /proc isn't available)."""
+    try:
+        with open('/proc/self/statm', 'r') as f:
+            resident_pages = int(f.read().split()[1])
+        return resident_pages * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
+    except (OSError, ValueError, IndexError):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def log_memory_report(bot, policy):
+    cached_members = sum(len(guild.members) for guild in bot.guilds)
+    log.info("Memory: %.1f MiB resident, %d members cached ('%s' policy)", resident_memory_mb(), cached_members, policy)
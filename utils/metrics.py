@@ -0,0 +1,254 @@
+import asyncio
+import bisect
+import logging
+import os
+import tempfile
+import time
+
+import discord
+
+from utils import state_store
+
+log = logging.getLogger(__name__)
+
+# Upper bounds in seconds, Prometheus style (an implicit +Inf bucket follows).
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+LAG_SAMPLE_INTERVAL = 0.5
+
+
+class Histogram:
+    """A fixed-bucket histogram: one bisect and two additions per observation."""
+
+    __slots__ = ("bounds", "counts", "sum", "count", "max")
+
+    def __init__(self, bounds=LATENCY_BUCKETS):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+        self.max = 0.0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+        if value > self.max:
+            self.max = value
+
+    def quantile(self, q):
+        """Estimates a quantile by interpolating inside the bucket it falls in."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            if seen + bucket_count >= rank and bucket_count:
+                lower = self.bounds[index - 1] if index > 0 else 0.0
+                upper = self.bounds[index] if index < len(self.bounds) else self.max
+                return lower + (upper - lower) * (rank - seen) / bucket_count
+            seen += bucket_count
+        return self.max
+
+
+class InstrumentedContext(discord.ApplicationContext):
+    """An ApplicationContext that notes when the interaction was first acknowledged."""
+
+    def __init__(self, bot, interaction):
+        super().__init__(bot, interaction)
+        self.received_at = time.perf_counter()
+        self.acknowledged_after = None
+
+    def _track(self, func):
+        if self.acknowledged_after is not None:
+            return func
+
+        async def acknowledge(*args, **kwargs):
+            if self.acknowledged_after is None:
+                self.acknowledged_after = time.perf_counter() - self.received_at
+            return await func(*args, **kwargs)
+        return acknowledge
+
+    @property
+    def respond(self):
+        return self._track(super().respond)
+
+    @property
+    def defer(self):
+        return self._track(super().defer)
+
+    @property
+    def send_modal(self):
+        return self._track(super().send_modal)
+
+
+class Metrics:
+    """
+    Always-on runtime metrics for the bot.
+
+    Every slash command is timed by wrapping the bot's invoke_application_command,
+    so no cog needs decorating: handler latency and error counts per command, and
+    how long each interaction took to be acknowledged (deferred or answered).
+    A background task samples event-loop lag; gauges registered by cogs (e.g. the
+    pending reminder count) plus gateway latency, outbound queues and state store
+    flushes are read when metrics are rendered. If `prometheus_path` is set, the
+    metrics are written there in Prometheus text format every `interval` seconds
+    for node-exporter's textfile collector.
+    """
+
+    def __init__(self, bot, prometheus_path=None, interval=15.0):
+        self.bot = bot
+        self.prometheus_path = prometheus_path
+        self.interval = interval
+        self.started_at = time.time()
+        self.command_latency = {}
+        self.command_ack = {}
+        self.command_errors = {}
+        self.loop_lag = Histogram()
+        self._gauges = {}
+        self._tasks = []
+
+    def install(self):
+        """Hooks command invocation and context creation on the bot."""
+        bot = self.bot
+        invoke_application_command = bot.invoke_application_command
+        get_application_context = bot.get_application_context
+
+        async def timed_invoke(ctx):
+            started = time.perf_counter()
+            try:
+                await invoke_application_command(ctx)
+            finally:
+                self._record_command(ctx, time.perf_counter() - started)
+
+        async def instrumented_context(interaction, cls=InstrumentedContext):
+            return await get_application_context(interaction, cls=cls)
+
+        bot.invoke_application_command = timed_invoke
+        bot.get_application_context = instrumented_context
+
+    def _record_command(self, ctx, elapsed):
+        name = ctx.command.qualified_name if ctx.command else "unknown"
+        histogram = self.command_latency.get(name)
+        if histogram is None:
+            histogram = self.command_latency[name] = Histogram()
+            self.command_ack[name] = Histogram()
+            self.command_errors[name] = 0
+        histogram.observe(elapsed)
+        acknowledged_after = getattr(ctx, "acknowledged_after", None)
+        if acknowledged_after is not None:
+            self.command_ack[name].observe(acknowledged_after)
+        if getattr(ctx, "command_failed", False):
+            self.command_errors[name] += 1
+
+    def register_gauge(self, name, help_text, func):
+        """Registers a callable sampled whenever metrics are rendered."""
+        self._gauges[name] = (help_text, func)
+
+    def start(self):
+        """Starts the lag monitor and the Prometheus file writer. Call once the loop is running."""
+        if self._tasks:
+            return
+        loop = asyncio.get_running_loop()
+        self._tasks.append(loop.create_task(self._sample_loop_lag()))
+        if self.prometheus_path:
+            self._tasks.append(loop.create_task(self._write_periodically()))
+
+    def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        self._tasks = []
+
+    async def _sample_loop_lag(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            started = loop.time()
+            await asyncio.sleep(LAG_SAMPLE_INTERVAL)
+            self.loop_lag.observe(max(0.0, loop.time() - started - LAG_SAMPLE_INTERVAL))
+
+    async def _write_periodically(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await loop.run_in_executor(None, self._write_file, self.render_prometheus())
+            except Exception as e:
+                log.error("Failed to write metrics to %s. %s", self.prometheus_path, e)
+
+    def _write_file(self, text):
+        # Temp file plus rename, so node-exporter never reads a half-written file.
+        directory = os.path.dirname(self.prometheus_path) or '.'
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.ovbot-metrics.', suffix='.tmp')
+        with os.fdopen(fd, 'w') as f:
+            f.write(text)
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, self.prometheus_path)
+
+    def gauges(self):
+        """Returns the current value of every gauge, built-in and registered."""
+        values = {
+            "ovbot_uptime_seconds": ("Seconds since the bot started.", time.time() - self.started_at),
+            "ovbot_gateway_latency_seconds": ("Gateway heartbeat latency.", self._gateway_latency()),
+        }
+        dispatcher = getattr(self.bot, "dispatcher", None)
+        if dispatcher is not None:
+            stats = dispatcher.stats()
+            values["ovbot_outbound_queue_depth"] = ("Messages waiting in outbound queues.", stats["queue_depth"])
+            values["ovbot_outbound_sent_total"] = ("Outbound messages sent.", stats["sent"])
+            values["ovbot_outbound_coalesced_total"] = ("Outbound messages merged into another.", stats["coalesced"])
+            values["ovbot_outbound_dropped_total"] = ("Outbound messages dropped.", stats["dropped"])
+            values["ovbot_outbound_backoffs_total"] = ("Outbound rate-limit waits and retries.", stats["backoffs"])
+        for name, (help_text, func) in self._gauges.items():
+            try:
+                values[name] = (help_text, func())
+            except Exception:
+                continue
+        return values
+
+    def _gateway_latency(self):
+        latency = self.bot.latency
+        return latency if latency == latency and latency != float('inf') else 0.0  # NaN/inf before connect
+
+    def render_prometheus(self):
+        lines = []
+
+        def histogram_lines(name, help_text, histograms, label):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} histogram")
+            for label_value, histogram in histograms:
+                labels = f'{label}="{label_value}",' if label else ""
+                cumulative = 0
+                for bound, bucket_count in zip(histogram.bounds, histogram.counts):
+                    cumulative += bucket_count
+                    lines.append(f'{name}_bucket{{{labels}le="{bound}"}} {cumulative}')
+                lines.append(f'{name}_bucket{{{labels}le="+Inf"}} {histogram.count}')
+                suffix = f"{{{labels.rstrip(',')}}}" if labels else ""
+                lines.append(f"{name}_sum{suffix} {histogram.sum}")
+                lines.append(f"{name}_count{suffix} {histogram.count}")
+
+        histogram_lines("ovbot_command_duration_seconds", "Slash command handler latency.",
+                        sorted(self.command_latency.items()), "command")
+        histogram_lines("ovbot_command_ack_seconds", "Time until a slash command was deferred or answered.",
+                        sorted(self.command_ack.items()), "command")
+        lines.append("# HELP ovbot_command_errors_total Slash command invocations that raised an error.")
+        lines.append("# TYPE ovbot_command_errors_total counter")
+        for name, errors in sorted(self.command_errors.items()):
+            lines.append(f'ovbot_command_errors_total{{command="{name}"}} {errors}')
+        histogram_lines("ovbot_event_loop_lag_seconds", "How late a periodic sleep woke up.", [(None, self.loop_lag)], None)
+
+        for name, (help_text, value) in self.gauges().items():
+            metric_type = "counter" if name.endswith("_total") else "gauge"
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {metric_type}")
+            lines.append(f"{name} {value}")
+
+        stores = state_store.stores()
+        for name, help_text, attribute, metric_type in (
+            ("ovbot_state_flushes_total", "State store flushes written to disk.", "flush_count", "counter"),
+            ("ovbot_state_flush_seconds_total", "Time spent writing state store flushes.", "flush_seconds_total", "counter"),
+            ("ovbot_state_last_flush_seconds", "Duration of the most recent state store flush.", "last_flush_seconds", "gauge"),
+        ):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {metric_type}")
+            for store in stores:
+                lines.append(f'{name}{{path="{store.path}"}} {getattr(store, attribute)}')
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,165 @@
+import collections
+import logging
+
+from discord.ext import commands
+
+from utils.guilds import GuildConfigs
+from utils.log import context_fields
+
+# Capabilities granted by the roles already in config, unless ROLE_CAPABILITIES overrides them.
+STAFF_CAPABILITIES = frozenset({'events.manage', 'bot.stats', 'bot.reload', 'roster.sync', 'chat.triggers'})
+BANK_MANAGER_CAPABILITIES = frozenset({'bank.write', 'bank.history'})
+
+
+# Custom exception for channel checks to provide a specific error message.
+class WrongChannelError(commands.CheckFailure):
+    def __init__(self, channel_id=None):
+        super().__init__("This command can only be used in the designated channel.")
+        self.channel_id = channel_id
+
+
+# Raised when the invoking member lacks a capability, so handlers can tailor the message.
+class MissingCapabilityError(commands.CheckFailure):
+    def __init__(self, capability):
+        super().__init__(f"Member is missing the '{capability}' capability.")
+        self.capability = capability
+
+
+log = logging.getLogger(__name__)
+
+
+class PermissionEngine:
+    """
+    Resolves what a member may do from their roles.
+
+    Configured role IDs are turned into frozensets of capability strings once.
+    Each member's combined capability set is cached, and entries are evicted
+    incrementally: when that member is updated or leaves, or when one of their
+    roles is deleted, and least recently checked first once `max_size` is
+    reached. Nothing is recomputed per check on a cache hit.
+    """
+
+    def __init__(self, role_capabilities, max_size=10000):
+        self.role_capabilities = {role_id: frozenset(caps) for role_id, caps in role_capabilities.items()}
+        self.max_size = max_size
+        self._cache = collections.OrderedDict()  # (guild_id, member_id) -> (frozenset, IDs of the roles that granted it), LRU order
+        self._members_by_role = collections.defaultdict(set)  # role_id -> cached member keys holding it
+
+    @classmethod
+    def from_config(cls, config):
+        # Role IDs are unique across Discord, so every guild's roles can share one table.
+        role_capabilities = collections.defaultdict(frozenset)
+        for guild_config in GuildConfigs(config):
+            guild_roles = getattr(guild_config, 'ROLE_CAPABILITIES', None)
+            if guild_roles is None:
+                guild_roles = {guild_config.RUNESCAPE_STAFF_ROLE_ID: STAFF_CAPABILITIES}
+                for role_id in guild_config.BANK_MANAGER_ROLE_IDS:
+                    guild_roles[role_id] = guild_roles.get(role_id, frozenset()) | BANK_MANAGER_CAPABILITIES
+            for role_id, capabilities in guild_roles.items():
+                role_capabilities[role_id] |= frozenset(capabilities)
+        return cls(role_capabilities)
+
+    def install(self, bot):
+        bot.add_listener(self._on_member_update, 'on_member_update')
+        bot.add_listener(self._on_raw_member_remove, 'on_raw_member_remove')
+        bot.add_listener(self._on_guild_role_delete, 'on_guild_role_delete')
+        # Role changes of members evicted from the member cache aren't dispatched, so forget them too.
+        bot.add_listener(self._on_member_evict, 'on_member_evict')
+
+    def capabilities(self, member):
+        """Returns the frozenset of capabilities a member holds."""
+        guild = getattr(member, 'guild', None)
+        if guild is None:
+            return frozenset()  # Not a guild member (e.g. a DM)
+        key = (guild.id, member.id)
+        cached = self._cache.get(key)
+        if cached is not None:
+            self._cache.move_to_end(key)
+            return cached[0]
+
+        capabilities = frozenset()
+        held = []
+        for role in member.roles:
+            role_capabilities = self.role_capabilities.get(role.id)
+            if role_capabilities:
+                capabilities |= role_capabilities
+                held.append(role.id)
+        self._cache[key] = (capabilities, tuple(held))
+        for role_id in held:
+            self._members_by_role[role_id].add(key)
+        while len(self._cache) > self.max_size:
+            self.invalidate(*next(iter(self._cache)))
+        return capabilities
+
+    def has(self, member, capability):
+        return capability in self.capabilities(member)
+
+    def invalidate(self, guild_id, member_id):
+        key = (guild_id, member_id)
+        cached = self._cache.pop(key, None)
+        if cached is not None:
+            for role_id in cached[1]:
+                members = self._members_by_role.get(role_id)
+                if members is not None:
+                    members.discard(key)
+                    if not members:
+                        del self._members_by_role[role_id]
+
+    async def _on_member_update(self, before, after):
+        if before.roles != after.roles:
+            self.invalidate(after.guild.id, after.id)
+
+    async def _on_raw_member_remove(self, payload):
+        self.invalidate(payload.guild_id, payload.user.id)
+
+    async def _on_member_evict(self, guild_id, member_id):
+        self.invalidate(guild_id, member_id)
+
+    async def _on_guild_role_delete(self, role):
+        for guild_id, member_id in list(self._members_by_role.pop(role.id, ())):
+            self.invalidate(guild_id, member_id)
+
+
+def requires(capability):
+    """Check decorator: the invoking member must hold `capability`."""
+    async def predicate(ctx):
+        if ctx.bot.permissions.has(ctx.author, capability):
+            return True
+        raise MissingCapabilityError(capability)
+    return commands.check(predicate)
+
+
+def in_channel(config_attribute):
+    """Check decorator: the command must be used in the channel whose ID is in the guild's config."""
+    async def predicate(ctx):
+        guild_config = ctx.bot.guild_configs.get(ctx.guild.id if ctx.guild else None)
+        allowed_channel_id = getattr(guild_config, config_attribute)
+        if ctx.channel.id == allowed_channel_id:
+            return True
+        # Raise a custom exception to be caught by the error handler.
+        raise WrongChannelError(allowed_channel_id)
+    return commands.check(predicate)
+
+
+def in_admin_channel():
+    """Check decorator: the command must be used in the admin bot commands channel."""
+    return in_channel('ADMIN_BOT_COMMANDS_CHANNEL_ID')
+
+
+async def handle_command_error(ctx, error, missing_capability_message=None):
+    """
+    Shared cog_command_error: answers failed checks and logs anything else.
+
+    `missing_capability_message` replaces the generic permission reply when the
+    member lacks a capability, e.g. to say which role is needed.
+    """
+    if isinstance(error, WrongChannelError) and error.channel_id:
+        await ctx.respond(f"This command can only be used in <#{error.channel_id}>.", ephemeral=True)
+    elif isinstance(error, MissingCapabilityError) and missing_capability_message:
+        await ctx.respond(missing_capability_message, ephemeral=True)
+    elif isinstance(error, commands.CheckFailure):
+        await ctx.respond("You don't have permission to use this command.", ephemeral=True)
+    else:
+        log.error("Unhandled error in /%s: %s", ctx.command.qualified_name, error, exc_info=error, extra=context_fields(ctx))
+        if not ctx.interaction.response.is_done():
+            await ctx.respond("An unexpected error occurred. Please try again later.", ephemeral=True)
@@ -0,0 +1,61 @@
+import calendar
+import datetime
+import itertools
+
+import pytz
+
+FREQUENCIES = ('daily', 'weekly', 'monthly')
+
+
+def _add_months(naive, months):
+    month_index = naive.month - 1 + months
+    year = naive.year + month_index // 12
+    month = month_index % 12 + 1
+    # The 31st of a 30-day month lands on the 30th; later months go back to the 31st.
+    day = min(naive.day, calendar.monthrange(year, month)[1])
+    return naive.replace(year=year, month=month, day=day)
+
+
+def local_occurrence(start_local, frequency, index):
+    """Returns the naive local wall-clock time of the index-th occurrence."""
+    if frequency == 'daily':
+        return start_local + datetime.timedelta(days=index)
+    if frequency == 'weekly':
+        return start_local + datetime.timedelta(weeks=index)
+    if frequency == 'monthly':
+        return _add_months(start_local, index)
+    raise ValueError(f"Unknown frequency '{frequency}'. Use one of: {', '.join(FREQUENCIES)}")
+
+
+def localize(tz, naive):
+    """
+    Attaches a pytz zone to a wall-clock time, keeping the wall-clock time across DST.
+
+    An ambiguous time (the repeated hour when clocks go back) resolves to the
+    first, daylight-saving instance. A time that doesn't exist (the skipped hour
+    when clocks go forward) is moved forward by the size of the gap.
+    """
+    try:
+        return tz.localize(naive, is_dst=None)
+    except pytz.AmbiguousTimeError:
+        return tz.localize(naive, is_dst=True)
+    except pytz.NonExistentTimeError:
+        return tz.normalize(tz.localize(naive, is_dst=False))
+
+
+def occurrences(start_local, tz, frequency, start_index=0, until=None, count=None):
+    """
+    Lazily yields (index, utc_datetime) for each occurrence of a series.
+
+    `start_local` is the naive local time of the first occurrence in zone `tz`.
+    `until` is an optional naive local datetime (inclusive) and `count` an
+    optional total number of occurrences. Nothing is precomputed, so consumers
+    only pay for the occurrences they actually pull.
+    """
+    for index in itertools.count(start_index):
+        if count is not None and index >= count:
+            return
+        naive = local_occurrence(start_local, frequency, index)
+        if until is not None and naive > until:
+            return
+        yield index, localize(tz, naive).astimezone(pytz.utc)
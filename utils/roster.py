@@ -0,0 +1,141 @@
+import asyncio
+import csv
+import hashlib
+import logging
+
+import aiohttp
+import discord
+
+from utils.dispatcher import retry_after
+
+log = logging.getLogger(__name__)
+
+# Jagex's clan member list: one "name,rank,total xp,kills" line per member.
+DEFAULT_ROSTER_URL = 'https://secure.runescape.com/m=clan-hiscores/members_lite.ws?clanName={clan}'
+
+
+def normalize_name(name):
+    """
+    Folds an RSN or Discord display name to a comparable key.
+
+    RuneScape treats spaces, underscores and hyphens in names as the same
+    character, and Jagex's CSV uses non-breaking spaces.
+    """
+    return ' '.join(name.replace('\xa0', ' ').replace('_', ' ').replace('-', ' ').lower().split())
+
+
+async def fetch_roster(session, url):
+    """
+    Streams the clan member CSV and returns ({normalized name: (name, rank)}, digest).
+
+    Lines are parsed as they arrive rather than after the whole body is read.
+    The digest is a hash of the raw body, so an unchanged list can be
+    recognised without comparing members.
+    """
+    roster = {}
+    digest = hashlib.sha256()
+    async with session.get(url) as response:
+        if response.status != 200:
+            raise aiohttp.ClientResponseError(
+                response.request_info, response.history, status=response.status, message="Roster download failed"
+            )
+        first = True
+        async for raw_line in response.content:
+            digest.update(raw_line)
+            try:
+                line = raw_line.decode('utf-8')
+            except UnicodeDecodeError:
+                line = raw_line.decode('latin-1')
+            fields = next(csv.reader([line]), None)
+            if first:
+                first = False
+                if fields and fields[0].strip().lower() == 'clanmate':
+                    continue  # Header
+            if not fields or len(fields) < 2 or not fields[0].strip():
+                continue
+            name = fields[0].replace('\xa0', ' ').strip()
+            roster[normalize_name(name)] = (name, fields[1].strip())
+    return roster, digest.hexdigest()
+
+
+def diff_rosters(previous, current):
+    """Returns (joined, left, rank_changed) sets of normalized names between two rosters."""
+    joined = current.keys() - previous.keys()
+    left = previous.keys() - current.keys()
+    rank_changed = {key for key in current.keys() & previous.keys() if current[key][1] != previous[key][1]}
+    return joined, left, rank_changed
+
+
+class RoleEditQueue:
+    """
+    Applies member role edits with bounded concurrency and pacing.
+
+    At most `concurrency` edits are in flight, and edits start no faster than
+    `per_second`. A 429 from Discord pauses every worker for as long as its
+    Retry-After header asks before the edit is retried.
+    """
+
+    def __init__(self, concurrency=2, per_second=2.0, max_retries=3):
+        self.concurrency = concurrency
+        self.interval = 1.0 / per_second if per_second else 0.0
+        self.max_retries = max_retries
+        self._next_start = 0.0
+        self._paused_until = 0.0
+
+    async def _wait_turn(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            now = loop.time()
+            start = max(self._next_start, self._paused_until, now)
+            if start <= now:
+                self._next_start = now + self.interval
+                return
+            await asyncio.sleep(start - now)
+
+    async def _apply(self, member, role, add, reason):
+        """Adds or removes one role. Returns None on success, or the HTTPException it gave up on."""
+        for attempt in range(self.max_retries + 1):
+            await self._wait_turn()
+            try:
+                if add:
+                    await member.add_roles(role, reason=reason)
+                else:
+                    await member.remove_roles(role, reason=reason)
+                return None
+            except discord.HTTPException as e:
+                if e.status == 429 and attempt < self.max_retries:
+                    self._paused_until = asyncio.get_running_loop().time() + retry_after(e, 1.0)
+                    continue
+                if e.status >= 500 and attempt < self.max_retries:
+                    continue
+                log.warning(
+                    "Could not %s role %s %s %s: %s", "add" if add else "remove", role, "to" if add else "from", member, e,
+                    extra={'guild_id': member.guild.id, 'user_id': member.id}
+                )
+                return e
+
+    async def run(self, edits, reason=None):
+        """
+        Applies (member, roles to add, roles to remove) edits, one role change per request.
+
+        Only the listed roles change, so roles given or taken by someone else in
+        the meantime are left alone. Returns (failed, rejected): members whose
+        edit might work on a retry, and members Discord refused outright (403,
+        e.g. a role above the bot's top role, or 404), which retrying won't fix.
+        """
+        pending = iter(edits)
+        failed = []
+        rejected = []
+
+        async def worker():
+            for member, add, remove in pending:
+                errors = [await self._apply(member, role, True, reason) for role in add]
+                errors += [await self._apply(member, role, False, reason) for role in remove]
+                errors = [error for error in errors if error is not None]
+                if any(error.status in (403, 404) for error in errors):
+                    rejected.append(member)
+                elif errors:
+                    failed.append(member)
+
+        await asyncio.gather(*(worker() for _ in range(self.concurrency)))
+        return failed, rejected
@@ -0,0 +1,108 @@
+import collections
+import re
+import time
+
+from utils.state_store import StateStore
+
+STATUSES = ('going', 'maybe', 'no')
+EVENT_ID_RE = re.compile(r'Event ID: (\d+)')
+
+
+def event_id_from_message(message):
+    """Returns the event ID from an event announcement's embed footer, or None."""
+    for embed in message.embeds if message else ():
+        match = EVENT_ID_RE.search(embed.footer.text or '') if embed.footer else None
+        if match:
+            return int(match.group(1))
+    return None
+
+
+def _apply(data, op):
+    """Replays one journalled RSVP change onto the loaded state."""
+    if 'open' in op:
+        data.setdefault(str(op['open']), {'starts': op['starts'], 'responses': {}})
+    elif 'close' in op:
+        data.pop(str(op['close']), None)
+    elif str(op['event']) in data:
+        responses = data[str(op['event'])]['responses']
+        if op['status'] is None:
+            responses.pop(str(op['user']), None)
+        else:
+            responses[str(op['user'])] = op['status']
+    return data
+
+
+class RSVPTracker:
+    """
+    Going/maybe/no responses per event, kept in memory.
+
+    A click updates a dict and a counter and appends one small op to the
+    store's journal. The store writes the ops accumulated over `flush_delay`
+    seconds in one batch, so a burst of clicks costs one disk write, and the
+    journal is periodically compacted into a snapshot.
+    """
+
+    def __init__(self, path, flush_delay=5.0):
+        self.store = StateStore(path, {}, flush_delay=flush_delay, journal=True, apply=_apply)
+        self.events = {}  # event ID -> {'starts': epoch, 'responses': {user ID: status}}
+        self.counts = {}  # event ID -> Counter of statuses
+        for event_id, event in self.store.load().items():
+            responses = {int(user_id): status for user_id, status in event['responses'].items()}
+            self.events[int(event_id)] = {'starts': event['starts'], 'responses': responses}
+            self.counts[int(event_id)] = collections.Counter(responses.values())
+        self.store.bind(self._snapshot)
+
+    def _snapshot(self):
+        return {
+            str(event_id): {'starts': event['starts'], 'responses': {str(user_id): status for user_id, status in event['responses'].items()}}
+            for event_id, event in self.events.items()
+        }
+
+    def __contains__(self, event_id):
+        return event_id in self.events
+
+    def __len__(self):
+        return len(self.events)
+
+    def open(self, event_id, starts):
+        """Starts taking responses for an event that begins at epoch `starts`."""
+        if event_id not in self.events:
+            self.events[event_id] = {'starts': starts, 'responses': {}}
+            self.counts[event_id] = collections.Counter()
+            self.store.mark_dirty({'open': event_id, 'starts': starts})
+
+    def close(self, event_id):
+        if self.events.pop(event_id, None) is not None:
+            del self.counts[event_id]
+            self.store.mark_dirty({'close': event_id})
+            return True
+        return False
+
+    def respond(self, event_id, user_id, status):
+        """Records a response. Returns False if it didn't change anything."""
+        responses = self.events[event_id]['responses']
+        previous = responses.get(user_id)
+        if previous == status:
+            return False
+        counts = self.counts[event_id]
+        if previous is not None:
+            counts[previous] -= 1
+        responses[user_id] = status
+        counts[status] += 1
+        self.store.mark_dirty({'event': event_id, 'user': user_id, 'status': status})
+        return True
+
+    def attendees(self, event_id, status='going'):
+        """Returns the user IDs with a given response, in the order they first responded."""
+        event = self.events.get(event_id)
+        if event is None:
+            return []
+        return [user_id for user_id, user_status in event['responses'].items() if user_status == status]
+
+    def prune(self, older_than, now=None):
+        """Forgets events that started more than `older_than` seconds ago. Returns how many."""
+        cutoff = (now or time.time()) - older_than
+        expired = [event_id for event_id, event in self.events.items() if event['starts'] < cutoff]
+        for event_id in expired:
+            self.close(event_id)
+        return len(expired)
@@ -0,0 +1,125 @@
+import asyncio
+import heapq
+import itertools
+import time
+
+
+class ReminderScheduler:
+    """
+    A min-heap of reminders keyed on their 'reminder_time' epoch.
+
+    Instead of polling every reminder once a minute, the consumer awaits
+    next_batch(), which sleeps exactly until the earliest reminder is due.
+    Adding or cancelling a reminder wakes the sleeper so a new, earlier
+    reminder is never missed.
+    """
+
+    def __init__(self, reminders=None, burst_size=10, burst_interval=1.0, clock=time.time):
+        # Heap entries are [reminder_time, sequence, reminder]. A cancelled entry has
+        # its reminder slot set to None and is discarded lazily when it reaches the top.
+        self._heap = []
+        self._entries = {}  # id(reminder) -> heap entry
+        self._by_event = {}  # event_id -> {id(reminder): reminder}, for O(1) per-event lookups
+        self._counter = itertools.count()
+        self._wakeup = asyncio.Event()
+        self._clock = clock
+        # Reminders missed while the bot was offline all come due at once on startup.
+        # At most burst_size of them are released per batch, with burst_interval
+        # seconds between full batches, so a catch-up never floods the channels.
+        self.burst_size = burst_size
+        self.burst_interval = burst_interval
+        self._last_batch_full = False
+
+        for reminder in reminders or []:
+            self.add(reminder)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def add(self, reminder):
+        """Schedules a reminder dict. O(log n)."""
+        entry = [reminder["reminder_time"], next(self._counter), reminder]
+        self._entries[id(reminder)] = entry
+        self._by_event.setdefault(reminder.get("event_id"), {})[id(reminder)] = reminder
+        heapq.heappush(self._heap, entry)
+        # Only wake the sleeper if this reminder is now the earliest one.
+        if self._heap[0] is entry:
+            self._wakeup.set()
+
+    def cancel(self, reminder):
+        """Cancels a scheduled reminder. Returns True if it was pending."""
+        entry = self._entries.pop(id(reminder), None)
+        if entry is None:
+            return False
+        entry[2] = None
+        self._unindex(reminder)
+        self._wakeup.set()
+        return True
+
+    def cancel_event(self, event_id):
+        """Cancels every pending reminder for an event. Returns how many were cancelled."""
+        reminders = list(self._by_event.get(event_id, {}).values())
+        for reminder in reminders:
+            self.cancel(reminder)
+        return len(reminders)
+
+    def reminders_for(self, event_id):
+        """Returns the pending reminders for an event."""
+        return list(self._by_event.get(event_id, {}).values())
+
+    def _unindex(self, reminder):
+        event_id = reminder.get("event_id")
+        event_reminders = self._by_event.get(event_id)
+        if event_reminders is not None:
+            event_reminders.pop(id(reminder), None)
+            if not event_reminders:
+                del self._by_event[event_id]
+
+    def next_due(self):
+        """Returns when the earliest pending reminder is due, or None if there are none."""
+        self._discard_cancelled()
+        return self._heap[0][0] if self._heap else None
+
+    def pending(self):
+        """Returns the pending reminders in due order (for persistence)."""
+        return [entry[2] for entry in sorted(self._entries.values())]
+
+    def _discard_cancelled(self):
+        while self._heap and self._heap[0][2] is None:
+            heapq.heappop(self._heap)
+
+    def pop_due(self, now=None, limit=None):
+        """Removes and returns up to `limit` reminders that are due at `now`."""
+        now = self._clock() if now is None else now
+        due = []
+        self._discard_cancelled()
+        while self._heap and self._heap[0][0] <= now and (limit is None or len(due) < limit):
+            _, _, reminder = heapq.heappop(self._heap)
+            del self._entries[id(reminder)]
+            self._unindex(reminder)
+            due.append(reminder)
+            self._discard_cancelled()
+        return due
+
+    async def next_batch(self):
+        """Sleeps until at least one reminder is due, then returns the due batch."""
+        if self._last_batch_full:
+            # Still catching up on a backlog; pace the next burst.
+            await asyncio.sleep(self.burst_interval)
+
+        while True:
+            self._wakeup.clear()
+            self._discard_cancelled()
+            if not self._heap:
+                timeout = None
+            else:
+                timeout = self._heap[0][0] - self._clock()
+                if timeout <= 0:
+                    batch = self.pop_due(limit=self.burst_size)
+                    self._last_batch_full = len(batch) >= self.burst_size
+                    return batch
+
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                pass
@@ -0,0 +1,213 @@
+import asyncio
+import datetime
+import json
+import logging
+import os
+import tempfile
+import weakref
+
+log = logging.getLogger(__name__)
+
+# Every live store, so shutdown can flush them all without knowing about each cog.
+_stores = weakref.WeakSet()
+
+
+def _default_apply(data, op):
+    data.update(op)
+    return data
+
+
+class StateStore:
+    """
+    A JSON file on disk backed by coalesced, non-blocking, atomic writes.
+
+    Cogs keep their state in memory and call mark_dirty() after each mutation.
+    Mutations that land within `flush_delay` seconds of each other become a single
+    flush. Flushes serialize on the event loop (so they see a consistent state)
+    but write to disk in a thread executor, via a temp file and os.replace(), so a
+    crash mid-write never leaves a truncated file behind.
+
+    With `journal=True`, each mark_dirty(op) appends `op` as one JSON line to
+    `<path>.journal` instead of rewriting the whole file, and the journal is
+    compacted into a fresh snapshot every `compact_every` entries. On load the
+    journal is replayed on top of the snapshot with `apply(data, op)`. Ops should
+    be idempotent (e.g. {"total": 123} rather than {"delta": 5}) since a crash
+    between compaction and journal truncation replays them a second time.
+    """
+
+    def __init__(self, path, default, flush_delay=1.0, journal=False, compact_every=500, apply=_default_apply):
+        self.path = path
+        self.journal_path = f"{path}.journal"
+        self.default = default
+        self.flush_delay = flush_delay
+        self.journal = journal
+        self.compact_every = compact_every
+        self._apply = apply
+        self._snapshot = None
+        self._pending_ops = []
+        self._journal_length = 0
+        self._needs_snapshot = False
+        self._flush_handle = None
+        self._flush_tasks = set()  # Scheduled flushes, referenced so they aren't garbage collected
+        self._lock = None
+        self.flush_count = 0
+        self.flush_seconds_total = 0.0
+        self.last_flush_seconds = 0.0
+        _stores.add(self)
+
+    def bind(self, snapshot):
+        """Sets the callable that returns the current state to persist."""
+        self._snapshot = snapshot
+
+    def load(self):
+        """Loads the snapshot and replays the journal. Blocking; call at startup only."""
+        data = self._copy_default()
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, 'r') as f:
+                    data = json.load(f)
+            except (json.JSONDecodeError, IOError) as e:
+                # Keep the broken file around for inspection instead of overwriting it.
+                corrupt_path = f"{self.path}.corrupt-{int(datetime.datetime.now().timestamp())}"
+                log.warning("%s is unreadable (%s). Moved to %s.", self.path, e, corrupt_path)
+                try:
+                    os.replace(self.path, corrupt_path)
+                except OSError:
+                    pass
+                data = self._copy_default()
+
+        if self.journal and os.path.exists(self.journal_path):
+            with open(self.journal_path, 'r') as f:
+                for line in f:
+                    try:
+                        op = json.loads(line)
+                    except json.JSONDecodeError:
+                        # A torn final line from a crash mid-append; everything before it is intact.
+                        break
+                    data = self._apply(data, op)
+                    self._journal_length += 1
+        return data
+
+    def _copy_default(self):
+        return json.loads(json.dumps(self.default))
+
+    def mark_dirty(self, op=None):
+        """Records a mutation and schedules a coalesced flush."""
+        if self.journal and op is not None:
+            self._pending_ops.append(op)
+        else:
+            self._needs_snapshot = True
+
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # Not inside the bot's loop (e.g. a script); just write now.
+            snapshot, journal_lines = self._prepare()
+            self._write(snapshot, journal_lines)
+            self._written(snapshot, journal_lines)
+            return
+
+        if self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.flush_delay, self._start_flush, loop)
+
+    def _start_flush(self, loop):
+        task = loop.create_task(self.flush())
+        self._flush_tasks.add(task)
+        task.add_done_callback(self._flush_done)
+
+    def _flush_done(self, task):
+        self._flush_tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            log.error("Failed to write %s: %s", self.path, task.exception(), exc_info=task.exception())
+
+    def _prepare(self):
+        """Captures what needs writing. Runs on the event loop thread."""
+        ops, self._pending_ops = self._pending_ops, []
+        snapshot = None
+        compact = self._needs_snapshot or (
+            self.journal and self._journal_length + len(ops) >= self.compact_every
+        )
+        if compact and self._snapshot is not None:
+            snapshot = json.dumps(self._snapshot(), indent=4)
+            ops = []
+            self._needs_snapshot = False
+        journal_lines = ''.join(json.dumps(op, separators=(',', ':')) + '\n' for op in ops)
+        return snapshot, journal_lines
+
+    async def flush(self):
+        """Writes any pending state to disk off the event loop."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+
+        async with self._lock:
+            snapshot, journal_lines = self._prepare()
+            if snapshot is None and not journal_lines:
+                return
+            loop = asyncio.get_running_loop()
+            started = loop.time()
+            try:
+                await loop.run_in_executor(None, self._write, snapshot, journal_lines)
+            except BaseException:
+                # What was captured is gone from the pending ops; rewrite everything next time.
+                self._needs_snapshot = True
+                raise
+            self._written(snapshot, journal_lines)
+            self.flush_count += 1
+            self.last_flush_seconds = loop.time() - started
+            self.flush_seconds_total += self.last_flush_seconds
+
+    async def compact(self):
+        """Forces the journal to be folded into a fresh snapshot."""
+        self._needs_snapshot = True
+        await self.flush()
+
+    def _written(self, snapshot, journal_lines):
+        """Updates the journal length after a write. Runs on the event loop thread."""
+        if snapshot is not None:
+            self._journal_length = 0
+        self._journal_length += journal_lines.count('\n')
+
+    def _write(self, snapshot, journal_lines):
+        directory = os.path.dirname(self.path) or '.'
+        os.makedirs(directory, exist_ok=True)
+
+        if snapshot is not None:
+            fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f".{os.path.basename(self.path)}.", suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'w') as f:
+                    f.write(snapshot)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp_path, self.path)
+            except BaseException:
+                try:
+                    os.unlink(tmp_path)
+                except OSError:
+                    pass
+                raise
+            if self.journal:
+                # The snapshot now includes everything the journal held.
+                open(self.journal_path, 'w').close()
+
+        if journal_lines:
+            with open(self.journal_path, 'a') as f:
+                f.write(journal_lines)
+                f.flush()
+                os.fsync(f.fileno())
+
+
+def stores():
+    """Returns every live store (for metrics)."""
+    return list(_stores)
+
+
+async def flush_all():
+    """Flushes every store. Called from the bot's shutdown path."""
+    for store in list(_stores):
+        try:
+            await store.flush()
+        except Exception as e:
+            log.error("Failed to flush %s: %s", store.path, e)
@@ -0,0 +1,114 @@
+import bisect
+import datetime
+import difflib
+import functools
+
+import pytz
+
+# Common abbreviations people actually type. Pytz's own 'EST'/'MST' are fixed
+# offsets with no daylight saving, which is never what someone means in July,
+# so these point at the regional zones instead.
+ALIASES = {
+    'utc': 'UTC',
+    'gmt': 'UTC',
+    'game time': 'UTC',
+    'gametime': 'UTC',
+    'rs time': 'UTC',
+    'et': 'America/New_York',
+    'est': 'America/New_York',
+    'edt': 'America/New_York',
+    'ct': 'America/Chicago',
+    'cst': 'America/Chicago',
+    'cdt': 'America/Chicago',
+    'mt': 'America/Denver',
+    'mst': 'America/Denver',
+    'mdt': 'America/Denver',
+    'pt': 'America/Los_Angeles',
+    'pst': 'America/Los_Angeles',
+    'pdt': 'America/Los_Angeles',
+    'bst': 'Europe/London',
+    'uk': 'Europe/London',
+    'cet': 'Europe/Paris',
+    'cest': 'Europe/Paris',
+    'eet': 'Europe/Helsinki',
+    'aest': 'Australia/Sydney',
+    'aedt': 'Australia/Sydney',
+    'nzst': 'Pacific/Auckland',
+    'nzdt': 'Pacific/Auckland',
+}
+
+MAX_CHOICES = 25  # Discord's limit for autocomplete results
+
+
+class TimezoneIndex:
+    """
+    A sorted prefix index over every pytz zone name plus common aliases.
+
+    Each zone is indexed under its full name ("america/new_york") and its city
+    ("new york"), so typing either finds it. Lookups are a bisect into the sorted
+    keys; if nothing matches the prefix, difflib supplies close matches for typos.
+    Resolved tzinfo objects and parsed date/time strings are memoized.
+    """
+
+    def __init__(self, cache_size=256):
+        entries = {}
+        for name in pytz.all_timezones:
+            entries.setdefault(name.lower(), name)
+            city = name.rsplit('/', 1)[-1].replace('_', ' ').lower()
+            entries.setdefault(city, name)
+        for alias, name in ALIASES.items():
+            entries[alias] = name
+        self._keys = sorted(entries)
+        self._zones = entries  # lowercase key -> canonical zone name
+        self.resolve = functools.lru_cache(maxsize=cache_size)(self._resolve)
+        self.parse_datetime = functools.lru_cache(maxsize=cache_size)(self._parse_datetime)
+
+    def _lookup(self, text):
+        return self._zones.get(text.strip().lower().replace('_', ' ')) or self._zones.get(text.strip().lower())
+
+    def _resolve(self, text):
+        """Returns the tzinfo for a zone name or alias, or None if unknown."""
+        name = self._lookup(text)
+        return pytz.timezone(name) if name else None
+
+    def _parse_datetime(self, date_string, time_string, formats):
+        """Parses a naive datetime, trying each format in turn. Returns None if none fit."""
+        datetime_str = f"{date_string.strip()} {time_string.strip()}"
+        for date_format in formats:
+            try:
+                return datetime.datetime.strptime(datetime_str, date_format)
+            except ValueError:
+                continue
+        return None
+
+    def complete(self, text, limit=MAX_CHOICES):
+        """Returns up to `limit` zone names matching what the user has typed so far."""
+        text = (text or '').strip().lower()
+        if not text:
+            return ['UTC', 'America/New_York', 'America/Chicago', 'America/Los_Angeles', 'Europe/London'][:limit]
+
+        results = []
+        seen = set()
+        start = bisect.bisect_left(self._keys, text)
+        for key in self._keys[start:]:
+            if not key.startswith(text):
+                break
+            name = self._zones[key]
+            if name not in seen:
+                seen.add(name)
+                results.append(name)
+                if len(results) >= limit:
+                    return results
+
+        if not results:
+            for key in difflib.get_close_matches(text, self._keys, n=limit, cutoff=0.6):
+                name = self._zones[key]
+                if name not in seen:
+                    seen.add(name)
+                    results.append(name)
+        return results
+
+    def suggest(self, text):
+        """Returns the closest zone name for an unknown input, or None."""
+        matches = self.complete(text, limit=1)
+        return matches[0] if matches else None